@@ -1,5 +1,5 @@
 """Spectral and effective connectivity measures."""
 
 from .utils import seed_target_indices
-from .spectral import spectral_connectivity
+from .spectral import spectral_connectivity, SpectralConnectivity
 from .effective import phase_slope_index
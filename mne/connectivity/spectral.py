@@ -3,6 +3,7 @@
 #
 # License: BSD (3-clause)
 
+from copy import deepcopy
 from functools import partial
 from inspect import getmembers
 
@@ -20,6 +21,10 @@ from ..time_frequency.tfr import morlet, cwt
 from ..utils import logger, verbose, _time_mask, warn
 from ..externals.six import string_types
 
+# Number of elements of the CSD matrices (n_freqs * n_signals ** 2)
+# computed at once when computing connectivity from CSD matrices
+_CSD_MATRIX_WORKSPACE_SIZE = 2 ** 22
+
 ########################################################################
 # Various connectivity estimators
 
@@ -196,8 +201,10 @@ class _WPLIEst(_EpochMeanConEstBase):
     def accumulate(self, con_idx, csd_xy):
         """Accumulate some connections."""
         im_csd = np.imag(csd_xy)
-        self._acc[0, con_idx] += im_csd
-        self._acc[1, con_idx] += np.abs(im_csd)
+        # con_idx can also select frequencies, e.g. (con_idx, freq_idx)
+        acc = self._acc[(slice(None),) + np.index_exp[con_idx]]
+        acc[0] += im_csd
+        acc[1] += np.abs(im_csd)
 
     def compute_con(self, con_idx, n_epochs):
         """Compute final con. score for some connections."""
@@ -205,7 +212,7 @@ class _WPLIEst(_EpochMeanConEstBase):
             self.con_scores = np.zeros(self.csd_shape)
 
         num = np.abs(self._acc[0, con_idx])
-        denom = self._acc[1, con_idx]
+        denom = self._acc[1, con_idx].copy()  # do not alter the accumulator
 
         # handle zeros in denominator
         z_denom = np.where(denom == 0.)
@@ -233,9 +240,11 @@ class _WPLIDebiasedEst(_EpochMeanConEstBase):
     def accumulate(self, con_idx, csd_xy):
         """Accumulate some connections."""
         im_csd = np.imag(csd_xy)
-        self._acc[0, con_idx] += im_csd
-        self._acc[1, con_idx] += np.abs(im_csd)
-        self._acc[2, con_idx] += im_csd ** 2
+        # con_idx can also select frequencies, e.g. (con_idx, freq_idx)
+        acc = self._acc[(slice(None),) + np.index_exp[con_idx]]
+        acc[0] += im_csd
+        acc[1] += np.abs(im_csd)
+        acc[2] += im_csd ** 2
 
     def compute_con(self, con_idx, n_epochs):
         """Compute final con. score for some connections."""
@@ -427,7 +436,15 @@ def _epoch_spectral_connectivity(data, sig_idx, tmin_idx, tmax_idx, sfreq,
         method.start_epoch()
 
     # accumulate connectivity scores
-    if mode in ['multitaper', 'fourier']:
+    if mode in ['multitaper', 'fourier'] and _use_csd_matrix(
+            n_cons, x_mt.shape[0], x_mt.shape[1]):
+        # many connections: get them from the CSD matrix of all signals,
+        # a block of connections and frequencies at a time
+        for con_idx, freq_idx, csd in _iter_csd_matrix_from_mt(
+                x_mt, weights, idx_map, block_size):
+            for method in con_methods:
+                method.accumulate((con_idx, freq_idx), csd)
+    elif mode in ['multitaper', 'fourier']:
         for i in range(0, n_cons, block_size):
             con_idx = slice(i, i + block_size)
             if mt_adaptive:
@@ -458,6 +475,45 @@ def _epoch_spectral_connectivity(data, sig_idx, tmin_idx, tmax_idx, sfreq,
     return con_methods, psd
 
 
+def _use_csd_matrix(n_cons, n_signals, n_tapers):
+    """Decide whether to get the CSD of connections from the CSD matrix.
+
+    Computing the CSD matrix of all signals with a matrix product is much
+    faster per connection than computing the CSD pair by pair, but it
+    computes all n_signals ** 2 pairs, so it pays off when many connections
+    are requested (e.g., all-to-all connectivity), more so with many tapers.
+    """
+    return n_cons * (n_tapers + 1) >= n_signals ** 2
+
+
+def _iter_csd_matrix_from_mt(x_mt, weights, idx_map, block_size):
+    """Generate the CSD of connections from the CSD matrix of all signals.
+
+    This gives the same CSD as _csd_from_mt, the CSD matrix at each
+    frequency being computed as a matrix product of the weighted spectra.
+    The CSD matrices of a block of frequencies are computed at once, and
+    the CSD of their connections is generated by blocks of ``block_size``
+    connections, as ``(con_idx, freq_idx, csd)``.
+    """
+    # normalized weighted spectra, such that csd = 2 * y_x . y_y^H
+    y = x_mt * weights
+    norm = (weights * weights.conj()).real.sum(axis=-2, keepdims=True)
+    y /= np.sqrt(norm)
+    y = np.ascontiguousarray(y.transpose(2, 0, 1))  # n_freqs, n_sig, n_tap
+    n_freqs, n_signals = y.shape[:2]
+    flat_idx = idx_map[0] * n_signals + idx_map[1]
+    n_block = max(_CSD_MATRIX_WORKSPACE_SIZE // n_signals ** 2, 1)
+    for start in range(0, n_freqs, n_block):
+        this_y = y[start:start + n_block]
+        csd_mat = np.matmul(this_y, this_y.conj().transpose(0, 2, 1))
+        csd_mat = csd_mat.reshape(len(this_y), -1)
+        freq_idx = slice(start, start + len(this_y))
+        for i in range(0, len(flat_idx), block_size):
+            csd = csd_mat[:, flat_idx[i:i + block_size]].T
+            csd *= 2
+            yield slice(i, i + block_size), freq_idx, csd
+
+
 def _get_n_epochs(epochs, n):
     """Generate lists with at most n epochs."""
     epochs_out = list()
@@ -726,6 +782,10 @@ def spectral_connectivity(data, method='coh', indices=None, sfreq=2 * np.pi,
         The number of DPSS tapers used. Only defined in 'multitaper' mode.
         Otherwise None is returned.
 
+    See Also
+    --------
+    SpectralConnectivity
+
     References
     ----------
     .. [1] Nolte et al. "Identifying true brain interaction from EEG data using
@@ -745,191 +805,432 @@ def spectral_connectivity(data, method='coh', indices=None, sfreq=2 * np.pi,
            noise and sample-size bias" NeuroImage, vol. 55, no. 4,
            pp. 1548-1565, Apr. 2011.
     """
-    if n_jobs != 1:
-        parallel, my_epoch_spectral_connectivity, _ = \
-            parallel_func(_epoch_spectral_connectivity, n_jobs,
-                          verbose=verbose)
-
-    # format fmin and fmax and check inputs
-    if fmin is None:
-        fmin = -np.inf  # set it to -inf, so we can adjust it later
-
-    fmin = np.array((fmin,), dtype=float).ravel()
-    fmax = np.array((fmax,), dtype=float).ravel()
-    if len(fmin) != len(fmax):
-        raise ValueError('fmin and fmax must have the same length')
-    if np.any(fmin > fmax):
-        raise ValueError('fmax must be larger than fmin')
-
-    n_bands = len(fmin)
-
-    # assign names to connectivity methods
-    if not isinstance(method, (list, tuple)):
-        method = [method]  # make it a list so we can iterate over it
-
-    # handle connectivity estimators
-    (con_method_types, n_methods, accumulate_psd,
-     n_comp_args) = _check_estimators(method=method, mode=mode)
-
-    if isinstance(data, BaseEpochs):
-        times_in = data.times  # input times for Epochs input type
-        sfreq = data.info['sfreq']
-
-    # loop over data; it could be a generator that returns
-    # (n_signals x n_times) arrays or SourceEstimates
-    epoch_idx = 0
-    logger.info('Connectivity computation...')
-    for epoch_block in _get_n_epochs(data, n_jobs):
-        if epoch_idx == 0:
-            # initialize everything times and frequencies
-            (n_cons, times, n_times, times_in, n_times_in, tmin_idx,
-             tmax_idx, n_freqs, freq_mask, freqs, freqs_bands, freq_idx_bands,
-             n_signals, indices_use) = _prepare_connectivity(
-                epoch_block=epoch_block, tmin=tmin, tmax=tmax, fmin=fmin,
-                fmax=fmax, sfreq=sfreq, indices=indices, mode=mode,
-                fskip=fskip, n_bands=n_bands,
-                cwt_freqs=cwt_freqs, faverage=faverage)
-
-            # get the window function, wavelets, etc for different modes
-            (spectral_params, mt_adaptive, n_times_spectrum,
-             n_tapers) = _assemble_spectral_params(
-                mode=mode, n_times=n_times, mt_adaptive=mt_adaptive,
-                mt_bandwidth=mt_bandwidth, sfreq=sfreq,
-                mt_low_bias=mt_low_bias, cwt_n_cycles=cwt_n_cycles,
-                cwt_freqs=cwt_freqs, freqs=freqs, freq_mask=freq_mask)
-
-            # unique signals for which we actually need to compute PSD etc.
-            sig_idx = np.unique(np.r_[indices_use[0], indices_use[1]])
-
-            # map indices to unique indices
-            idx_map = [np.searchsorted(sig_idx, ind) for ind in indices_use]
-
-            # allocate space to accumulate PSD
-            if accumulate_psd:
-                if n_times_spectrum == 0:
-                    psd_shape = (len(sig_idx), n_freqs)
-                else:
-                    psd_shape = (len(sig_idx), n_freqs, n_times_spectrum)
-                psd = np.zeros(psd_shape)
-            else:
-                psd = None
+    est = SpectralConnectivity(
+        method=method, indices=indices, sfreq=sfreq, mode=mode, fmin=fmin,
+        fmax=fmax, fskip=fskip, faverage=faverage, tmin=tmin, tmax=tmax,
+        mt_bandwidth=mt_bandwidth, mt_adaptive=mt_adaptive,
+        mt_low_bias=mt_low_bias, cwt_freqs=cwt_freqs,
+        cwt_n_cycles=cwt_n_cycles, block_size=block_size, n_jobs=n_jobs,
+        verbose=verbose)
+    return est.partial_fit(data).compute()
+
+
+class SpectralConnectivity(object):
+    """Estimate spectral connectivity incrementally.
+
+    The cross- and power spectral densities of the epochs (or the quantities
+    derived from them by each connectivity method) are accumulated each time
+    :meth:`partial_fit` is called. They are kept between calls, so the epochs
+    can be given in batches (e.g., read from many files or acquired online)
+    and the connectivity can be computed at any time with :meth:`compute`.
+    Estimators accumulated in different processes with the same parameters
+    can be pickled and merged with :meth:`combine`.
+
+    See :func:`spectral_connectivity` for a description of the connectivity
+    methods.
 
-            # create instances of the connectivity estimators
-            con_methods = [mtype(n_cons, n_freqs, n_times_spectrum)
-                           for mtype in con_method_types]
+    Parameters
+    ----------
+    method : string | list of string
+        Connectivity measure(s) to compute.
+    indices : tuple of arrays | None
+        Two arrays with indices of connections for which to compute
+        connectivity. If None, all connections are computed.
+    sfreq : float
+        The sampling frequency. Ignored for Epochs data, whose sampling
+        frequency is used instead.
+    mode : str
+        Spectrum estimation mode can be either: 'multitaper', 'fourier', or
+        'cwt_morlet'.
+    fmin : float | tuple of floats
+        The lower frequency of interest (of each band). If None the frequency
+        corresponding to an epoch length of 5 cycles is used.
+    fmax : float | tuple of floats
+        The upper frequency of interest (of each band).
+    fskip : int
+        Omit every "(fskip + 1)-th" frequency bin to decimate in frequency
+        domain.
+    faverage : boolean
+        Average connectivity scores for each frequency band.
+    tmin : float | None
+        Time to start connectivity estimation.
+    tmax : float | None
+        Time to end connectivity estimation.
+    mt_bandwidth : float | None
+        The bandwidth of the multitaper windowing function in Hz.
+        Only used in 'multitaper' mode.
+    mt_adaptive : bool
+        Use adaptive weights to combine the tapered spectra into PSD.
+        Only used in 'multitaper' mode.
+    mt_low_bias : bool
+        Only use tapers with more than 90% spectral concentration within
+        bandwidth. Only used in 'multitaper' mode.
+    cwt_freqs : array
+        Array of frequencies of interest. Only used in 'cwt_morlet' mode.
+    cwt_n_cycles: float | array of float
+        Number of cycles. Fixed number or one per frequency. Only used in
+        'cwt_morlet' mode.
+    block_size : int
+        How many connections to compute at once (higher numbers are faster
+        but require more memory).
+    n_jobs : int
+        How many epochs to process in parallel.
+    verbose : bool, str, int, or None
+        If not None, override default verbose level (see :func:`mne.verbose`
+        and :ref:`Logging documentation <tut_logging>` for more).
+
+    Attributes
+    ----------
+    n_epochs : int
+        The number of epochs accumulated so far.
 
-            sep = ', '
-            metrics_str = sep.join([meth.name for meth in con_methods])
-            logger.info('    the following metrics will be computed: %s'
-                        % metrics_str)
+    See Also
+    --------
+    spectral_connectivity
 
-        # check dimensions and time scale
-        for this_epoch in epoch_block:
-            _get_and_verify_data_sizes(this_epoch, n_signals, n_times_in,
-                                       times_in)
+    Notes
+    -----
+    .. versionadded:: 0.16
+    """
+
+    @verbose
+    def __init__(self, method='coh', indices=None, sfreq=2 * np.pi,
+                 mode='multitaper', fmin=None, fmax=np.inf, fskip=0,
+                 faverage=False, tmin=None, tmax=None, mt_bandwidth=None,
+                 mt_adaptive=False, mt_low_bias=True, cwt_freqs=None,
+                 cwt_n_cycles=7, block_size=1000, n_jobs=1,
+                 verbose=None):  # noqa: D102
+        # format fmin and fmax and check inputs
+        if fmin is None:
+            fmin = -np.inf  # set it to -inf, so we can adjust it later
+
+        fmin = np.array((fmin,), dtype=float).ravel()
+        fmax = np.array((fmax,), dtype=float).ravel()
+        if len(fmin) != len(fmax):
+            raise ValueError('fmin and fmax must have the same length')
+        if np.any(fmin > fmax):
+            raise ValueError('fmax must be larger than fmin')
+
+        # assign names to connectivity methods
+        if not isinstance(method, (list, tuple)):
+            method = [method]  # make it a list so we can iterate over it
+
+        # handle connectivity estimators
+        (self._con_method_types, self._n_methods, self._accumulate_psd,
+         self._n_comp_args) = _check_estimators(method=method, mode=mode)
+
+        self.method = method
+        self.indices = indices
+        self.sfreq = sfreq
+        self.mode = mode
+        self.fmin = fmin
+        self.fmax = fmax
+        self.fskip = fskip
+        self.faverage = faverage
+        self.tmin = tmin
+        self.tmax = tmax
+        self.mt_bandwidth = mt_bandwidth
+        self.mt_adaptive = mt_adaptive
+        self.mt_low_bias = mt_low_bias
+        self.cwt_freqs = cwt_freqs
+        self.cwt_n_cycles = cwt_n_cycles
+        self.block_size = block_size
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+        self.n_epochs = 0
+        # the accumulators are allocated with the first epoch
+        self._con_methods = None
+        self._psd = None
+
+    def __repr__(self):  # noqa: D105
+        return ('<SpectralConnectivity  |  method : %s, mode : %s, '
+                'epochs : %d>' % (', '.join(str(m) for m in self.method),
+                                  self.mode, self.n_epochs))
+
+    def _setup(self, epoch_block):
+        """Initialize times, frequencies and accumulators."""
+        n_bands = len(self.fmin)
+        (self._n_cons, self._times, n_times, self._times_in,
+         self._n_times_in, tmin_idx, tmax_idx, self._n_freqs, freq_mask,
+         self._freqs, self._freqs_bands, self._freq_idx_bands,
+         self._n_signals, self._indices_use) = _prepare_connectivity(
+            epoch_block=epoch_block, tmin=self.tmin, tmax=self.tmax,
+            fmin=self.fmin, fmax=self.fmax, sfreq=self.sfreq,
+            indices=self.indices, mode=self.mode, fskip=self.fskip,
+            n_bands=n_bands, cwt_freqs=self.cwt_freqs,
+            faverage=self.faverage)
+
+        # get the window function, wavelets, etc for different modes
+        (spectral_params, mt_adaptive, n_times_spectrum,
+         self._n_tapers) = _assemble_spectral_params(
+            mode=self.mode, n_times=n_times, mt_adaptive=self.mt_adaptive,
+            mt_bandwidth=self.mt_bandwidth, sfreq=self.sfreq,
+            mt_low_bias=self.mt_low_bias, cwt_n_cycles=self.cwt_n_cycles,
+            cwt_freqs=self.cwt_freqs, freqs=self._freqs,
+            freq_mask=freq_mask)
+
+        # unique signals for which we actually need to compute PSD etc.
+        sig_idx = np.unique(np.r_[self._indices_use[0],
+                                  self._indices_use[1]])
+
+        # map indices to unique indices
+        self._idx_map = [np.searchsorted(sig_idx, ind)
+                         for ind in self._indices_use]
+
+        # allocate space to accumulate PSD
+        if self._accumulate_psd:
+            if n_times_spectrum == 0:
+                psd_shape = (len(sig_idx), self._n_freqs)
+            else:
+                psd_shape = (len(sig_idx), self._n_freqs, n_times_spectrum)
+            self._psd = np.zeros(psd_shape)
 
-        call_params = dict(
+        # create instances of the connectivity estimators
+        self._con_methods = [mtype(self._n_cons, self._n_freqs,
+                                   n_times_spectrum)
+                             for mtype in self._con_method_types]
+
+        self._call_params = dict(
             sig_idx=sig_idx, tmin_idx=tmin_idx,
-            tmax_idx=tmax_idx, sfreq=sfreq, mode=mode,
-            freq_mask=freq_mask, idx_map=idx_map, block_size=block_size,
-            psd=psd, accumulate_psd=accumulate_psd,
+            tmax_idx=tmax_idx, sfreq=self.sfreq, mode=self.mode,
+            freq_mask=freq_mask, idx_map=self._idx_map,
+            block_size=self.block_size,
+            accumulate_psd=self._accumulate_psd,
             mt_adaptive=mt_adaptive,
-            con_method_types=con_method_types,
-            con_methods=con_methods if n_jobs == 1 else None,
-            n_signals=n_signals, n_times=n_times,
-            accumulate_inplace=True if n_jobs == 1 else False)
-        call_params.update(**spectral_params)
-
-        if n_jobs == 1:
-            # no parallel processing
+            con_method_types=self._con_method_types,
+            n_signals=self._n_signals, n_times=n_times)
+        self._call_params.update(**spectral_params)
+
+        sep = ', '
+        metrics_str = sep.join([meth.name for meth in self._con_methods])
+        logger.info('    the following metrics will be computed: %s'
+                    % metrics_str)
+
+    @verbose
+    def partial_fit(self, data, verbose=None):
+        """Accumulate the spectral estimates of some epochs.
+
+        Parameters
+        ----------
+        data : array-like, shape=(n_epochs, n_signals, n_times) | Epochs
+            The epochs, in any of the formats supported by
+            :func:`spectral_connectivity`. All epochs given to the estimator
+            must have the same number of signals and time points.
+        verbose : bool, str, int, or None
+            If not None, override default verbose level (see
+            :func:`mne.verbose` and :ref:`Logging documentation <tut_logging>`
+            for more). Defaults to self.verbose.
+
+        Returns
+        -------
+        self : instance of SpectralConnectivity
+            The estimator, with the epochs accumulated.
+        """
+        if isinstance(data, BaseEpochs):
+            sfreq = data.info['sfreq']
+            if self._con_methods is not None and sfreq != self.sfreq:
+                raise ValueError('The sampling frequency of the epochs '
+                                 '(%s) does not match the one of the '
+                                 'estimator (%s)' % (sfreq, self.sfreq))
+            self.sfreq = sfreq
+        n_jobs = self.n_jobs
+        if n_jobs != 1:
+            parallel, my_epoch_spectral_connectivity, _ = \
+                parallel_func(_epoch_spectral_connectivity, n_jobs,
+                              verbose=verbose)
+
+        # loop over data; it could be a generator that returns
+        # (n_signals x n_times) arrays or SourceEstimates
+        logger.info('Connectivity computation...')
+        for epoch_block in _get_n_epochs(data, n_jobs):
+            if self._con_methods is None:
+                # initialize everything times and frequencies
+                self._setup(epoch_block)
+
+            # check dimensions and time scale
             for this_epoch in epoch_block:
-                logger.info('    computing connectivity for epoch %d'
-                            % (epoch_idx + 1))
-                # con methods and psd are updated inplace
-                _epoch_spectral_connectivity(data=this_epoch, **call_params)
-                epoch_idx += 1
-        else:
-            # process epochs in parallel
-            logger.info('    computing connectivity for epochs %d..%d'
-                        % (epoch_idx + 1, epoch_idx + len(epoch_block)))
-
-            out = parallel(my_epoch_spectral_connectivity(
-                           data=this_epoch, **call_params)
-                           for this_epoch in epoch_block)
-            # do the accumulation
-            for this_out in out:
-                for method, parallel_method in zip(con_methods, this_out[0]):
-                    method.combine(parallel_method)
-                if accumulate_psd:
-                    psd += this_out[1]
-
-            epoch_idx += len(epoch_block)
-
-    # normalize
-    n_epochs = epoch_idx
-    if accumulate_psd:
-        psd /= n_epochs
-
-    # compute final connectivity scores
-    con = list()
-    for method, n_args in zip(con_methods, n_comp_args):
-        # future estimators will need to be handled here
-        if n_args == 3:
-            # compute all scores at once
-            method.compute_con(slice(0, n_cons), n_epochs)
-        elif n_args == 5:
-            # compute scores block-wise to save memory
-            for i in range(0, n_cons, block_size):
-                con_idx = slice(i, i + block_size)
-                psd_xx = psd[idx_map[0][con_idx]]
-                psd_yy = psd[idx_map[1][con_idx]]
-                method.compute_con(con_idx, n_epochs, psd_xx, psd_yy)
-        else:
-            raise RuntimeError('This should never happen.')
-
-        # get the connectivity scores
-        this_con = method.con_scores
-
-        if this_con.shape[0] != n_cons:
-            raise ValueError('First dimension of connectivity scores must be '
-                             'the same as the number of connections')
-        if faverage:
-            if this_con.shape[1] != n_freqs:
-                raise ValueError('2nd dimension of connectivity scores must '
-                                 'be the same as the number of frequencies')
-            con_shape = (n_cons, n_bands) + this_con.shape[2:]
-            this_con_bands = np.empty(con_shape, dtype=this_con.dtype)
-            for band_idx in range(n_bands):
-                this_con_bands[:, band_idx] =\
-                    np.mean(this_con[:, freq_idx_bands[band_idx]], axis=1)
-            this_con = this_con_bands
-
-        con.append(this_con)
+                _get_and_verify_data_sizes(this_epoch, self._n_signals,
+                                           self._n_times_in, self._times_in)
+
+            if n_jobs == 1:
+                # no parallel processing
+                for this_epoch in epoch_block:
+                    logger.info('    computing connectivity for epoch %d'
+                                % (self.n_epochs + 1))
+                    # con methods and psd are updated inplace
+                    _epoch_spectral_connectivity(
+                        data=this_epoch, psd=self._psd,
+                        con_methods=self._con_methods,
+                        accumulate_inplace=True, **self._call_params)
+                    self.n_epochs += 1
+            else:
+                # process epochs in parallel
+                logger.info('    computing connectivity for epochs %d..%d'
+                            % (self.n_epochs + 1,
+                               self.n_epochs + len(epoch_block)))
+
+                out = parallel(my_epoch_spectral_connectivity(
+                               data=this_epoch, psd=None, con_methods=None,
+                               accumulate_inplace=False, **self._call_params)
+                               for this_epoch in epoch_block)
+                # do the accumulation
+                for this_out in out:
+                    for method, parallel_method in zip(self._con_methods,
+                                                       this_out[0]):
+                        method.combine(parallel_method)
+                    if self._accumulate_psd:
+                        self._psd += this_out[1]
+
+                self.n_epochs += len(epoch_block)
+        return self
 
-    if indices is None:
-        # return all-to-all connectivity matrices
-        logger.info('    assembling connectivity matrix '
-                    '(filling the upper triangular region of the matrix)')
-        con_flat = con
+    def combine(self, other):
+        """Include the epochs accumulated by another estimator.
+
+        Parameters
+        ----------
+        other : instance of SpectralConnectivity
+            An estimator with the same parameters and data dimensions, e.g.,
+            fitted on other epochs in another process.
+
+        Returns
+        -------
+        self : instance of SpectralConnectivity
+            The estimator, with the epochs of ``other`` accumulated.
+        """
+        if not isinstance(other, SpectralConnectivity):
+            raise TypeError('other must be an instance of '
+                            'SpectralConnectivity, got %s' % type(other))
+        if other.n_epochs == 0:
+            return self
+        if self.n_epochs == 0:
+            self.__dict__.update(deepcopy(other.__dict__))
+            return self
+        if (self._con_method_types != other._con_method_types or
+                self.mode != other.mode or self.sfreq != other.sfreq or
+                self._n_signals != other._n_signals or
+                not np.array_equal(self._freqs, other._freqs) or
+                not np.array_equal(self._times, other._times) or
+                not all(np.array_equal(ii, jj) for ii, jj in
+                        zip(self._indices_use, other._indices_use))):
+            raise ValueError('Cannot combine estimators with different '
+                             'methods, modes, signals, times or frequencies')
+        for method, other_method in zip(self._con_methods,
+                                        other._con_methods):
+            method.combine(other_method)
+        if self._accumulate_psd:
+            self._psd += other._psd
+        self.n_epochs += other.n_epochs
+        return self
+
+    @verbose
+    def compute(self, verbose=None):
+        """Compute the connectivity of the epochs accumulated so far.
+
+        The accumulators are not modified, so more epochs can be added
+        afterwards.
+
+        Parameters
+        ----------
+        verbose : bool, str, int, or None
+            If not None, override default verbose level (see
+            :func:`mne.verbose` and :ref:`Logging documentation <tut_logging>`
+            for more). Defaults to self.verbose.
+
+        Returns
+        -------
+        con : array | list of arrays
+            Computed connectivity measure(s), see
+            :func:`spectral_connectivity`.
+        freqs : array
+            Frequency points at which the connectivity was computed.
+        times : array
+            Time points for which the connectivity was computed.
+        n_epochs : int
+            Number of epochs used for computation.
+        n_tapers : int
+            The number of DPSS tapers used. Only defined in 'multitaper'
+            mode. Otherwise None is returned.
+        """
+        n_epochs = self.n_epochs
+        if n_epochs == 0:
+            raise RuntimeError('No epochs have been accumulated, call '
+                               'partial_fit first')
+        n_cons, n_freqs = self._n_cons, self._n_freqs
+        idx_map, block_size = self._idx_map, self.block_size
+
+        # normalize
+        if self._accumulate_psd:
+            psd = self._psd / n_epochs
+
+        # compute final connectivity scores
         con = list()
-        for this_con_flat in con_flat:
-            this_con = np.zeros((n_signals, n_signals) +
-                                this_con_flat.shape[1:],
-                                dtype=this_con_flat.dtype)
-            this_con[indices_use] = this_con_flat
-            con.append(this_con)
-
-    logger.info('[Connectivity computation done]')
-
-    if n_methods == 1:
-        # for a single method return connectivity directly
-        con = con[0]
+        for method, n_args in zip(self._con_methods, self._n_comp_args):
+            # future estimators will need to be handled here
+            method.con_scores = None
+            if n_args == 3:
+                # compute all scores at once
+                method.compute_con(slice(0, n_cons), n_epochs)
+            elif n_args == 5:
+                # compute scores block-wise to save memory
+                for i in range(0, n_cons, block_size):
+                    con_idx = slice(i, i + block_size)
+                    psd_xx = psd[idx_map[0][con_idx]]
+                    psd_yy = psd[idx_map[1][con_idx]]
+                    method.compute_con(con_idx, n_epochs, psd_xx, psd_yy)
+            else:
+                raise RuntimeError('This should never happen.')
+
+            # get the connectivity scores
+            this_con = method.con_scores
+            method.con_scores = None
+
+            if this_con.shape[0] != n_cons:
+                raise ValueError('First dimension of connectivity scores '
+                                 'must be the same as the number of '
+                                 'connections')
+            if self.faverage:
+                if this_con.shape[1] != n_freqs:
+                    raise ValueError('2nd dimension of connectivity scores '
+                                     'must be the same as the number of '
+                                     'frequencies')
+                n_bands = len(self._freq_idx_bands)
+                con_shape = (n_cons, n_bands) + this_con.shape[2:]
+                this_con_bands = np.empty(con_shape, dtype=this_con.dtype)
+                for band_idx in range(n_bands):
+                    this_con_bands[:, band_idx] =\
+                        np.mean(this_con[:, self._freq_idx_bands[band_idx]],
+                                axis=1)
+                this_con = this_con_bands
 
-    if faverage:
-        # for each band we return the frequencies that were averaged
-        freqs = freqs_bands
+            con.append(this_con)
 
-    return con, freqs, times, n_epochs, n_tapers
+        if self.indices is None:
+            # return all-to-all connectivity matrices
+            logger.info('    assembling connectivity matrix '
+                        '(filling the upper triangular region of the '
+                        'matrix)')
+            con_flat = con
+            con = list()
+            for this_con_flat in con_flat:
+                this_con = np.zeros((self._n_signals, self._n_signals) +
+                                    this_con_flat.shape[1:],
+                                    dtype=this_con_flat.dtype)
+                this_con[self._indices_use] = this_con_flat
+                con.append(this_con)
+
+        logger.info('[Connectivity computation done]')
+
+        if self._n_methods == 1:
+            # for a single method return connectivity directly
+            con = con[0]
+
+        freqs = self._freqs
+        if self.faverage:
+            # for each band we return the frequencies that were averaged
+            freqs = self._freqs_bands
+
+        return con, freqs, self._times, n_epochs, self._n_tapers
 
 
 def _prepare_connectivity(epoch_block, tmin, tmax, fmin, fmax, sfreq, indices,
@@ -1,16 +1,20 @@
+import pickle
 import warnings
 
 import numpy as np
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_allclose
 import pytest
-from nose.tools import assert_true, assert_raises
+from nose.tools import assert_true, assert_raises, assert_equal
 
-from mne.connectivity import spectral_connectivity
-from mne.connectivity.spectral import _CohEst, _get_n_epochs
+from mne.connectivity import spectral_connectivity, SpectralConnectivity
+from mne.connectivity import spectral
+from mne.connectivity.spectral import (_CohEst, _get_n_epochs,
+                                       _iter_csd_matrix_from_mt)
 
-from mne import SourceEstimate
+from mne import SourceEstimate, EpochsArray, create_info
 from mne.utils import run_tests_if_main
 from mne.filter import filter_data
+from mne.time_frequency.multitaper import _csd_from_mt
 
 warnings.simplefilter('always')
 
@@ -224,4 +228,98 @@ def test_spectral_connectivity():
     assert_true(len(out_lens) > 0)
     assert_true(out_lens[0] == 10)
 
+
+def test_spectral_connectivity_incremental():
+    """Test accumulating connectivity over batches of epochs."""
+    rng = np.random.RandomState(0)
+    sfreq = 100.
+    data = rng.randn(12, 4, 200)
+    data[:, 1] += 0.5 * data[:, 0]
+    data[:5, 3] = 0.  # a channel flat in the first batch
+    methods = ['coh', 'imcoh', 'plv', 'ppc', 'pli', 'wpli', 'wpli2_debiased']
+    for mode, kwargs in (('multitaper', dict(mt_adaptive=True)),
+                         ('fourier', dict(fmin=(5., 20.), fmax=(15., 40.),
+                                          faverage=True)),
+                         ('cwt_morlet', dict(cwt_freqs=np.array([10., 20.]),
+                                             indices=([0, 0], [1, 2])))):
+        kwargs.update(method=methods, sfreq=sfreq, mode=mode)
+        con, freqs, times, n, _ = spectral_connectivity(data, **kwargs)
+        est = SpectralConnectivity(**kwargs)
+        est.partial_fit(data[:5])
+        assert_equal(est.n_epochs, 5)
+        # intermediate results do not alter the accumulators
+        con_5 = est.compute()[0]
+        est.partial_fit(iter(data[5:9])).partial_fit(list(data[9:]))
+        con_inc, freqs_inc, times_inc, n_inc, _ = est.compute()
+        assert_equal(n_inc, 12)
+        assert_allclose(times_inc, times)
+        for c, c_inc, c_5 in zip(con, con_inc, con_5):
+            assert_allclose(c_inc, c, rtol=1e-10, atol=1e-12)
+            assert_true(not np.allclose(c_5, c))
+        # accumulated in another "process" and merged
+        est_a = SpectralConnectivity(**kwargs).partial_fit(data[:7])
+        est_b = SpectralConnectivity(n_jobs=2, **kwargs)
+        est_b = pickle.loads(pickle.dumps(est_b.partial_fit(data[7:])))
+        con_merged = est_a.combine(est_b).compute()[0]
+        for c, c_merged in zip(con, con_merged):
+            assert_allclose(c_merged, c, rtol=1e-10, atol=1e-12)
+        empty = SpectralConnectivity(**kwargs)
+        assert_raises(RuntimeError, empty.compute)
+        for c, c_merged in zip(con, empty.combine(est_a).compute()[0]):
+            assert_equal(c.shape, c_merged.shape)
+
+    # incompatible data and estimators
+    est = SpectralConnectivity(sfreq=sfreq).partial_fit(data[:2])
+    assert_raises(ValueError, est.partial_fit, data[:2, :3])
+    assert_raises(ValueError, est.combine,
+                  SpectralConnectivity(sfreq=sfreq).partial_fit(data[:2, :3]))
+    assert_raises(TypeError, est.combine, data)
+    epochs = EpochsArray(data[:2], create_info(4, 2 * sfreq, 'eeg'))
+    assert_raises(ValueError, est.partial_fit, epochs)
+    assert_true('epochs : 2' in repr(est))
+
+
+def test_csd_matrix_from_mt():
+    """Test computing connections from the CSD matrix of all signals."""
+    rng = np.random.RandomState(0)
+    n_signals, n_tapers, n_freqs = 6, 3, 20
+    x_mt = (rng.randn(n_signals, n_tapers, n_freqs) +
+            1j * rng.randn(n_signals, n_tapers, n_freqs))
+    idx_map = np.tril_indices(n_signals, -1)
+    for weights in (rng.rand(1, n_tapers, 1),  # same weights for all
+                    rng.rand(n_signals, n_tapers, n_freqs),  # adaptive
+                    np.array([1.])[:, None, None]):  # fourier
+        if weights.shape[0] == 1:
+            w_x = w_y = weights
+        else:
+            w_x, w_y = weights[idx_map[0]], weights[idx_map[1]]
+        want = _csd_from_mt(x_mt[idx_map[0]], x_mt[idx_map[1]], w_x, w_y)
+        csd = np.zeros_like(want)
+        for con_idx, freq_idx, this_csd in _iter_csd_matrix_from_mt(
+                x_mt, weights, idx_map, block_size=4):
+            csd[con_idx, freq_idx] = this_csd
+        assert_allclose(csd, want, rtol=1e-10)
+
+    # all-to-all connectivity gives the same results with both engines,
+    # also with several blocks of connections and frequencies
+    data = rng.randn(3, 20, 200)
+    methods = ['coh', 'imcoh', 'plv', 'ppc', 'pli', 'wpli', 'wpli2_debiased']
+    con_all = spectral_connectivity(data, method=methods, sfreq=100.,
+                                    mt_adaptive=True)[0]
+    orig_size = spectral._CSD_MATRIX_WORKSPACE_SIZE
+    spectral._CSD_MATRIX_WORKSPACE_SIZE = 2000  # blocks of 5 frequencies
+    try:
+        con_blocks = spectral_connectivity(data, method=methods, sfreq=100.,
+                                           mt_adaptive=True, block_size=50)[0]
+    finally:
+        spectral._CSD_MATRIX_WORKSPACE_SIZE = orig_size
+    for c_all, c_blocks in zip(con_all, con_blocks):
+        assert_allclose(c_blocks, c_all, rtol=1e-10)
+    con_few = spectral_connectivity(data, method=methods, sfreq=100.,
+                                    mt_adaptive=True,
+                                    indices=([1, 5, 19], [0, 2, 3]))[0]
+    for c_all, c_few in zip(con_all, con_few):
+        assert_allclose(c_few, c_all[[1, 5, 19], [0, 2, 3]], rtol=1e-10)
+
+
 run_tests_if_main()
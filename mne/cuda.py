@@ -390,7 +390,7 @@ def fft_resample(x, W, new_len, npads, to_removes, cuda_dict=None,
 
 # this has to go in mne.cuda instead of mne.filter to avoid import errors
 def _smart_pad(x, n_pad, pad='reflect_limited'):
-    """Pad vector x."""
+    """Pad vector x (or each vector along the last axis of x)."""
     n_pad = np.asarray(n_pad)
     assert n_pad.shape == (2,)
     if (n_pad == 0).all():
@@ -399,9 +399,14 @@ def _smart_pad(x, n_pad, pad='reflect_limited'):
         raise RuntimeError('n_pad must be non-negative')
     if pad == 'reflect_limited':
         # need to pad with zeros if len(x) <= npad
-        l_z_pad = np.zeros(max(n_pad[0] - len(x) + 1, 0), dtype=x.dtype)
-        r_z_pad = np.zeros(max(n_pad[0] - len(x) + 1, 0), dtype=x.dtype)
-        return np.concatenate([l_z_pad, 2 * x[0] - x[n_pad[0]:0:-1], x,
-                               2 * x[-1] - x[-2:-n_pad[1] - 2:-1], r_z_pad])
+        shape, n_x = x.shape[:-1], x.shape[-1]
+        l_z_pad = np.zeros(shape + (max(n_pad[0] - n_x + 1, 0),),
+                           dtype=x.dtype)
+        r_z_pad = np.zeros(shape + (max(n_pad[1] - n_x + 1, 0),),
+                           dtype=x.dtype)
+        return np.concatenate([l_z_pad,
+                               2 * x[..., :1] - x[..., n_pad[0]:0:-1], x,
+                               2 * x[..., -1:] - x[..., -2:-n_pad[1] - 2:-1],
+                               r_z_pad], axis=-1)
     else:
-        return np.pad(x, (tuple(n_pad),), pad)
+        return np.pad(x, ((0, 0),) * (x.ndim - 1) + (tuple(n_pad),), pad)
@@ -18,6 +18,7 @@ import os.path as op
 from distutils.version import LooseVersion
 
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 import scipy
 
 from .io.write import (start_file, start_block, end_file, end_block,
@@ -33,6 +34,7 @@ from .io.pick import (pick_types, channel_indices_by_type, channel_type,
                       _pick_aux_channels, _DATA_CH_TYPES_SPLIT)
 from .io.proj import setup_proj, ProjMixin, _proj_equal
 from .io.base import BaseRaw, ToDataFrameMixin, TimeMixin
+from .annotations import _sync_onset
 from .bem import _check_origin
 from .evoked import EvokedArray, _check_decim
 from .baseline import rescale, _log_rescale
@@ -41,6 +43,7 @@ from .channels.channels import (ContainsMixin, UpdateChannelsMixin,
 from .filter import detrend, FilterMixin
 from .event import _read_events_fif, make_fixed_length_events
 from .fixes import _get_args
+from .parallel import parallel_func
 from .viz import (plot_epochs, plot_epochs_psd, plot_epochs_psd_topomap,
                   plot_epochs_image, plot_topo_image_epochs, plot_drop_log)
 from .utils import (check_fname, logger, verbose, _check_type_picks,
@@ -51,6 +54,10 @@ from .externals.six import iteritems, string_types
 from .externals.six.moves import zip
 
 
+# Maximum size (in bytes) of the data read at once when loading epochs
+_MAX_EPOCHS_BATCH_SIZE = 2 ** 26
+
+
 def _save_split(epochs, fname, part_idx, n_parts):
     """Split epochs."""
     # insert index in filename
@@ -215,6 +222,14 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
     metadata : instance of pandas.DataFrame | None
         See :class:`mne.Epochs` docstring.
 
+        .. versionadded:: 0.16
+    n_jobs : int
+        See :class:`mne.Epochs` docstring.
+
+        .. versionadded:: 0.16
+    chunk_size : int | None
+        See :class:`mne.Epochs` docstring.
+
         .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
@@ -233,7 +248,8 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                  flat=None, decim=1, reject_tmin=None, reject_tmax=None,
                  detrend=None, proj=True, on_missing='error',
                  preload_at_end=False, selection=None, drop_log=None,
-                 filename=None, metadata=None, verbose=None):  # noqa: D102
+                 filename=None, metadata=None, n_jobs=1, chunk_size=None,
+                 verbose=None):  # noqa: D102
         self.verbose = verbose
 
         if on_missing not in ['error', 'warning', 'ignore']:
@@ -391,7 +407,8 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         if preload_at_end:
             assert self._data is None
             assert self.preload is False
-            self.load_data()  # this will do the projection
+            # this will do the projection
+            self._load_data(n_jobs=n_jobs, chunk_size=chunk_size)
         elif proj is True and self._projector is not None and data is not None:
             # let's make sure we project if data was provided and proj
             # requested
@@ -465,9 +482,13 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
         .. versionadded:: 0.10.0
         """
+        return self._load_data()
+
+    def _load_data(self, n_jobs=1, chunk_size=None):
+        """Load the data, checking for rejection in parallel."""
         if self.preload:
             return self
-        self._data = self._get_data()
+        self._data = self._get_data(n_jobs=n_jobs, chunk_size=chunk_size)
         self.preload = True
         self._decim_slice = slice(None, None, None)
         self._decim = 1
@@ -672,10 +693,49 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                             self.reject, self.flat, full_report=True,
                             ignore_chs=self.info['bads'])
 
+    def _is_good_epochs(self, data, invalid, n_jobs=1):
+        """Determine which epochs of a batch are good.
+
+        Parameters
+        ----------
+        data : array, shape (n_epochs, n_channels, n_times)
+            The epochs data.
+        invalid : dict
+            The invalid epochs, see :meth:`_get_epochs_from_raw`.
+        n_jobs : int
+            Number of jobs to compute the peak-to-peak amplitudes with.
+
+        Returns
+        -------
+        good : list of tuple
+            The output of :meth:`_is_good_epoch` for each epoch.
+        """
+        if self.reject is None and self.flat is None:
+            good = [(True, None)] * len(data)
+        else:
+            if self._reject_time is not None:
+                data = data[..., self._reject_time]
+            parallel, p_fun, n_jobs = parallel_func(_get_ptp, n_jobs)
+            n_jobs = max(min(n_jobs, len(data)), 1)
+            deltas = np.concatenate(parallel(
+                p_fun(data[sl]) for sl in _chunk_slices(len(data), n_jobs)))
+            bad_lists = _get_bad_lists(
+                deltas, self.ch_names, self._channel_type_idx, self.reject,
+                self.flat, ignore_chs=self.info['bads'],
+                skip=list(invalid.keys()))
+            good = [(False, bad_list) if len(bad_list) > 0 else (True, None)
+                    for bad_list in bad_lists]
+        for ii, epoch in invalid.items():
+            good[ii] = self._is_good_epoch(epoch)
+        return good
+
     @verbose
     def _detrend_offset_decim(self, epoch, verbose=None):
         """Aux Function: detrend, baseline correct, offset, decim.
 
+        Works on a single epoch (n_channels, n_times) or a stack of epochs
+        (n_epochs, n_channels, n_times).
+
         Note: operates inplace
         """
         if (epoch is None) or isinstance(epoch, string_types):
@@ -684,22 +744,24 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         # Detrend
         if self.detrend is not None:
             picks = _pick_data_channels(self.info, exclude=[])
-            epoch[picks] = detrend(epoch[picks], self.detrend, axis=1)
+            epoch[..., picks, :] = detrend(epoch[..., picks, :],
+                                           self.detrend, axis=-1)
 
         # Baseline correct
         picks = pick_types(self.info, meg=True, eeg=True, stim=False,
                            ref_meg=True, eog=True, ecg=True, seeg=True,
                            emg=True, bio=True, ecog=True, fnirs=True,
                            exclude=[])
-        epoch[picks] = rescale(epoch[picks], self._raw_times, self.baseline,
-                               copy=False, verbose=False)
+        epoch[..., picks, :] = rescale(epoch[..., picks, :], self._raw_times,
+                                       self.baseline, copy=False,
+                                       verbose=False)
 
         # handle offset
         if self._offset is not None:
             epoch += self._offset
 
         # Decimate if necessary (i.e., epoch not preloaded)
-        epoch = epoch[:, self._decim_slice]
+        epoch = epoch[..., self._decim_slice]
         return epoch
 
     def iter_evoked(self):
@@ -988,7 +1050,8 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             fig_background=fig_background, font_color=font_color, show=show)
 
     @verbose
-    def drop_bad(self, reject='existing', flat='existing', verbose=None):
+    def drop_bad(self, reject='existing', flat='existing', n_jobs=1,
+                 chunk_size=None, verbose=None):
         """Drop bad epochs without retaining the epochs data.
 
         Should be used before slicing operations.
@@ -1010,6 +1073,16 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             are floats that set the minimum acceptable peak-to-peak amplitude.
             If flat is None then no rejection is done. If 'existing',
             then the flat parameters set at instantiation are used.
+        n_jobs : int
+            Number of jobs to run in parallel when computing the
+            peak-to-peak amplitudes.
+
+            .. versionadded:: 0.16
+        chunk_size : int | None
+            Number of epochs to check at once. If None (default), chunks of
+            about 64 MB are used.
+
+            .. versionadded:: 0.16
         verbose : bool, str, int, or None
             If not None, override default verbose level (see
             :func:`mne.verbose` and :ref:`Logging documentation <tut_logging>`
@@ -1037,7 +1110,7 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                rej in (reject, flat)):
             raise ValueError('reject and flat, if strings, must be "existing"')
         self._reject_setup(reject, flat)
-        self._get_data(out=False)
+        self._get_data(out=False, n_jobs=n_jobs, chunk_size=chunk_size)
         return self
 
     def drop_log_stats(self, ignore=('IGNORED',)):
@@ -1140,19 +1213,73 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         """Get a given epoch from disk."""
         raise NotImplementedError
 
+    def _get_epochs_from_raw(self, idx):
+        """Get a contiguous range of epochs from disk.
+
+        Parameters
+        ----------
+        idx : slice
+            The epochs to read.
+
+        Returns
+        -------
+        data : array, shape (n_epochs, n_channels, n_times)
+            The epochs data.
+        invalid : dict
+            Maps the position of each invalid epoch in ``data`` to the output
+            of :meth:`_get_epoch_from_raw` for it (None, the description of
+            the bad segment, or an epoch that is too short). These epochs are
+            zero in ``data``.
+        """
+        data = None
+        invalid = dict()
+        n_times = len(self._raw_times)
+        idx = range(len(self.events))[idx]
+        for ii, epoch in enumerate(self._get_epoch_from_raw(jj)
+                                   for jj in idx):
+            if (epoch is None or isinstance(epoch, string_types) or
+                    epoch.shape[1] != n_times):
+                invalid[ii] = epoch
+                continue
+            if data is None:
+                data = np.empty((len(idx),) + epoch.shape, epoch.dtype)
+            data[ii] = epoch
+        if data is None:
+            data = np.empty((len(idx), len(self.ch_names), n_times))
+        data[list(invalid.keys())] = 0.
+        return data, invalid
+
+    def _iter_epochs_batches(self, chunk_size=None):
+        """Iterate over ranges of epochs to process at once."""
+        n_events = len(self.events)
+        if chunk_size is None:
+            epoch_size = 8 * len(self.ch_names) * len(self._raw_times)
+            step = max(_MAX_EPOCHS_BATCH_SIZE // epoch_size, 1)
+        else:
+            step = _ensure_int(chunk_size, 'chunk_size')
+            if step < 1:
+                raise ValueError('chunk_size must be a positive integer or '
+                                 'None, got %s' % (chunk_size,))
+        for start in range(0, n_events, step):
+            yield slice(start, min(start + step, n_events))
+
     def _project_epoch(self, epoch):
-        """Process a raw epoch based on the delayed param."""
+        """Process a raw epoch based on the delayed param.
+
+        Works on a single epoch (n_channels, n_times) or a stack of epochs
+        (n_epochs, n_channels, n_times).
+        """
         # whenever requested, the first epoch is being projected.
         if (epoch is None) or isinstance(epoch, string_types):
             # can happen if t < 0 or reject based on annotations
             return epoch
         proj = self._do_delayed_proj or self.proj
         if self._projector is not None and proj is True:
-            epoch = np.dot(self._projector, epoch)
+            epoch = np.matmul(self._projector, epoch)
         return epoch
 
     @verbose
-    def _get_data(self, out=True, verbose=None):
+    def _get_data(self, out=True, n_jobs=1, chunk_size=None, verbose=None):
         """Load all data, dropping bad epochs along the way.
 
         Parameters
@@ -1160,6 +1287,10 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         out : bool
             Return the data. Setting this to False is used to reject bad
             epochs without caching all the data, which saves memory.
+        n_jobs : int
+            Number of jobs to compute the peak-to-peak amplitudes with.
+        chunk_size : int | None
+            Number of epochs to process at once.
         verbose : bool, str, int, or None
             If not None, override default verbose level (see
             :func:`mne.verbose` and :ref:`Logging documentation <tut_logging>`
@@ -1182,62 +1313,64 @@ class BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                 return data
 
             # we need to load from disk, drop, and return data
-            for idx in range(n_events):
-                # faster to pre-allocate memory here
-                epoch_noproj = self._get_epoch_from_raw(idx)
-                epoch_noproj = self._detrend_offset_decim(epoch_noproj)
+            for batch in self._iter_epochs_batches(chunk_size):
+                epochs_noproj, _ = self._get_epochs_from_raw(batch)
+                epochs_noproj = self._detrend_offset_decim(epochs_noproj)
                 if self._do_delayed_proj:
-                    epoch_out = epoch_noproj
+                    epochs_out = epochs_noproj
                 else:
-                    epoch_out = self._project_epoch(epoch_noproj)
-                if idx == 0:
+                    epochs_out = self._project_epoch(epochs_noproj)
+                if batch.start == 0:
+                    # faster to pre-allocate memory here
                     data = np.empty((n_events, len(self.ch_names),
-                                     len(self.times)), dtype=epoch_out.dtype)
-                data[idx] = epoch_out
+                                     len(self.times)), dtype=epochs_out.dtype)
+                data[batch] = epochs_out
         else:
             # bads need to be dropped, this might occur after a preload
             # e.g., when calling drop_bad w/new params
             good_idx = []
             n_out = 0
             assert n_events == len(self.selection)
-            for idx, sel in enumerate(self.selection):
+            for batch in self._iter_epochs_batches(chunk_size):
                 if self.preload:  # from memory
+                    batch_noproj = self._data[batch]
+                    invalid = dict()
                     if self._do_delayed_proj:
-                        epoch_noproj = self._data[idx]
-                        epoch = self._project_epoch(epoch_noproj)
+                        batch_proj = self._project_epoch(batch_noproj)
                     else:
-                        epoch_noproj = None
-                        epoch = self._data[idx]
+                        batch_proj = batch_noproj
                 else:  # from disk
-                    epoch_noproj = self._get_epoch_from_raw(idx)
-                    epoch_noproj = self._detrend_offset_decim(epoch_noproj)
-                    epoch = self._project_epoch(epoch_noproj)
-
-                epoch_out = epoch_noproj if self._do_delayed_proj else epoch
-                is_good, offending_reason = self._is_good_epoch(epoch)
-                if not is_good:
-                    self.drop_log[sel] += offending_reason
-                    continue
-                good_idx.append(idx)
-
-                # store the epoch if there is a reason to (output or update)
-                if out or self.preload:
-                    # faster to pre-allocate, then trim as necessary
-                    if n_out == 0 and not self.preload:
-                        data = np.empty((n_events, epoch_out.shape[0],
-                                         epoch_out.shape[1]),
-                                        dtype=epoch_out.dtype, order='C')
-                    data[n_out] = epoch_out
-                    n_out += 1
+                    batch_noproj, invalid = self._get_epochs_from_raw(batch)
+                    batch_noproj = self._detrend_offset_decim(batch_noproj)
+                    batch_proj = self._project_epoch(batch_noproj)
+                batch_good = self._is_good_epochs(batch_proj, invalid, n_jobs)
+                batch_out = (batch_noproj if self._do_delayed_proj
+                             else batch_proj)
+                for ii, idx in enumerate(range(batch.start, batch.stop)):
+                    is_good, offending_reason = batch_good[ii]
+                    if not is_good:
+                        self.drop_log[self.selection[idx]] += offending_reason
+                        continue
+                    good_idx.append(idx)
+
+                    # store the epoch if there is a reason to (output)
+                    if out and not self.preload:
+                        # faster to pre-allocate, then trim as necessary
+                        if n_out == 0:
+                            data = np.empty((n_events,) + batch_out.shape[1:],
+                                            dtype=batch_out.dtype, order='C')
+                        data[n_out] = batch_out[ii]
+                        n_out += 1
 
             self._bad_dropped = True
             logger.info("%d bad epochs dropped" % (n_events - len(good_idx)))
 
-            # Now update our properties
+            # Now update our properties (this also selects preloaded data)
             self._getitem(good_idx, None, copy=False, drop_event_id=False)
 
-            # adjust the data size if there is a reason to (output or update)
-            if out or self.preload:
+            if self.preload:
+                data = self._data
+            elif out:  # adjust the data size
                 data.resize((n_out,) + data.shape[1:], refcheck=False)
 
         return data if out else None
@@ -1904,6 +2037,16 @@ class Epochs(BaseEpochs):
         supported) manner, the metadata object is subsetted in the same manner.
         MNE will modify the row indices to match ``epochs.selection``.
 
+        .. versionadded:: 0.16
+    n_jobs : int
+        Number of jobs to run in parallel when computing the peak-to-peak
+        amplitudes used by ``reject`` and ``flat`` while preloading.
+
+        .. versionadded:: 0.16
+    chunk_size : int | None
+        Number of epochs to load and check for rejection at once while
+        preloading. If None (default), chunks of about 64 MB are used.
+
         .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
@@ -1963,8 +2106,8 @@ class Epochs(BaseEpochs):
                  baseline=(None, 0), picks=None, preload=False, reject=None,
                  flat=None, proj=True, decim=1, reject_tmin=None,
                  reject_tmax=None, detrend=None, on_missing='error',
-                 reject_by_annotation=True, metadata=None,
-                 verbose=None):  # noqa: D102
+                 reject_by_annotation=True, metadata=None, n_jobs=1,
+                 chunk_size=None, verbose=None):  # noqa: D102
         if not isinstance(raw, BaseRaw):
             raise ValueError('The first argument to `Epochs` must be an '
                              'instance of mne.io.BaseRaw')
@@ -1981,7 +2124,7 @@ class Epochs(BaseEpochs):
             flat=flat, decim=decim, reject_tmin=reject_tmin,
             reject_tmax=reject_tmax, detrend=detrend,
             proj=proj, on_missing=on_missing, preload_at_end=preload,
-            verbose=verbose)
+            n_jobs=n_jobs, chunk_size=chunk_size, verbose=verbose)
 
     @verbose
     def _get_epoch_from_raw(self, idx, verbose=None):
@@ -1998,17 +2141,72 @@ class Epochs(BaseEpochs):
             raise ValueError('An error has occurred, no valid raw file found.'
                              ' Please report this to the mne-python '
                              'developers.')
-        sfreq = self._raw.info['sfreq']
-        event_samp = self.events[idx, 0]
-        # Read a data segment
-        first_samp = self._raw.first_samp
-        start = int(round(event_samp + self._raw_times[0] * sfreq))
-        start -= first_samp
+        start = self._get_epoch_start(idx)
         stop = start + len(self._raw_times)
         data = self._raw._check_bad_segment(start, stop, self.picks,
                                             self.reject_by_annotation)
         return data
 
+    def _get_epoch_start(self, idx):
+        """Get the first sample of an epoch in the raw data."""
+        sfreq = self._raw.info['sfreq']
+        event_samp = self.events[idx, 0]
+        start = int(round(event_samp + self._raw_times[0] * sfreq))
+        return start - self._raw.first_samp
+
+    def _get_epochs_from_raw(self, idx):
+        """Get a contiguous range of epochs from disk.
+
+        Nearby epochs are read together as a single raw data segment and then
+        sliced out of it, so overlapping or adjacent epochs are only read
+        once.
+        """
+        raw = self._raw
+        n_times = len(self._raw_times)
+        starts = np.array([self._get_epoch_start(ii) for ii in
+                           range(len(self.events))[idx]], int)
+        stops = starts + n_times
+        invalid = dict((ii, None) for ii in np.where(starts < 0)[0])
+        if self.reject_by_annotation and raw.annotations is not None:
+            annot = raw.annotations
+            is_bad = np.array([desc.lower().startswith('bad')
+                               for desc in annot.description], bool)
+            onset = _sync_onset(raw, annot.onset[is_bad])
+            offset = onset + annot.duration[is_bad]
+            sfreq = raw.info['sfreq']
+            overlaps = ((onset < stops[:, np.newaxis] / sfreq) &
+                        (offset > starts[:, np.newaxis] / sfreq))
+            for ii in np.where(overlaps.any(axis=1))[0]:
+                if ii not in invalid:
+                    desc = annot.description[is_bad][np.argmax(overlaps[ii])]
+                    invalid[ii] = desc
+        for ii in np.where(stops > raw.n_times)[0]:
+            invalid[ii] = invalid.get(ii, 'TOO_SHORT')
+        valid = np.setdiff1d(np.arange(len(starts)), list(invalid.keys()))
+        data = None
+        if len(valid) > 0:
+            # group epochs whose gaps are shorter than an epoch
+            valid = valid[np.argsort(starts[valid], kind='mergesort')]
+            splits = np.where(starts[valid[1:]] -
+                              stops[valid[:-1]] > n_times)[0] + 1
+            for group in np.split(valid, splits):
+                seg_start = starts[group[0]]
+                seg_stop = stops[group].max()
+                seg = raw[self.picks, seg_start:seg_stop][0]
+                if data is None:
+                    data = np.empty((len(starts), seg.shape[0], n_times),
+                                    seg.dtype)
+                # view of all possible epochs in the segment, then take ours
+                windows = as_strided(
+                    seg, shape=(seg.shape[1] - n_times + 1, seg.shape[0],
+                                n_times),
+                    strides=(seg.strides[1], seg.strides[0], seg.strides[1]))
+                data[group] = windows[starts[group] - seg_start]
+        if data is None:
+            data = np.empty((len(starts), len(self.ch_names), n_times))
+        data[list(invalid.keys())] = 0.
+        return data, invalid
+
 
 class EpochsArray(BaseEpochs):
     """Epochs object from numpy array.
@@ -2308,41 +2506,76 @@ def _is_good(e, ch_names, channel_type_idx, reject, flat, full_report=False,
     If full_report=True, it will give True/False as well as a list of all
     offending channels.
     """
-    bad_list = list()
-    has_printed = False
-    checkable = np.ones(len(ch_names), dtype=bool)
-    checkable[np.array([c in ignore_chs
-                        for c in ch_names], dtype=bool)] = False
+    bad_list = _get_bad_lists(_get_ptp(e[np.newaxis]), ch_names,
+                              channel_type_idx, reject, flat,
+                              ignore_chs=ignore_chs)[0]
+    if not full_report:
+        return len(bad_list) == 0
+    else:
+        if bad_list == []:
+            return True, None
+        else:
+            return False, bad_list
+
+
+def _get_ptp(data):
+    """Get the peak-to-peak amplitude of each channel of each epoch."""
+    return np.max(data, axis=-1) - np.min(data, axis=-1)
+
+
+def _chunk_slices(n, n_chunks):
+    """Split range(n) into (at most) n_chunks contiguous slices."""
+    bounds = np.linspace(0, n, n_chunks + 1).astype(int)
+    return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])
+            if stop > start]
+
+
+def _get_bad_lists(deltas, ch_names, channel_type_idx, reject, flat,
+                   ignore_chs=(), skip=()):
+    """Get the channels of each epoch that violate reject or flat.
+
+    Parameters
+    ----------
+    deltas : array, shape (n_epochs, n_channels)
+        The peak-to-peak amplitudes.
+    ch_names : list of str
+        The channel names.
+    channel_type_idx : dict
+        The channel indices for each channel type.
+    reject, flat : dict | None
+        The rejection and flat thresholds.
+    ignore_chs : list of str
+        Channels that are not checked.
+    skip : list of int
+        Epochs that are not checked (their list is empty).
+
+    Returns
+    -------
+    bad_lists : list of list of str
+        The offending channels of each epoch, in the order in which the
+        criteria and channel types are checked.
+    """
+    checkable = np.array([c not in ignore_chs for c in ch_names], bool)
+    do_check = np.ones(len(deltas), bool)
+    do_check[list(skip)] = False
+    bad_lists = [list() for _ in range(len(deltas))]
     for refl, f, t in zip([reject, flat], [np.greater, np.less], ['', 'flat']):
         if refl is not None:
             for key, thresh in iteritems(refl):
                 idx = channel_type_idx[key]
                 name = key.upper()
                 if len(idx) > 0:
-                    e_idx = e[idx]
-                    deltas = np.max(e_idx, axis=1) - np.min(e_idx, axis=1)
-                    checkable_idx = checkable[idx]
-                    idx_deltas = np.where(np.logical_and(f(deltas, thresh),
-                                                         checkable_idx))[0]
-
-                    if len(idx_deltas) > 0:
-                        ch_name = [ch_names[idx[i]] for i in idx_deltas]
-                        if (not has_printed):
+                    bads = np.logical_and(f(deltas[:, idx], thresh),
+                                          checkable[idx])
+                    bads &= do_check[:, np.newaxis]
+                    for ei in np.where(bads.any(axis=1))[0]:
+                        ch_name = [ch_names[idx[i]]
+                                   for i in np.where(bads[ei])[0]]
+                        if len(bad_lists[ei]) == 0:
                             logger.info('    Rejecting %s epoch based on %s : '
                                         '%s' % (t, name, ch_name))
-                            has_printed = True
-                        if not full_report:
-                            return False
-                        else:
-                            bad_list.extend(ch_name)
-
-    if not full_report:
-        return True
-    else:
-        if bad_list == []:
-            return True, None
-        else:
-            return False, bad_list
+                        bad_lists[ei].extend(ch_name)
+    return bad_lists
 
 
 def _read_one_epoch_file(f, tree, preload):
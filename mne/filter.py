@@ -1,10 +1,13 @@
 """IIR and FIR filtering and resampling functions."""
 
 from copy import deepcopy
+from fractions import Fraction
 from functools import partial
+from hashlib import sha1
 
 import numpy as np
-from scipy.fftpack import fft, ifftshift, fftfreq, ifft
+from numpy.lib.stride_tricks import as_strided
+from scipy.fftpack import fft, ifftshift, fftfreq, ifft, rfft, irfft
 
 from .cuda import (setup_cuda_fft_multiply_repeated, fft_multiply_repeated,
                    setup_cuda_fft_resample, fft_resample, _smart_pad)
@@ -13,10 +16,69 @@ from .fixes import get_sosfiltfilt, minimum_phase
 from .parallel import parallel_func, check_n_jobs
 from .time_frequency.multitaper import dpss_windows, _mt_spectra
 from .utils import (logger, verbose, sum_squared, check_version, warn,
-                    _check_preload)
+                    _check_preload, _LRUCache)
 
 # These values from Ifeachor and Jervis.
 _length_factors = dict(hann=3.1, hamming=3.3, blackman=5.0)
+# Number of samples of the FFT workspace used by overlap-add filtering
+_OVERLAP_ADD_WORKSPACE_SIZE = 2 ** 17
+# Number of samples of each group of channels filtered at once by IIR filters
+_IIR_WORKSPACE_SIZE = 2 ** 22
+# Number of samples of the input windows used at once by polyphase resampling
+_POLYPHASE_WORKSPACE_SIZE = 2 ** 20
+# Largest up or down factor of polyphase resampling
+_POLYPHASE_MAX_FACTOR = 1000
+
+
+###############################################################################
+# Caching of filter designs
+
+_filter_caches = dict(design=_LRUCache('MNE_FILTER_CACHE_SIZE', 32),
+                      fft=_LRUCache('MNE_FILTER_CACHE_SIZE', 32))
+
+
+def get_filter_cache_info():
+    """Get statistics about the cache of FIR filter designs.
+
+    FIR filter kernels (keyed by the sampling frequency, band edges, gains,
+    filter length, phase, window and design method) and the FFTs of these
+    kernels used for overlap-add filtering (keyed by the kernel and the FFT
+    length) are kept in memory and reused by all filtering functions and
+    methods. The maximum number of entries of each cache can be set with
+    the ``MNE_FILTER_CACHE_SIZE`` config value (default 32, use 0 to disable
+    caching).
+
+    Returns
+    -------
+    info : dict
+        Dictionary with entries ``'design'`` and ``'fft'`` for the two
+        caches, each being a dict with the number of cache ``'hits'``, cache
+        ``'misses'`` and the current number of entries (``'size'``).
+
+    See Also
+    --------
+    clear_filter_cache
+
+    Notes
+    -----
+    .. versionadded:: 0.16
+    """
+    return dict((key, cache.info) for key, cache in _filter_caches.items())
+
+
+def clear_filter_cache():
+    """Clear the cache of FIR filter designs and reset its statistics.
+
+    See Also
+    --------
+    get_filter_cache_info
+
+    Notes
+    -----
+    .. versionadded:: 0.16
+    """
+    for cache in _filter_caches.values():
+        cache.clear()
 
 
 def is_power2(num):
@@ -175,14 +237,72 @@ def _overlap_add_filter(x, h, n_fft=None, phase='zero', picks=None,
         h = np.convolve(h, h[::-1])
 
     # Determine FFT length to use
-    min_fft = 2 * len(h) - 1
+    n_fft = _get_n_fft(len(h), n_x, n_fft)
+
+    # Filter in frequency domain
+    h_fft = _get_h_fft(h, n_fft)
+
+    # Figure out if we should use CUDA
+    n_jobs, cuda_dict, h_fft = setup_cuda_fft_multiply_repeated(n_jobs, h_fft)
+
+    picks = np.arange(len(x)) if picks is None else picks
+    _overlap_add_rows(x, picks, h_fft, len(h), n_edge, phase, cuda_dict, pad,
+                      n_jobs)
+    x.shape = orig_shape
+    return x
+
+
+def _overlap_add_rows(x, picks, h_fft, n_h, n_edge, phase, cuda_dict, pad,
+                      n_jobs):
+    """Filter rows of a 2D array in place with overlap-add FFTs."""
+    if cuda_dict['use_cuda']:
+        # Process each row separately
+        for p in picks:
+            x[p] = _1d_overlap_filter(x[p], h_fft, n_h, n_edge, phase,
+                                      cuda_dict, pad)
+        return
+    # Process the rows in small groups, which keeps the FFT workspace of
+    # each group in the CPU cache
+    groups = _row_groups(picks, _OVERLAP_ADD_WORKSPACE_SIZE // len(h_fft))
+    if n_jobs == 1:
+        for group in groups:
+            x[group] = _2d_overlap_filter(x[group], h_fft, n_h, n_edge, phase,
+                                          pad)
+    else:
+        parallel, p_fun, _ = parallel_func(_2d_overlap_filter, n_jobs)
+        data_new = parallel(p_fun(x[group], h_fft, n_h, n_edge, phase, pad)
+                            for group in groups)
+        for group, data in zip(groups, data_new):
+            x[group] = data
+
+
+def _row_groups(picks, n_rows):
+    """Split picks into groups of at most n_rows rows."""
+    n_rows = max(n_rows, 1)
+    groups = [picks[ii:ii + n_rows] for ii in range(0, len(picks), n_rows)]
+    # avoid copies of the input when possible
+    return [slice(group[0], group[-1] + 1)
+            if (np.diff(group) == 1).all() else group for group in groups]
+
+
+def _get_h_fft(h, n_fft):
+    """Get the FFT of the zero-padded filter kernel."""
+    h = np.ascontiguousarray(h)
+    key = (n_fft, h.dtype.str, len(h), sha1(h.tobytes()).hexdigest())
+    return _filter_caches['fft'].get(key, lambda: fft(np.concatenate(
+        [h, np.zeros(n_fft - len(h), dtype=h.dtype)])))
+
+
+def _get_n_fft(n_h, n_x, n_fft=None):
+    """Determine the FFT length to use for overlap-add filtering."""
+    min_fft = 2 * n_h - 1
     if n_fft is None:
         max_fft = n_x
         if max_fft >= min_fft:
             # cost function based on number of multiplications
             N = 2 ** np.arange(np.ceil(np.log2(min_fft)),
                                np.ceil(np.log2(max_fft)) + 1, dtype=int)
-            cost = (np.ceil(n_x / (N - len(h) + 1).astype(np.float)) *
+            cost = (np.ceil(n_x / (N - n_h + 1).astype(np.float)) *
                     N * (np.log2(N) + 1))
 
             # add a heuristic term to prevent too-long FFT's which are slow
@@ -197,28 +317,7 @@ def _overlap_add_filter(x, h, n_fft=None, phase='zero', picks=None,
     if n_fft < min_fft:
         raise ValueError('n_fft is too short, has to be at least '
                          '2 * len(h) - 1 (%s), got %s' % (min_fft, n_fft))
-
-    # Filter in frequency domain
-    h_fft = fft(np.concatenate([h, np.zeros(n_fft - len(h), dtype=h.dtype)]))
-
-    # Figure out if we should use CUDA
-    n_jobs, cuda_dict, h_fft = setup_cuda_fft_multiply_repeated(n_jobs, h_fft)
-
-    # Process each row separately
-    picks = np.arange(len(x)) if picks is None else picks
-    if n_jobs == 1:
-        for p in picks:
-            x[p] = _1d_overlap_filter(x[p], h_fft, len(h), n_edge, phase,
-                                      cuda_dict, pad)
-    else:
-        parallel, p_fun, _ = parallel_func(_1d_overlap_filter, n_jobs)
-        data_new = parallel(p_fun(x[p], h_fft, len(h), n_edge, phase,
-                                  cuda_dict, pad) for p in picks)
-        for pp, p in enumerate(picks):
-            x[p] = data_new[pp]
-
-    x.shape = orig_shape
-    return x
+    return n_fft
 
 
 def _1d_overlap_filter(x, h_fft, n_h, n_edge, phase, cuda_dict, pad):
@@ -257,6 +356,180 @@ def _1d_overlap_filter(x, h_fft, n_h, n_edge, phase, cuda_dict, pad):
     return x_filtered
 
 
+# Padding modes that only depend on the samples near each edge, which makes
+# them usable when the signal is never held in memory as a whole
+_stream_pads = ('reflect_limited', 'reflect', 'symmetric', 'edge', 'constant',
+                'linear_ramp')
+
+
+class _OverlapAddStream(object):
+    """Filter a long signal block by block with overlap-add FFTs.
+
+    The output is the same as that of :func:`_overlap_add_filter` applied
+    to each segment of the whole signal, but only one block of output
+    samples (plus the filter length) is held in memory at a time.
+
+    Parameters
+    ----------
+    read : callable
+        ``read(start, stop)`` must return the data of all channels from
+        sample ``start`` up to (excluding) ``stop``.
+    n_times : int
+        The number of samples of the signal.
+    h : 1d array
+        Filter impulse response (FIR filter coefficients).
+    phase : str
+        The filter phase, see :func:`_overlap_add_filter`.
+    picks : array of int
+        Indices of the channels to filter, the others are left untouched.
+    n_jobs : int | str
+        Number of jobs to run in parallel (or 'cuda').
+    pad : str
+        Padding type for ``_smart_pad``, must be one of ``_stream_pads``.
+    segments : list of tuple | None
+        The ``(start, stop)`` sample pairs of the segments to filter
+        independently (e.g., between annotations). Samples outside of these
+        segments are left untouched. None (default) filters the whole signal.
+    block_size : int | None
+        Minimum number of output samples to compute at once. None (default)
+        uses four times the filter length.
+    """
+
+    def __init__(self, read, n_times, h, phase, picks, n_jobs=1,
+                 pad='reflect_limited', segments=None, block_size=None):
+        _check_zero_phase_length(len(h), phase)
+        if pad not in _stream_pads:
+            raise ValueError('pad must be one of %s when filtering in '
+                             'blocks, got "%s"' % (_stream_pads, pad))
+        self._n_jobs = check_n_jobs(n_jobs, allow_cuda=True)
+        self._read = read
+        self._n_times = int(n_times)
+        self._picks = np.array(picks, int).ravel()
+        self._phase = phase
+        self._pad = pad
+        # the edge padding is based on the length of the original filter
+        self._len_h = len(h)
+        if phase == 'zero-double':
+            h = np.convolve(h, h[::-1])
+        self._h = h
+        self._shift = (len(h) - 1) // 2 if phase.startswith('zero') else 0
+        if segments is None:
+            segments = [(0, self._n_times)]
+        self._segments = [(int(start), int(stop)) for start, stop in segments
+                          if stop > start]
+        self._block_size = 4 * len(h) if block_size is None else block_size
+        self._h_ffts = dict()
+        self._block = (0, 0, None)
+
+    def __call__(self, start, stop):
+        """Get the filtered data of all channels from start to stop."""
+        b_start, b_stop, data = self._block
+        if start < b_start or stop > b_stop:
+            # compute a new block holding an integer number of requests
+            n_req = stop - start
+            n_block = int(np.ceil(max(self._block_size, n_req) /
+                                  float(n_req))) * n_req
+            b_start, b_stop = start, min(start + n_block, self._n_times)
+            data = self._filter_block(b_start, b_stop)
+            self._block = (b_start, b_stop, data)
+        return data[:, start - b_start:stop - b_start]
+
+    def _filter_block(self, start, stop):
+        """Filter all segments overlapping with samples start to stop."""
+        data = self._read(start, stop)
+        for s_start, s_stop in self._segments:
+            this_start, this_stop = max(start, s_start), min(stop, s_stop)
+            if this_stop > this_start and len(self._picks) > 0:
+                data[self._picks, this_start - start:this_stop - start] = \
+                    self._filter_span(s_start, s_stop, this_start, this_stop)
+        return data
+
+    def _filter_span(self, s_start, s_stop, start, stop):
+        """Filter samples start to stop of the segment s_start to s_stop."""
+        n_x = s_stop - s_start
+        n_h = len(self._h)
+        n_edge = max(min(self._len_h, n_x) - 1, 0)
+        # The span of the padded segment the output depends on
+        e_start = start - s_start + n_edge - (n_h - 1 - self._shift)
+        e_stop = stop - s_start + n_edge + self._shift
+        x = np.zeros((len(self._picks), e_stop - e_start))
+        r_start = max(e_start - n_edge, 0)
+        r_stop = min(e_stop - n_edge, n_x)
+        if r_stop > r_start:
+            offset = r_start + n_edge - e_start
+            x[:, offset:offset + r_stop - r_start] = self._read(
+                s_start + r_start, s_start + r_stop)[self._picks]
+        if n_edge > 0 and e_start < n_edge:  # the left edge
+            head = self._read(s_start, s_start + n_edge + 1)[self._picks]
+            head = _smart_pad(head, (n_edge, 0), self._pad)[:, :n_edge]
+            first = max(e_start, 0)
+            x[:, first - e_start:n_edge - e_start] = head[:, first:]
+        if n_edge > 0 and e_stop > n_edge + n_x:  # the right edge
+            tail = self._read(s_stop - n_edge - 1, s_stop)[self._picks]
+            tail = _smart_pad(tail, (0, n_edge), self._pad)[:, -n_edge:]
+            last = min(e_stop, n_x + 2 * n_edge) - n_edge - n_x
+            x[:, n_x + n_edge - e_start:n_x + n_edge + last - e_start] = \
+                tail[:, :last]
+
+        # Filter in frequency domain, setting the transforms up only once
+        n_fft = _get_n_fft(n_h, x.shape[1])
+        if n_fft not in self._h_ffts:
+            self._h_ffts[n_fft] = setup_cuda_fft_multiply_repeated(
+                self._n_jobs, _get_h_fft(self._h, n_fft))
+        n_jobs, cuda_dict, h_fft = self._h_ffts[n_fft]
+        _overlap_add_rows(x, np.arange(len(x)), h_fft, n_h, 0, self._phase,
+                          cuda_dict, self._pad, n_jobs)
+        first = n_h - 1 - self._shift
+        return x[:, first:first + stop - start]
+
+
+def _2d_overlap_filter(x, h_fft, n_h, n_edge, phase, pad):
+    """Do overlap-add FFT FIR filtering of all rows of x at once."""
+    n_fft = len(h_fft)
+    # real and imaginary parts of h_fft as laid out by fftpack.rfft
+    n_pairs = (n_fft - 1) // 2
+    h_re = h_fft[1:n_pairs + 1].real
+    h_im = h_fft[1:n_pairs + 1].imag
+    # pad to reduce ringing
+    x_ext = _smart_pad(x, (n_edge, n_edge), pad)
+    n_x = x_ext.shape[1]
+    x_filtered = np.zeros_like(x_ext)
+    seg = np.empty((len(x), n_fft))
+
+    n_seg = n_fft - n_h + 1
+    n_segments = int(np.ceil(n_x / float(n_seg)))
+    shift = ((n_h - 1) // 2 if phase.startswith('zero') else 0) + n_edge
+
+    # Now the actual filtering step is identical for zero-phase (filtfilt-like)
+    # or single-pass
+    for seg_idx in range(n_segments):
+        start = seg_idx * n_seg
+        stop = min((seg_idx + 1) * n_seg, n_x)
+        seg[:, :stop - start] = x_ext[:, start:stop]
+        seg[:, stop - start:] = 0.
+        prod = rfft(seg, axis=-1)
+        prod[:, 0] *= h_fft[0].real
+        if n_fft % 2 == 0:
+            prod[:, -1] *= h_fft[n_fft // 2].real
+        pairs = prod[:, 1:2 * n_pairs + 1].reshape(len(x), n_pairs, 2)
+        p_re, p_im = pairs[..., 0], pairs[..., 1]
+        re = p_re * h_re
+        re -= p_im * h_im
+        p_im *= h_re
+        p_im += p_re * h_im
+        p_re[:] = re
+        prod = irfft(prod, axis=-1, overwrite_x=True)
+
+        start_filt = max(0, start - shift)
+        stop_filt = min(start - shift + n_fft, n_x)
+        start_prod = max(0, shift - start)
+        stop_prod = start_prod + stop_filt - start_filt
+        x_filtered[:, start_filt:stop_filt] += prod[:, start_prod:stop_prod]
+
+    # Remove mirrored edges that we added and cast (n_edge can be zero)
+    return x_filtered[:, :n_x - 2 * n_edge].astype(x.dtype, copy=False)
+
+
 def _filter_attenuation(h, freq, gain):
     """Compute minimum attenuation at stop frequency."""
     from scipy.signal import freqz
@@ -373,15 +646,31 @@ def _construct_fir_filter(sfreq, freq, gain, filter_length, phase, fir_window,
         x filtered.
     """
     assert freq[0] == 0
+    # issue a warning if attenuation is less than this
+    min_att_db = 12 if phase == 'minimum' else 20
+
+    key = (float(sfreq), tuple(np.array(freq, float)),
+           tuple(np.array(gain, float)), int(filter_length), phase,
+           fir_window, fir_design)
+    h, att_db, att_freq = _filter_caches['design'].get(key, partial(
+        _design_fir_filter, sfreq, freq, gain, filter_length, phase,
+        fir_window, fir_design))
+    if att_db < min_att_db:
+        warn('Attenuation at stop frequency %0.1fHz is only %0.1fdB. '
+             'Increase filter_length for higher attenuation.'
+             % (att_freq, att_db))
+    return h.copy()
+
+
+def _design_fir_filter(sfreq, freq, gain, filter_length, phase, fir_window,
+                       fir_design):
+    """Design a FIR filter and get its attenuation at the stop frequency."""
     if fir_design == 'firwin2':
         from scipy.signal import firwin2 as fir_design
     else:
         assert fir_design == 'firwin'
         fir_design = partial(_firwin_design, sfreq=sfreq)
 
-    # issue a warning if attenuation is less than this
-    min_att_db = 12 if phase == 'minimum' else 20
-
     # normalize frequencies
     freq = np.array(freq) / (sfreq / 2.)
     if freq[0] != 0 or freq[-1] != 1:
@@ -401,12 +690,7 @@ def _construct_fir_filter(sfreq, freq, gain, filter_length, phase, fir_window,
     att_db, att_freq = _filter_attenuation(h, freq, gain)
     if phase == 'zero-double':
         att_db += 6
-    if att_db < min_att_db:
-        att_freq *= sfreq / 2.
-        warn('Attenuation at stop frequency %0.1fHz is only %0.1fdB. '
-             'Increase filter_length for higher attenuation.'
-             % (att_freq, att_db))
-    return h
+    return h, att_db, att_freq * sfreq / 2.
 
 
 def _check_zero_phase_length(N, phase, gain_nyq=0):
@@ -434,33 +718,149 @@ def _check_coefficients(system):
                            'coefficients.')
 
 
-def _filtfilt(x, iir_params, picks, n_jobs, copy):
-    """Call filtfilt."""
+def _iir_filter(x, iir_params, picks, n_jobs, copy, phase='zero'):
+    """Apply an IIR filter to groups of channels at once.
+
+    The filter is applied forward and backward (via filtfilt), unless
+    ``phase='forward'``, in which case it is applied once forward.
+    """
     # set up array for filtering, reshape to 2D, operate on last axis
-    from scipy.signal import filtfilt
-    padlen = min(iir_params['padlen'], len(x))
+    from scipy.signal import filtfilt, lfilter, sosfilt
+    if phase != 'forward':
+        padlen = min(iir_params['padlen'], len(x))
     n_jobs = check_n_jobs(n_jobs)
     x, orig_shape, picks = _prep_for_filtering(x, copy, picks)
     if 'sos' in iir_params:
-        sosfiltfilt = get_sosfiltfilt()
-        fun = partial(sosfiltfilt, sos=iir_params['sos'], padlen=padlen)
         _check_coefficients(iir_params['sos'])
+        if phase == 'forward':
+            fun = partial(sosfilt, iir_params['sos'])
+        else:
+            fun = partial(get_sosfiltfilt(), iir_params['sos'], padlen=padlen)
     else:
-        fun = partial(filtfilt, b=iir_params['b'], a=iir_params['a'],
-                      padlen=padlen)
         _check_coefficients((iir_params['b'], iir_params['a']))
+        if phase == 'forward':
+            fun = partial(lfilter, iir_params['b'], iir_params['a'])
+        else:
+            fun = partial(filtfilt, iir_params['b'], iir_params['a'],
+                          padlen=padlen)
+    # Filter the rows in groups of a bounded size, at least one per job
+    n_rows = _IIR_WORKSPACE_SIZE // max(x.shape[1], 1)
+    if n_jobs > 1:
+        n_rows = min(n_rows, int(np.ceil(len(picks) / float(n_jobs))))
+    groups = _row_groups(picks, n_rows)
     if n_jobs == 1:
-        for p in picks:
-            x[p] = fun(x=x[p])
+        for group in groups:
+            x[group] = fun(x=x[group], axis=-1)
     else:
         parallel, p_fun, _ = parallel_func(fun, n_jobs)
-        data_new = parallel(p_fun(x=x[p]) for p in picks)
-        for pp, p in enumerate(picks):
-            x[p] = data_new[pp]
+        data_new = parallel(p_fun(x=x[group], axis=-1) for group in groups)
+        for group, data in zip(groups, data_new):
+            x[group] = data
     x.shape = orig_shape
     return x
 
 
+class _CausalIIRFilter(object):
+    """Apply a causal IIR filter to consecutive chunks of a signal.
+
+    The filter state of each row is carried from one chunk to the next, so
+    filtering the chunks one after the other gives the same result as
+    filtering the whole signal at once with :func:`_iir_filter` and
+    ``phase='forward'``.
+
+    Parameters
+    ----------
+    iir_params : dict
+        The IIR filter, with "sos" or "b" and "a" entries (see
+        :func:`construct_iir_filter`).
+    """
+
+    def __init__(self, iir_params):
+        if 'sos' in iir_params:
+            self._system = np.atleast_2d(iir_params['sos'])
+        else:
+            self._system = (np.atleast_1d(iir_params['b']),
+                            np.atleast_1d(iir_params['a']))
+        _check_coefficients(self._system)
+        self.reset()
+
+    def reset(self):
+        """Start filtering a new signal, with the filter at rest."""
+        self._zi = None
+
+    def __call__(self, x):
+        """Filter the next chunk x of shape (n_rows, n_times)."""
+        from scipy.signal import lfilter, sosfilt
+        if isinstance(self._system, tuple):
+            b, a = self._system
+            if self._zi is None:
+                self._zi = np.zeros((len(x), max(len(a), len(b)) - 1))
+            x, self._zi = lfilter(b, a, x, zi=self._zi)
+        else:
+            if self._zi is None:
+                self._zi = np.zeros((len(self._system), len(x), 2))
+            x, self._zi = sosfilt(self._system, x, zi=self._zi)
+        return x
+
+
+class _IIRStream(object):
+    """Filter a long signal block by block with a causal IIR filter.
+
+    The output is the same as that of :func:`_iir_filter` with
+    ``phase='forward'`` applied to each segment of the whole signal, but
+    only one block of data is held in memory at a time. Blocks should be
+    requested in order, otherwise the signal is filtered again from the
+    start.
+
+    Parameters
+    ----------
+    read : callable
+        ``read(start, stop)`` must return the data of all channels from
+        sample ``start`` up to (excluding) ``stop``.
+    n_times : int
+        The number of samples of the signal.
+    iir_params : dict
+        The IIR filter, with "sos" or "b" and "a" entries (see
+        :func:`construct_iir_filter`).
+    picks : array of int
+        Indices of the channels to filter, the others are left untouched.
+    segments : list of tuple | None
+        The ``(start, stop)`` sample pairs of the segments to filter
+        independently (e.g., between annotations). Samples outside of these
+        segments are left untouched. None (default) filters the whole signal.
+    """
+
+    def __init__(self, read, n_times, iir_params, picks, segments=None):
+        self._read = read
+        self._n_times = int(n_times)
+        self._picks = np.array(picks, int).ravel()
+        self._filter = _CausalIIRFilter(iir_params)
+        if segments is None:
+            segments = [(0, self._n_times)]
+        self._segments = sorted((int(start), int(stop))
+                                for start, stop in segments if stop > start)
+        self._next = 0
+
+    def __call__(self, start, stop):
+        """Get the filtered data of all channels from start to stop."""
+        if start < self._next:
+            self._next = 0
+        # bring the filter state up to the requested start
+        n_skip = max(stop - start, 1)
+        while self._next < start:
+            self(self._next, min(self._next + n_skip, start))
+        data = self._read(start, stop)
+        for s_start, s_stop in self._segments:
+            this_start, this_stop = max(start, s_start), min(stop, s_stop)
+            if this_stop > this_start and len(self._picks) > 0:
+                if this_start == s_start:
+                    self._filter.reset()
+                this = slice(this_start - start, this_stop - start)
+                data[self._picks, this] = self._filter(data[self._picks, this])
+        self._next = stop
+        return data
+
+
 def estimate_ringing_samples(system, max_try=100000):
     """Estimate filter ringing.
 
@@ -803,12 +1203,15 @@ def filter_data(data, sfreq, l_freq, h_freq, picks=None, filter_length='auto',
         If True, a copy of x, filtered, is returned. Otherwise, it operates
         on x in place.
     phase : str
-        Phase of the filter, only used if ``method='fir'``.
-        By default, a symmetric linear-phase FIR filter is constructed.
+        Phase of the filter. For ``method='fir'``, a symmetric
+        linear-phase FIR filter is constructed by default.
         If ``phase='zero'`` (default), the delay of this filter
         is compensated for. If ``phase=='zero-double'``, then this filter
         is applied twice, once forward, and once backward. If 'minimum',
         then a minimum-phase, causal filter will be used.
+        For ``method='iir'``, ``phase='zero'`` (default) applies the
+        filter forward and backward, and ``phase='forward'`` applies
+        it once forward, which gives a causal filter.
 
         .. versionadded:: 0.13
     fir_window : str
@@ -864,7 +1267,7 @@ def filter_data(data, sfreq, l_freq, h_freq, picks=None, filter_length='auto',
         data = _overlap_add_filter(data, filt, None, phase, picks, n_jobs,
                                    copy, pad)
     else:
-        data = _filtfilt(data, filt, picks, n_jobs, copy)
+        data = _iir_filter(data, filt, picks, n_jobs, copy, phase)
     return data
 
 
@@ -934,12 +1337,15 @@ def create_filter(data, sfreq, l_freq, h_freq, filter_length='auto',
         See mne.filter.construct_iir_filter for details. If iir_params
         is None and method="iir", 4th order Butterworth will be used.
     phase : str
-        Phase of the filter, only used if ``method='fir'``.
-        By default, a symmetric linear-phase FIR filter is constructed.
+        Phase of the filter. For ``method='fir'``, a symmetric
+        linear-phase FIR filter is constructed by default.
         If ``phase='zero'`` (default), the delay of this filter
         is compensated for. If ``phase=='zero-double'``, then this filter
         is applied twice, once forward, and once backward. If 'minimum',
         then a minimum-phase, causal filter will be used.
+        For ``method='iir'``, ``phase='zero'`` (default) applies the
+        filter forward and backward, and ``phase='forward'`` applies
+        it once forward, which gives a causal filter.
 
         .. versionadded:: 0.13
     fir_window : str
@@ -1231,12 +1637,15 @@ def notch_filter(x, Fs, freqs, filter_length='auto', notch_widths=None,
         If True, a copy of x, filtered, is returned. Otherwise, it operates
         on x in place.
     phase : str
-        Phase of the filter, only used if ``method='fir'``.
-        By default, a symmetric linear-phase FIR filter is constructed.
+        Phase of the filter. For ``method='fir'``, a symmetric
+        linear-phase FIR filter is constructed by default.
         If ``phase='zero'`` (default), the delay of this filter
         is compensated for. If ``phase=='zero-double'``, then this filter
         is applied twice, once forward, and once backward. If 'minimum',
         then a minimum-phase, causal filter will be used.
+        For ``method='iir'``, ``phase='zero'`` (default) applies the
+        filter forward and backward, and ``phase='forward'`` applies
+        it once forward, which gives a causal filter.
 
         .. versionadded:: 0.13
     fir_window : str
@@ -1306,25 +1715,12 @@ def notch_filter(x, Fs, freqs, filter_length='auto', notch_widths=None,
 
     # Only have to deal with notch_widths for non-autodetect
     if freqs is not None:
-        if notch_widths is None:
-            notch_widths = freqs / 200.0
-        elif np.any(notch_widths < 0):
-            raise ValueError('notch_widths must be >= 0')
-        else:
-            notch_widths = np.atleast_1d(notch_widths)
-            if len(notch_widths) == 1:
-                notch_widths = notch_widths[0] * np.ones_like(freqs)
-            elif len(notch_widths) != len(freqs):
-                raise ValueError('notch_widths must be None, scalar, or the '
-                                 'same length as freqs')
+        notch_widths = _check_notch_widths(freqs, notch_widths)
 
     if method in ('fir', 'iir'):
         # Speed this up by computing the fourier coefficients once
         tb_2 = trans_bandwidth / 2.0
-        lows = [freq - nw / 2.0 - tb_2
-                for freq, nw in zip(freqs, notch_widths)]
-        highs = [freq + nw / 2.0 + tb_2
-                 for freq, nw in zip(freqs, notch_widths)]
+        lows, highs = _notch_bands(freqs, notch_widths, trans_bandwidth)
         xf = filter_data(x, Fs, highs, lows, picks, filter_length, tb_2, tb_2,
                          n_jobs, method, iir_params, copy, phase, fir_window,
                          fir_design, pad=pad)
@@ -1335,6 +1731,32 @@ def notch_filter(x, Fs, freqs, filter_length='auto', notch_widths=None,
     return xf
 
 
+def _check_notch_widths(freqs, notch_widths):
+    """Check notch widths and broadcast them to the notch frequencies."""
+    if notch_widths is None:
+        notch_widths = freqs / 200.0
+    elif np.any(notch_widths < 0):
+        raise ValueError('notch_widths must be >= 0')
+    else:
+        notch_widths = np.atleast_1d(notch_widths)
+        if len(notch_widths) == 1:
+            notch_widths = notch_widths[0] * np.ones_like(freqs)
+        elif len(notch_widths) != len(freqs):
+            raise ValueError('notch_widths must be None, scalar, or the '
+                             'same length as freqs')
+    return notch_widths
+
+
+def _notch_bands(freqs, notch_widths, trans_bandwidth):
+    """Get the lower and upper edges of the notch stop bands."""
+    tb_2 = trans_bandwidth / 2.0
+    lows = [freq - nw / 2.0 - tb_2
+            for freq, nw in zip(freqs, notch_widths)]
+    highs = [freq + nw / 2.0 + tb_2
+             for freq, nw in zip(freqs, notch_widths)]
+    return lows, highs
+
+
 def _mt_spectrum_proc(x, sfreq, line_freqs, notch_widths, mt_bandwidth,
                       p_value, picks, n_jobs, copy):
     """Call _mt_spectrum_remove."""
@@ -1473,9 +1895,208 @@ def _mt_spectrum_remove(x, sfreq, line_freqs, notch_widths,
     return x - datafit, rm_freqs
 
 
+def _polyphase_factors(up, down):
+    """Get the integer up and down factors of polyphase resampling."""
+    ratio = float(up) / down
+    factors = Fraction(ratio).limit_denominator(_POLYPHASE_MAX_FACTOR)
+    up, down = factors.numerator, factors.denominator
+    if up == 0 or up > _POLYPHASE_MAX_FACTOR or \
+            abs(float(factors) - ratio) > 1e-9 * ratio:
+        raise ValueError('The resampling ratio %s cannot be written as a '
+                         'ratio of integers up to %d, use method="fft" '
+                         'instead' % (ratio, _POLYPHASE_MAX_FACTOR))
+    return up, down
+
+
+def _polyphase_kernel(up, down, window):
+    """Design the low-pass filter used by polyphase resampling."""
+    from scipy.signal import firwin
+    if not isinstance(window, (string_types, tuple)):
+        raise ValueError('window must be a str or tuple for polyphase '
+                         'resampling, got %s' % (type(window),))
+    max_rate = max(up, down)
+    key = ('polyphase', up, down, window)
+    return _filter_caches['design'].get(key, lambda: firwin(
+        20 * max_rate + 1, 1. / max_rate, window=window) * up)
+
+
+def _polyphase_span(start, stop, n_h, up, down):
+    """Get the input samples needed for the output samples start to stop."""
+    shift = (n_h - 1) // 2
+    return ((start * down + shift - n_h + 1) // up,
+            ((stop - 1) * down + shift) // up + 1)
+
+
+def _polyphase_block(x, first, h, up, down, start, stop):
+    """Compute the output samples start to stop of polyphase resampling.
+
+    Sample ``x[:, j]`` must be the input sample ``first + j``, and ``x``
+    must hold the span of samples given by :func:`_polyphase_span`.
+    """
+    shift = (len(h) - 1) // 2
+    y = np.empty((len(x), stop - start))
+    # Output samples r, r + up, r + 2 * up, ... all use the same phase of the
+    # filter, on windows of input samples that are down samples apart
+    for r in range(min(up, stop - start)):
+        t = (start + r) * down + shift
+        phase, q = t % up, t // up - first
+        h_r = h[phase::up][::-1]
+        n_out = (stop - start - r + up - 1) // up
+        assert 0 <= q - len(h_r) + 1 and q + (n_out - 1) * down < x.shape[1]
+        windows = as_strided(x[:, q - len(h_r) + 1:], strides=x.strides[:1] +
+                             (x.strides[1] * down, x.strides[1]),
+                             shape=(len(x), n_out, len(h_r)))
+        y[:, r::up] = np.dot(windows, h_r)
+    return y
+
+
+def _polyphase_rows(x, first, h, up, down, n_out):
+    """Resample all rows of x in blocks of output samples."""
+    y = np.empty((len(x), n_out))
+    n_block = max(_POLYPHASE_WORKSPACE_SIZE * up // (len(x) * len(h)), up)
+    for start in range(0, n_out, n_block):
+        stop = min(start + n_block, n_out)
+        y[:, start:stop] = _polyphase_block(x, first, h, up, down, start,
+                                            stop)
+    return y
+
+
+def _polyphase_resample(x, up, down, window, pad, n_jobs):
+    """Resample the rows of a 2D array with a polyphase FIR filter."""
+    n_jobs = check_n_jobs(n_jobs)
+    if up == down:  # nothing to do
+        return x.copy()
+    h = _polyphase_kernel(up, down, window)
+    n_in = x.shape[1]
+    n_out = int(round(n_in * up / float(down)))
+    if n_out == 0:
+        return np.zeros((len(x), 0), x.dtype)
+    start, stop = _polyphase_span(0, n_out, len(h), up, down)
+    x = _smart_pad(x, (max(-start, 0), max(stop - n_in, 0)), pad)
+    first = min(start, 0)
+    if n_jobs == 1:
+        y = _polyphase_rows(x, first, h, up, down, n_out)
+    else:
+        parallel, p_fun, _ = parallel_func(_polyphase_rows, n_jobs)
+        groups = _row_groups(np.arange(len(x)),
+                             int(np.ceil(len(x) / float(n_jobs))))
+        y = np.concatenate(parallel(p_fun(x[group], first, h, up, down,
+                                          n_out) for group in groups))
+    return y.astype(x.dtype, copy=False)
+
+
+class _PolyphaseStream(object):
+    """Resample a long signal block by block with a polyphase FIR filter.
+
+    The output is the same as that of :func:`resample` with
+    ``method='polyphase'`` applied to each segment of the whole signal,
+    with the stim channels resampled like :func:`_resample_stim_channels`
+    does, but only the input samples needed for the requested block of
+    output samples are held in memory.
+
+    Parameters
+    ----------
+    read : callable
+        ``read(start, stop)`` must return the data of all channels from
+        input sample ``start`` up to (excluding) ``stop``.
+    lengths : list of int
+        The number of input samples of each segment, which are resampled
+        independently (e.g., the files of concatenated raw instances).
+    up : int
+        Factor to upsample by.
+    down : int
+        Factor to downsample by.
+    window : str | tuple
+        The window used to design the FIR filter.
+    stim_picks : array of int
+        Indices of the stim channels, which are resampled without filtering.
+    pad : str
+        Padding type for ``_smart_pad``, must be one of ``_stream_pads``.
+
+    Attributes
+    ----------
+    lengths : list of int
+        The number of output samples of each segment.
+    """
+
+    def __init__(self, read, lengths, up, down, window, stim_picks,
+                 pad='reflect_limited'):
+        if pad not in _stream_pads:
+            raise ValueError('pad must be one of %s when resampling in '
+                             'blocks, got "%s"' % (_stream_pads, pad))
+        self._read = read
+        self._up, self._down = up, down
+        self._h = None if up == down else _polyphase_kernel(up, down, window)
+        self._stim_picks = np.array(stim_picks, int).ravel()
+        self._pad = pad
+        self._in_lengths = [int(n_in) for n_in in lengths]
+        self.lengths = [int(round(n_in * up / float(down)))
+                        for n_in in self._in_lengths]
+        self._in_offsets = np.concatenate([[0],
+                                           np.cumsum(self._in_lengths)])
+        self._offsets = np.concatenate([[0], np.cumsum(self.lengths)])
+
+    def __call__(self, start, stop):
+        """Get the resampled data of all channels from start to stop."""
+        data = list()
+        for si, n_out in enumerate(self.lengths):
+            s_start = self._offsets[si]
+            this_start = max(start, s_start) - s_start
+            this_stop = min(stop, s_start + n_out) - s_start
+            if this_stop > this_start:
+                data.append(self._resample_span(si, this_start, this_stop))
+        return np.concatenate(data, axis=1)
+
+    def _read_segment(self, si, start, stop):
+        """Read input samples start to stop of a segment."""
+        offset = self._in_offsets[si]
+        return self._read(offset + start, offset + stop)
+
+    def _resample_span(self, si, start, stop):
+        """Resample the output samples start to stop of a segment."""
+        n_in, n_out = self._in_lengths[si], self.lengths[si]
+        if self._h is None:
+            data = self._read_segment(si, start, stop)
+        else:
+            x, first = self._read_padded(si, start, stop)
+            data = _polyphase_block(x, first, self._h, self._up, self._down,
+                                    start, stop)
+        if len(self._stim_picks) > 0:
+            # same windows as _resample_stim_channels on the whole segment
+            starts, stops = _stim_windows(n_in, n_out, start, stop)
+            first = starts[0]
+            last = max(stops[-1], starts[-1] + 1)
+            stim = self._read_segment(si, first, last)[self._stim_picks]
+            data[self._stim_picks] = _stim_window_values(
+                stim, starts - first, stops - first)
+        return data
+
+    def _read_padded(self, si, start, stop):
+        """Read the (padded) input samples output start to stop depend on."""
+        n_in, n_h = self._in_lengths[si], len(self._h)
+        # the padding of the whole segment
+        s_start, s_stop = _polyphase_span(0, self.lengths[si], n_h, self._up,
+                                          self._down)
+        n_left, n_right = max(-s_start, 0), max(s_stop - n_in, 0)
+        first, last = _polyphase_span(start, stop, n_h, self._up,
+                                      self._down)
+        x = list()
+        if first < 0:  # the left edge
+            head = self._read_segment(si, 0, min(n_left + 1, n_in))
+            head = _smart_pad(head, (n_left, 0), self._pad)
+            x.append(head[:, first + n_left:min(last, 0) + n_left])
+        if min(last, n_in) > max(first, 0):
+            x.append(self._read_segment(si, max(first, 0), min(last, n_in)))
+        if last > n_in:  # the right edge
+            tail = self._read_segment(si, max(n_in - n_right - 1, 0), n_in)
+            tail = _smart_pad(tail, (0, n_right), self._pad)[:, -n_right:]
+            x.append(tail[:, max(first - n_in, 0):last - n_in])
+        return np.concatenate(x, axis=1), first
+
+
 @verbose
-def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
-             pad='reflect_limited', verbose=None):
+def resample(x, up=1., down=1., npad=100, axis=-1, window='auto', n_jobs=1,
+             pad='reflect_limited', method='fft', verbose=None):
     """Resample an array.
 
     Operates along the last dimension of the array.
@@ -1491,13 +2112,19 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
     npad : int | str
         Number of samples to use at the beginning and end for padding.
         Can be "auto" to pad to the next highest power of 2.
+        Only used for ``method='fft'``.
     axis : int
         Axis along which to resample (default is the last axis).
     window : string or tuple
-        See :func:`scipy.signal.resample` for description.
+        For ``method='fft'``, the frequency-domain window, see
+        :func:`scipy.signal.resample` for description. For
+        ``method='polyphase'``, the window used to design the FIR filter,
+        see :func:`scipy.signal.get_window`. The default "auto" uses
+        "boxcar" and ``('kaiser', 5.0)``, respectively.
     n_jobs : int | str
         Number of jobs to run in parallel. Can be 'cuda' if scikits.cuda
-        is installed properly and CUDA is initialized.
+        is installed properly and CUDA is initialized (only for
+        ``method='fft'``).
     pad : str
         The type of padding to use. Supports all :func:`numpy.pad` ``mode``
         options. Can also be "reflect_limited" (default), which pads with a
@@ -1505,6 +2132,14 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
         values of the vector, followed by zeros.
 
         .. versionadded:: 0.15
+    method : str
+        Can be "fft" (default) to resample in the frequency domain, or
+        "polyphase" to upsample, low-pass filter and downsample with a
+        polyphase FIR filter. The latter requires ``up / down`` to be a
+        ratio of integers no larger than 1000, and uses much less memory
+        for long signals.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -1522,10 +2157,15 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
     important consequences, and the default choices should work well
     for most natural signals.
 
-    Resampling arguments are broken into "up" and "down" components for future
-    compatibility in case we decide to use an upfirdn implementation. The
-    current implementation is functionally equivalent to passing
-    up=up/down and down=1.
+    Resampling arguments are broken into "up" and "down" components. The
+    FFT implementation is functionally equivalent to passing up=up/down and
+    down=1.
+
+    The polyphase implementation designs a linear-phase low-pass filter
+    of ``20 * max(up, down) + 1`` taps (at the upsampled rate) like
+    :func:`scipy.signal.resample_poly`, and only computes the output
+    samples that are kept. It processes the signal in blocks, so its memory
+    use is proportional to the size of the input and output.
     """
     from scipy.signal import get_window
     # check explicitly for backwards compatibility
@@ -1535,6 +2175,11 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
                "period of time, you might be intending to specify the "
                "subsequent window parameter." % repr(axis))
         raise TypeError(err)
+    if method not in ('fft', 'polyphase'):
+        raise ValueError('method must be "fft" or "polyphase", got "%s"'
+                         % (method,))
+    if isinstance(window, string_types) and window == 'auto':
+        window = 'boxcar' if method == 'fft' else ('kaiser', 5.0)
 
     # make sure our arithmetic will work
     x = np.asanyarray(x)
@@ -1549,6 +2194,14 @@ def resample(x, up=1., down=1., npad=100, axis=-1, window='boxcar', n_jobs=1,
     if x_len == 0:
         warn('x has zero length along last axis, returning a copy of x')
         return x.copy()
+    if method == 'polyphase':
+        up, down = _polyphase_factors(up, down)
+        y = _polyphase_resample(x.reshape((-1, x_len)), up, down, window,
+                                pad, n_jobs)
+        y.shape = orig_shape[:-1] + (y.shape[1],)
+        if axis != orig_last_axis:
+            y = y.swapaxes(axis, orig_last_axis)
+        return y
     bad_msg = 'npad must be "auto" or an integer'
     if isinstance(npad, string_types):
         if npad != 'auto':
@@ -1636,34 +2289,56 @@ def _resample_stim_channels(stim_data, up, down):
     See the decimate_stimch function in MNE/mne_browse_raw/save.c
     """
     stim_data = np.atleast_2d(stim_data)
-    n_stim_channels, n_samples = stim_data.shape
+    n_samples = stim_data.shape[1]
+    resampled_n_samples = int(round(n_samples * float(up) / down))
+    starts, stops = _stim_windows(n_samples, resampled_n_samples, 0,
+                                  resampled_n_samples, float(up) / down)
+    return _stim_window_values(stim_data, starts, stops)
 
-    ratio = float(up) / down
-    resampled_n_samples = int(round(n_samples * ratio))
 
-    stim_resampled = np.zeros((n_stim_channels, resampled_n_samples))
+def _stim_windows(n_samples, n_resampled, start, stop, ratio=None):
+    """Get the windows of stim samples of resampled samples start to stop.
+
+    Parameters
+    ----------
+    n_samples : int
+        The number of samples before resampling.
+    n_resampled : int
+        The number of samples after resampling.
+    start, stop : int
+        The range of resampled samples to get the windows of.
+    ratio : float | None
+        The resampling ratio, None (default) uses
+        ``n_resampled / n_samples``.
 
+    Returns
+    -------
+    starts, stops : array of int
+        The window of each resampled sample, in samples before resampling.
+    """
+    if ratio is None:
+        ratio = float(n_resampled) / n_samples
     # Figure out which points in old data to subsample protect against
     # out-of-bounds, which can happen (having one sample more than
     # expected) due to padding
-    sample_picks = np.minimum(
-        (np.arange(resampled_n_samples) / ratio).astype(int),
-        n_samples - 1
-    )
-
-    # Create windows starting from sample_picks[i], ending at sample_picks[i+1]
-    windows = zip(sample_picks, np.r_[sample_picks[1:], n_samples])
-
-    # Use the first non-zero value in each window
-    for window_i, window in enumerate(windows):
-        for stim_num, stim in enumerate(stim_data):
-            nonzero = stim[window[0]:window[1]].nonzero()[0]
-            if len(nonzero) > 0:
-                val = stim[window[0] + nonzero[0]]
-            else:
-                val = stim[window[0]]
-            stim_resampled[stim_num, window_i] = val
-
+    picks = np.minimum((np.arange(start, stop + 1) / ratio).astype(int),
+                       n_samples - 1)
+    # Each window starts at picks[i] and ends at picks[i + 1]
+    if stop == n_resampled:
+        picks[-1] = n_samples
+    return picks[:-1], picks[1:]
+
+
+def _stim_window_values(stim_data, starts, stops):
+    """Use the first non-zero value in each window (or its first value)."""
+    stim_resampled = stim_data[:, starts].astype(np.float64)
+    for stim, resampled in zip(stim_data, stim_resampled):
+        nonzero = np.flatnonzero(stim)
+        first = np.searchsorted(nonzero, starts)
+        first_nonzero = nonzero[np.minimum(first, len(nonzero) - 1)] \
+            if len(nonzero) > 0 else starts
+        use = (first < len(nonzero)) & (first_nonzero < stops)
+        resampled[use] = stim[first_nonzero[use]]
     return stim_resampled
 
 
@@ -1715,9 +2390,12 @@ def _triage_filter_params(x, sfreq, l_freq, h_freq,
                           fir_design, bands='scalar', reverse=False):
     """Validate and automate filter parameter selection."""
     if not isinstance(phase, string_types) or phase not in \
-            ('linear', 'zero', 'zero-double', 'minimum', ''):
+            ('linear', 'zero', 'zero-double', 'minimum', 'forward', ''):
         raise ValueError('phase must be "linear", "zero", "zero-double", '
-                         'or "minimum", got "%s"' % (phase,))
+                         '"minimum", or "forward", got "%s"' % (phase,))
+    if phase == 'forward' and method != 'iir':
+        raise ValueError('phase="forward" can only be used with '
+                         'method="iir"')
     if not isinstance(fir_window, string_types) or fir_window not in \
             ('hann', 'hamming', 'blackman', ''):
         raise ValueError('fir_window must be "hamming", "hann", or "blackman",'
@@ -2001,12 +2679,15 @@ class FilterMixin(object):
             See mne.filter.construct_iir_filter for details. If iir_params
             is None and method="iir", 4th order Butterworth will be used.
         phase : str
-            Phase of the filter, only used if ``method='fir'``.
-            By default, a symmetric linear-phase FIR filter is constructed.
+            Phase of the filter. For ``method='fir'``, a symmetric
+            linear-phase FIR filter is constructed by default.
             If ``phase='zero'`` (default), the delay of this filter
             is compensated for. If ``phase=='zero-double'``, then this filter
             is applied twice, once forward, and once backward. If 'minimum',
             then a minimum-phase, causal filter will be used.
+            For ``method='iir'``, ``phase='zero'`` (default) applies the
+            filter forward and backward, and ``phase='forward'`` applies
+            it once forward, which gives a causal filter.
         fir_window : str
             The window to use in FIR design, can be "hamming" (default),
             "hann" (default in 0.13), or "blackman".
@@ -2049,8 +2730,8 @@ class FilterMixin(object):
         return self
 
     @verbose
-    def resample(self, sfreq, npad='auto', window='boxcar', n_jobs=1,
-                 pad='edge', verbose=None):
+    def resample(self, sfreq, npad='auto', window='auto', n_jobs=1,
+                 pad='edge', method='fft', verbose=None):
         """Resample data.
 
         .. note:: Data must be loaded.
@@ -2063,8 +2744,9 @@ class FilterMixin(object):
             Amount to pad the start and end of the data.
             Can also be "auto" to use a padding that will result in
             a power-of-two size (can be much faster).
+            Only used for ``method='fft'``.
         window : string or tuple
-            Window to use in resampling. See :func:`scipy.signal.resample`.
+            Window to use in resampling. See :func:`mne.filter.resample`.
         n_jobs : int
             Number of jobs to run in parallel.
         pad : str
@@ -2075,6 +2757,12 @@ class FilterMixin(object):
             which pads with the edge values of each vector.
 
             .. versionadded:: 0.15
+        method : str
+            Can be "fft" (default) to resample in the frequency domain, or
+            "polyphase" to use a polyphase FIR filter. See
+            :func:`mne.filter.resample`.
+
+            .. versionadded:: 0.16
         verbose : bool, str, int, or None
             If not None, override default verbose level (see
             :func:`mne.verbose` :ref:`Logging documentation <tut_logging>` for
@@ -2099,7 +2787,7 @@ class FilterMixin(object):
         sfreq = float(sfreq)
         o_sfreq = self.info['sfreq']
         self._data = resample(self._data, sfreq, o_sfreq, npad, window=window,
-                              n_jobs=n_jobs, pad=pad)
+                              n_jobs=n_jobs, pad=pad, method=method)
         self.info['sfreq'] = float(sfreq)
         self.times = (np.arange(self._data.shape[-1], dtype=np.float) /
                       sfreq + self.times[0])
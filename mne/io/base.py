@@ -30,8 +30,10 @@ from .write import (start_file, end_file, start_block, end_block,
 
 from ..annotations import _annotations_starts_stops, _write_annotations
 from ..filter import (filter_data, notch_filter, resample, next_fast_len,
-                      _resample_stim_channels, _filt_check_picks,
-                      _filt_update_info)
+                      create_filter, _resample_stim_channels,
+                      _filt_check_picks, _filt_update_info,
+                      _OverlapAddStream, _IIRStream, _PolyphaseStream,
+                      _polyphase_factors, _check_notch_widths, _notch_bands)
 from ..parallel import parallel_func
 from ..utils import (_check_fname, _check_pandas_installed, sizeof_fmt,
                      _check_pandas_index_arguments,
@@ -1100,7 +1102,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                method='fir', iir_params=None, phase='zero',
                fir_window='hamming', fir_design='firwin',
                skip_by_annotation=('edge', 'bad_acq_skip'),
-               pad='reflect_limited', verbose=None):
+               pad='reflect_limited', fname=None, overwrite=False,
+               verbose=None):
         """Filter a subset of channels.
 
         Applies a zero-phase low-pass, high-pass, band-pass, or band-stop
@@ -1108,7 +1111,7 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         of the Raw object is modified inplace.
 
         The Raw object has to have the data loaded e.g. with ``preload=True``
-        or ``self.load_data()``.
+        or ``self.load_data()``, unless ``fname`` is given.
 
         ``l_freq`` and ``h_freq`` are the frequencies below which and above
         which, respectively, to filter out of the data. Thus the uses are:
@@ -1177,12 +1180,15 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             See mne.filter.construct_iir_filter for details. If iir_params
             is None and method="iir", 4th order Butterworth will be used.
         phase : str
-            Phase of the filter, only used if ``method='fir'``.
-            By default, a symmetric linear-phase FIR filter is constructed.
+            Phase of the filter. For ``method='fir'``, a symmetric
+            linear-phase FIR filter is constructed by default.
             If ``phase='zero'`` (default), the delay of this filter
             is compensated for. If ``phase=='zero-double'``, then this filter
             is applied twice, once forward, and once backward. If 'minimum',
             then a minimum-phase, causal filter will be used.
+            For ``method='iir'``, ``phase='zero'`` (default) applies the
+            filter forward and backward, and ``phase='forward'`` applies
+            it once forward, which gives a causal filter.
 
             .. versionadded:: 0.13
         fir_window : str
@@ -1216,6 +1222,20 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             Only used for ``method='fir'``.
 
             .. versionadded:: 0.15
+        fname : str | None
+            If not None, the filtered data are written block by block to a
+            new raw FIF file with this name, and a new (not preloaded)
+            instance of Raw reading that file is returned, leaving this
+            instance unchanged. The data do not need to be loaded in this
+            case, and only a few filter lengths of data are held in memory
+            at a time. Only FIR filtering and causal IIR filtering
+            (``method='iir'`` with ``phase='forward'``) are supported.
+
+            .. versionadded:: 0.16
+        overwrite : bool
+            If True, the file ``fname`` is overwritten if it exists.
+
+            .. versionadded:: 0.16
         verbose : bool, str, int, or None
             If not None, override default verbose level (see
             :func:`mne.verbose` and :ref:`Logging documentation <tut_logging>`
@@ -1224,7 +1244,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         Returns
         -------
         raw : instance of Raw
-            The raw instance with filtered data.
+            The raw instance with filtered data (a new instance reading the
+            file ``fname`` if it is not None).
 
         See Also
         --------
@@ -1239,12 +1260,28 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         For more information, see the tutorials :ref:`tut_background_filtering`
         and :ref:`tut_artifacts_filter`.
         """
-        _check_preload(self, 'raw.filter')
+        if fname is None:
+            _check_preload(self, 'raw.filter')
         update_info, picks = _filt_check_picks(self.info, picks,
                                                l_freq, h_freq)
         # Deal with annotations
         onsets, ends = _annotations_starts_stops(
             self, skip_by_annotation, 'skip_by_annotation', invert=True)
+        if fname is not None:
+            segments = [(start, stop) for start, stop in zip(onsets, ends)
+                        if stop > start]
+            # if all data are skipped, they are copied unfiltered like the
+            # preloaded data are left untouched
+            n_times = min([stop - start for start, stop in segments] or
+                          [self.n_times])
+            h = self._create_stream_filter(
+                n_times, l_freq, h_freq, filter_length, l_trans_bandwidth,
+                h_trans_bandwidth, method, iir_params, phase, fir_window,
+                fir_design)
+            info = self.info.copy()
+            _filt_update_info(info, update_info, l_freq, h_freq)
+            return self._filter_to_file(fname, overwrite, info, h, picks,
+                                        phase, n_jobs, pad, segments)
         for start, stop in zip(onsets, ends):
             filter_data(
                 self._data[:, start:stop], self.info['sfreq'], l_freq, h_freq,
@@ -1261,14 +1298,15 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                      notch_widths=None, trans_bandwidth=1.0, n_jobs=1,
                      method='fft', iir_params=None, mt_bandwidth=None,
                      p_value=0.05, phase='zero', fir_window='hamming',
-                     fir_design='firwin', pad='reflect_limited', verbose=None):
+                     fir_design='firwin', pad='reflect_limited', fname=None,
+                     overwrite=False, verbose=None):
         """Notch filter a subset of channels.
 
         Applies a zero-phase notch filter to the channels selected by
         "picks". By default the data of the Raw object is modified inplace.
 
         The Raw object has to have the data loaded e.g. with ``preload=True``
-        or ``self.load_data()``.
+        or ``self.load_data()``, unless ``fname`` is given.
 
         .. note:: If n_jobs > 1, more memory is required as
                   ``len(picks) * n_times`` additional time points need to
@@ -1324,12 +1362,15 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             freqs=None. Note that this will be Bonferroni corrected for the
             number of frequencies, so large p-values may be justified.
         phase : str
-            Phase of the filter, only used if ``method='fir'``.
-            By default, a symmetric linear-phase FIR filter is constructed.
+            Phase of the filter. For ``method='fir'``, a symmetric
+            linear-phase FIR filter is constructed by default.
             If ``phase='zero'`` (default), the delay of this filter
             is compensated for. If ``phase=='zero-double'``, then this filter
             is applied twice, once forward, and once backward. If 'minimum',
             then a minimum-phase, causal filter will be used.
+            For ``method='iir'``, ``phase='zero'`` (default) applies the
+            filter forward and backward, and ``phase='forward'`` applies
+            it once forward, which gives a causal filter.
 
             .. versionadded:: 0.13
         fir_window : str
@@ -1352,6 +1393,20 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             Only used for ``method='fir'``.
 
             .. versionadded:: 0.15
+        fname : str | None
+            If not None, the filtered data are written block by block to a
+            new raw FIF file with this name, and a new (not preloaded)
+            instance of Raw reading that file is returned, leaving this
+            instance unchanged. The data do not need to be loaded in this
+            case, and only a few filter lengths of data are held in memory
+            at a time. Only FIR filtering and causal IIR filtering
+            (``method='iir'`` with ``phase='forward'``) are supported.
+
+            .. versionadded:: 0.16
+        overwrite : bool
+            If True, the file ``fname`` is overwritten if it exists.
+
+            .. versionadded:: 0.16
         verbose : bool, str, int, or None
             If not None, override default verbose level (see
             :func:`mne.verbose` and :ref:`Logging documentation <tut_logging>`
@@ -1360,7 +1415,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         Returns
         -------
         raw : instance of Raw
-            The raw instance with filtered data.
+            The raw instance with filtered data (a new instance reading the
+            file ``fname`` if it is not None).
 
         See Also
         --------
@@ -1378,6 +1434,19 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                 raise RuntimeError('Could not find any valid channels for '
                                    'your Raw object. Please contact the '
                                    'MNE-Python developers.')
+        if fname is not None:
+            if freqs is None:
+                raise ValueError('freqs=None (method "spectrum_fit") is not '
+                                 'supported when writing to a file')
+            freqs = np.atleast_1d(freqs)
+            notch_widths = _check_notch_widths(freqs, notch_widths)
+            lows, highs = _notch_bands(freqs, notch_widths, trans_bandwidth)
+            h = self._create_stream_filter(
+                self.n_times, highs, lows, filter_length,
+                trans_bandwidth / 2., trans_bandwidth / 2., method,
+                iir_params, phase, fir_window, fir_design)
+            return self._filter_to_file(fname, overwrite, self.info, h,
+                                        picks, phase, n_jobs, pad)
         _check_preload(self, 'raw.notch_filter')
         self._data = notch_filter(
             self._data, fs, freqs, filter_length=filter_length,
@@ -1388,13 +1457,65 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             pad=pad)
         return self
 
+    def _create_stream_filter(self, n_times, l_freq, h_freq, filter_length,
+                              l_trans_bandwidth, h_trans_bandwidth, method,
+                              iir_params, phase, fir_window, fir_design):
+        """Design a filter for data that are filtered in blocks."""
+        if method == 'iir' and phase != 'forward':
+            raise ValueError('Only causal IIR filtering (phase="forward") is '
+                             'supported when writing to a file, got '
+                             'phase="%s"' % (phase,))
+        # the data are only used to check the filter length
+        return create_filter(
+            np.empty((0, n_times)), self.info['sfreq'], l_freq, h_freq,
+            filter_length, l_trans_bandwidth, h_trans_bandwidth, method,
+            iir_params, phase, fir_window, fir_design)
+
+    def _filter_to_file(self, fname, overwrite, info, h, picks, phase,
+                        n_jobs, pad, segments=None):
+        """Filter the data block by block while writing them to a file."""
+        if isinstance(h, dict):  # IIR
+            stream = _IIRStream(self._read_copy, self.n_times, h, picks,
+                                segments)
+        else:
+            stream = _OverlapAddStream(self._read_copy, self.n_times, h,
+                                       phase, picks, n_jobs, pad, segments)
+        return self._stream_to_file(fname, overwrite, self, info, stream)
+
+    def _read_copy(self, start, stop):
+        """Get a copy of the data of all channels from start to stop."""
+        data = self[:, start:stop][0]
+        return data.copy() if self.preload else data
+
+    def _stream_to_file(self, fname, overwrite, raw, info, stream):
+        """Write the data computed block by block by stream to a file.
+
+        ``raw`` gives the sample times of the written data, which can differ
+        from those of this instance (e.g., after resampling).
+        """
+        from .fiff.raw import read_raw_fif
+        check_fname(fname, 'raw', ('raw.fif', 'raw_sss.fif', 'raw_tsss.fif',
+                                   'raw.fif.gz', 'raw_sss.fif.gz',
+                                   'raw_tsss.fif.gz'))
+        fname = op.realpath(fname)
+        if fname in self._filenames:
+            raise ValueError('You cannot save data to the same file.'
+                             ' Please use a different filename.')
+        _check_fname(fname, overwrite)
+        buffer_size = raw._get_buffer_size()
+        _write_raw(fname, raw, info, None, 'single', FIFF.FIFFT_FLOAT, True,
+                   0, raw.n_times, buffer_size, None, False,
+                   _get_split_size('2GB'), 0, None, stream)
+        return read_raw_fif(fname, verbose=self.verbose)
+
     @verbose
-    def resample(self, sfreq, npad='auto', window='boxcar', stim_picks=None,
-                 n_jobs=1, events=None, pad='reflect_limited', verbose=None):
+    def resample(self, sfreq, npad='auto', window='auto', stim_picks=None,
+                 n_jobs=1, events=None, pad='reflect_limited', method='fft',
+                 fname=None, overwrite=False, verbose=None):
         """Resample all channels.
 
         The Raw object has to have the data loaded e.g. with ``preload=True``
-        or ``self.load_data()``.
+        or ``self.load_data()``, unless ``fname`` is given.
 
         .. warning:: The intended purpose of this function is primarily to
                      speed up computations (e.g., projection calculation) when
@@ -1420,9 +1541,13 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             Amount to pad the start and end of the data.
             Can also be "auto" to use a padding that will result in
             a power-of-two size (can be much faster).
+            Only used for ``method='fft'``.
         window : string or tuple
-            Frequency-domain window to use in resampling.
-            See :func:`scipy.signal.resample`.
+            Frequency-domain window to use in resampling for
+            ``method='fft'`` (see :func:`scipy.signal.resample`), or the
+            window used to design the FIR filter for ``method='polyphase'``.
+            The default "auto" uses "boxcar" and ``('kaiser', 5.0)``,
+            respectively.
         stim_picks : array of int | None
             Stim channels. These channels are simply subsampled or
             supersampled (without applying any filtering). This reduces
@@ -1443,6 +1568,29 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             values of the vector, followed by zeros.
 
             .. versionadded:: 0.15
+        method : str
+            Can be "fft" (default) to resample in the frequency domain, or
+            "polyphase" to use a polyphase FIR filter, which requires the
+            ratio of the sampling rates to be a ratio of small integers
+            (e.g., 5000 Hz to 250 Hz) and uses much less memory. See
+            :func:`mne.filter.resample`.
+
+            .. versionadded:: 0.16
+        fname : str | None
+            If not None, the resampled data are written block by block to a
+            new raw FIF file with this name, and a new (not preloaded)
+            instance of Raw reading that file is returned, leaving this
+            instance unchanged. The data do not need to be loaded in this
+            case, and only the samples needed for one output buffer are held
+            in memory at a time. Only ``method='polyphase'`` is supported,
+            and ``pad`` must not depend on the whole signal (e.g., "wrap" or
+            "mean" cannot be used).
+
+            .. versionadded:: 0.16
+        overwrite : bool
+            If True, the file ``fname`` is overwritten if it exists.
+
+            .. versionadded:: 0.16
         verbose : bool, str, int, or None
             If not None, override default verbose level (see
             :func:`mne.verbose` and :ref:`Logging documentation <tut_logging>`
@@ -1451,7 +1599,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         Returns
         -------
         raw : instance of Raw
-            The resampled version of the raw object.
+            The resampled version of the raw object (a new instance reading
+            the file ``fname`` if it is not None).
         events : 2D array, shape (n_events, 3) | None
             If events are jointly resampled, these are returned with the raw.
 
@@ -1465,13 +1614,18 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         For some data, it may be more accurate to use ``npad=0`` to reduce
         artifacts. This is dataset dependent -- check your data!
         """  # noqa: E501
-        _check_preload(self, 'raw.resample')
+        if fname is None:
+            _check_preload(self, 'raw.resample')
+        elif method != 'polyphase':
+            raise ValueError('Only method="polyphase" is supported when '
+                             'writing to a file, got method="%s"' % (method,))
 
         # When no event object is supplied, some basic detection of dropped
         # events is performed to generate a warning. Finding events can fail
         # for a variety of reasons, e.g. if no stim channel is present or it is
         # corrupted. This should not stop the resampling from working. The
         # warning should simply not be generated in this case.
+        original_events = None
         if events is None:
             try:
                 original_events = find_events(self)
@@ -1492,11 +1646,28 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                                     stim=True, exclude=[])
         stim_picks = np.asanyarray(stim_picks)
 
+        if fname is not None:
+            up, down = _polyphase_factors(sfreq, o_sfreq)
+            if isinstance(window, string_types) and window == 'auto':
+                window = ('kaiser', 5.0)
+            stream = _PolyphaseStream(self._read_copy, self._raw_lengths, up,
+                                      down, window, stim_picks, pad)
+            # only the sample times of the resampled data are needed here
+            raw = copy.copy(self)
+            raw.info = self.info.copy()
+            raw._first_samps = np.array(self._first_samps)
+            raw._last_samps = np.array(self._last_samps)
+            raw._set_resampled_times(sfreq, stream.lengths)
+            raw = self._stream_to_file(fname, overwrite, raw, raw.info,
+                                       stream)
+            return raw._check_resampled_events(events, original_events,
+                                               ratio)
+
         for ri in range(len(self._raw_lengths)):
             data_chunk = self._data[:, offsets[ri]:offsets[ri + 1]]
             new_data.append(resample(data_chunk, sfreq, o_sfreq, npad,
-                                     window=window, n_jobs=n_jobs, pad=pad))
-            new_ntimes = new_data[ri].shape[1]
+                                     window=window, n_jobs=n_jobs, pad=pad,
+                                     method=method))
 
             # In empirical testing, it was faster to resample all channels
             # (above) and then replace the stim channels than it was to only
@@ -1508,17 +1679,24 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                     data_chunk.shape[1])
                 new_data[ri][stim_picks] = stim_resampled
 
-            self._first_samps[ri] = int(self._first_samps[ri] * ratio)
-            self._last_samps[ri] = self._first_samps[ri] + new_ntimes - 1
-            self._raw_lengths[ri] = new_ntimes
-
         self._data = np.concatenate(new_data, axis=1)
+        self._set_resampled_times(sfreq, [d.shape[1] for d in new_data])
+        return self._check_resampled_events(events, original_events, ratio)
+
+    def _set_resampled_times(self, sfreq, lengths):
+        """Update the samples of each file after resampling to sfreq."""
+        ratio = sfreq / float(self.info['sfreq'])
+        for ri, n_times in enumerate(lengths):
+            self._first_samps[ri] = int(self._first_samps[ri] * ratio)
+            self._last_samps[ri] = self._first_samps[ri] + n_times - 1
         self.info['sfreq'] = sfreq
         if self.info.get('lowpass') is not None:
             self.info['lowpass'] = min(self.info['lowpass'], sfreq / 2.)
         self._update_times()
 
-        # See the comment above why we ignore all errors here.
+    def _check_resampled_events(self, events, original_events, ratio):
+        """Check for lost events or resample the events after resampling."""
+        # See the comment in resample why we ignore all errors here.
         if events is None:
             try:
                 # Did we loose events?
@@ -1538,7 +1716,7 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
             events[:, 0] = np.minimum(
                 np.round(events[:, 0] * ratio).astype(int),
-                self._data.shape[1] + self.first_samp
+                self.n_times + self.first_samp
             )
             return self, events
 
@@ -2148,8 +2326,12 @@ class _RawShell():
 # Writing
 def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
                stop, buffer_size, projector, drop_small_buffer,
-               split_size, part_idx, prev_fname):
-    """Write raw file with splitting."""
+               split_size, part_idx, prev_fname, read=None):
+    """Write raw file with splitting.
+
+    If ``read`` is not None, it is called as ``read(start, stop)`` to get the
+    data of all channels to write instead of reading them from ``raw``.
+    """
     # we've done something wrong if we hit this
     n_times_max = len(raw.times)
     if start >= stop or stop > n_times_max:
@@ -2222,7 +2404,11 @@ def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
                 # write_nop(fid)
                 # write_nop(fid)
                 n_current_skip = 0
-        data, times = raw[use_picks, first:last]
+        if read is None:
+            data, times = raw[use_picks, first:last]
+        else:
+            data = read(first, last)[use_picks]
+            times = raw.times[first:last]
         assert len(times) == last - first
 
         if projector is not None:
@@ -2259,7 +2445,7 @@ def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
                 fname, raw, info, picks, fmt,
                 data_type, reset_range, first + buffer_size, stop, buffer_size,
                 projector, drop_small_buffer, split_size,
-                part_idx + 1, use_fname)
+                part_idx + 1, use_fname, read)
 
             start_block(fid, FIFF.FIFFB_REF)
             write_int(fid, FIFF.FIFF_REF_ROLE, FIFF.FIFFV_ROLE_NEXT_FILE)
@@ -6,6 +6,7 @@
 #
 # License: BSD (3-clause)
 
+from contextlib import contextmanager
 import copy
 import os
 import os.path as op
@@ -327,7 +328,8 @@ class Raw(BaseRaw):
         """Read a segment of data from a file."""
         stop -= 1
         offset = 0
-        with _fiff_get_fid(self._filenames[fi]) as fid:
+        with _buffer_reader(self._filenames[fi],
+                            self.info['nchan']) as read_buffer:
             for this in self._raw_extras[fi]:
                 #  Do we need this buffer
                 if this['last'] >= start:
@@ -359,11 +361,7 @@ class Raw(BaseRaw):
                     if picksamp > 0:
                         # only read data if it exists
                         if this['ent'] is not None:
-                            one = read_tag(fid, this['ent'].pos,
-                                           shape=(this['nsamp'],
-                                                  self.info['nchan']),
-                                           rlims=(first_pick, last_pick)).data
-                            one.shape = (picksamp, self.info['nchan'])
+                            one = read_buffer(this, first_pick, last_pick)
                             _mult_cal_one(data[:, offset:(offset + picksamp)],
                                           one.T, idx, cals, mult)
                         offset += picksamp
@@ -417,6 +415,49 @@ class Raw(BaseRaw):
         return self._acqparser
 
 
+# Data buffer tag types and their on-disk (big-endian) layouts
+_buffer_dtypes = {
+    FIFF.FIFFT_DAU_PACK16: '>i2',
+    FIFF.FIFFT_SHORT: '>i2',
+    FIFF.FIFFT_FLOAT: '>f4',
+    FIFF.FIFFT_DOUBLE: '>f8',
+    FIFF.FIFFT_INT: '>i4',
+    FIFF.FIFFT_COMPLEX_FLOAT: '>c8',
+    FIFF.FIFFT_COMPLEX_DOUBLE: '>c16',
+}
+
+
+@contextmanager
+def _buffer_reader(fname, nchan):
+    """Provide a function that reads rows from the data buffers of a file.
+
+    Uncompressed files are memory-mapped, so the returned rows are views of
+    the data tags on disk (no intermediate buffer is allocated, and repeated
+    reads are served by the OS page cache). Compressed files fall back to
+    reading the tags through a file object.
+    """
+    if op.splitext(fname)[1].lower() == '.gz':
+        with _fiff_get_fid(fname) as fid:
+            def read_buffer(this, first_pick, last_pick):
+                one = read_tag(fid, this['ent'].pos,
+                               shape=(this['nsamp'], nchan),
+                               rlims=(first_pick, last_pick)).data
+                one.shape = (last_pick - first_pick, nchan)
+                return one
+            yield read_buffer
+    else:
+        mmap = np.memmap(fname, dtype=np.uint8, mode='r')
+
+        def read_buffer(this, first_pick, last_pick):
+            ent = this['ent']
+            # skip the 16-byte tag header (kind, type, size, next)
+            one = np.ndarray((this['nsamp'], nchan),
+                             dtype=_buffer_dtypes[ent.type], buffer=mmap,
+                             offset=ent.pos + 16)
+            return one[first_pick:last_pick]
+        yield read_buffer
+
+
 def _check_entry(first, nent):
     """Sanity check entries."""
     if first >= nent:
@@ -254,6 +254,31 @@ def test_output_formats():
         assert_equal(raw2.orig_format, fmt)
 
 
+def test_memmap_read():
+    """Test reading memory-mapped and compressed data buffers."""
+    tempdir = _TempDir()
+    rng = np.random.RandomState(0)
+    info = create_info(['a', 'b', 'c', 'd'], 1000., 'misc')
+    # integer values are exactly representable in all formats
+    raw = RawArray(np.round(rng.randn(4, 5000) * 1000.), info)
+    picks = [3, 0]
+    for fmt in ('short', 'int', 'single', 'double'):
+        fname = op.join(tempdir, 'test_%s_raw.fif' % fmt)
+        raw.save(fname, fmt=fmt, buffer_size_sec=0.3)
+        raw.save(fname + '.gz', fmt=fmt, buffer_size_sec=0.3)
+        raw_mmap = read_raw_fif(fname)
+        raw_gz = read_raw_fif(fname + '.gz')
+        assert_equal(raw_mmap.orig_format, fmt)
+        assert_array_equal(raw_mmap.get_data(), raw._data)
+        for start, stop in ((0, 1), (250, 1300), (299, 301), (4700, 5000)):
+            data = raw_mmap.get_data(picks, start, stop)
+            assert_array_equal(data, raw_gz.get_data(picks, start, stop))
+            assert_array_equal(data, raw._data[picks, start:stop])
+        # the file is not modified by in-place operations on the output
+        raw_mmap.load_data()._data *= 2
+        assert_array_equal(read_raw_fif(fname).get_data(), raw._data)
+
+
 def _compare_combo(raw, new, times, n_times):
     """Compare data."""
     for ti in times:  # let's do a subset of points for speed
@@ -929,6 +954,63 @@ def test_filter_picks():
         assert_raises(RuntimeError, raw_.filter, 10, 30)
 
 
+def test_filter_to_file():
+    """Test filtering non-preloaded data block by block into a file."""
+    tempdir = _TempDir()
+    rng = np.random.RandomState(0)
+    info = create_info(['a', 'b', 'c', 'd'], 1000., ['eeg'] * 3 + ['misc'])
+    raw = RawArray(rng.randn(4, 20000) * 1e-6, info)
+    raw.annotations = Annotations([7.], [0.], ['edge'])
+    fname = op.join(tempdir, 'test_raw.fif')
+    raw.save(fname, fmt='double', buffer_size_sec=0.5)
+    fname_filt = op.join(tempdir, 'test_filt_raw.fif')
+    for pad, phase in (('reflect_limited', 'zero'), ('edge', 'zero-double'),
+                       ('reflect', 'minimum')):
+        for l_freq, h_freq in ((1., 40.), (None, 5.)):
+            raw = read_raw_fif(fname)
+            raw_filt = raw.filter(l_freq, h_freq, phase=phase, pad=pad,
+                                  fname=fname_filt, overwrite=True)
+            assert_equal(raw_filt.filenames, [fname_filt])
+            assert_true(not raw_filt.preload)
+            raw.load_data().filter(l_freq, h_freq, phase=phase, pad=pad)
+            assert_equal(raw_filt.info['highpass'], raw.info['highpass'])
+            assert_equal(raw_filt.info['lowpass'], raw.info['lowpass'])
+            # the data are stored in single precision
+            assert_allclose(raw_filt.get_data(), raw.get_data(),
+                            rtol=1e-6, atol=1e-12)
+    # causal IIR filtering carries the filter state between blocks
+    iir_params = dict(order=4, ftype='butter', output='sos')
+    raw = read_raw_fif(fname)
+    raw_filt = raw.filter(1., 40., method='iir', iir_params=iir_params,
+                          phase='forward', fname=fname_filt, overwrite=True)
+    raw.load_data().filter(1., 40., method='iir', iir_params=iir_params,
+                           phase='forward')
+    assert_allclose(raw_filt.get_data(), raw.get_data(), rtol=1e-6,
+                    atol=1e-12)
+    raw = read_raw_fif(fname)
+    raw_filt = raw.notch_filter([50., 100.], fname=fname_filt,
+                                overwrite=True)
+    raw.load_data().notch_filter([50., 100.])
+    assert_allclose(raw_filt.get_data(), raw.get_data(), rtol=1e-6,
+                    atol=1e-12)
+    # data skipped entirely by annotations are copied unfiltered
+    raw = read_raw_fif(fname)
+    raw.annotations = Annotations([0.], [raw.times[-1] + 1.], ['bad'])
+    raw_filt = raw.filter(1., 40., skip_by_annotation='bad',
+                          fname=fname_filt, overwrite=True)
+    assert_allclose(raw_filt.get_data(), raw.get_data(), rtol=1e-6,
+                    atol=1e-12)
+    raw = read_raw_fif(fname)
+    assert_raises(IOError, raw.filter, 1., None, fname=fname_filt)
+    assert_raises(ValueError, raw.filter, 1., None, fname=fname,
+                  overwrite=True)
+    assert_raises(ValueError, raw.filter, 1., None, method='iir',
+                  fname=fname_filt, overwrite=True)
+    assert_raises(ValueError, raw.filter, 1., None, pad='mean',
+                  fname=fname_filt, overwrite=True)
+    assert_raises(RuntimeError, raw.filter, 1., None)
+
+
 @testing.requires_testing_data
 def test_crop():
     """Test cropping raw files."""
@@ -1104,6 +1186,56 @@ def test_resample():
     assert_equal(raw.info['lowpass'], 5.)
     assert_equal(len(raw), 10)
 
+    # polyphase resampling
+    t = np.arange(5000) / 1000.
+    stim = np.zeros(5000)
+    stim[[1000, 3000]] = 1
+    data = np.array([np.sin(2 * np.pi * 5 * t), stim])
+    raw = RawArray(data, create_info(2, 1000., ['eeg', 'stim']))
+    raw_fft = raw.copy().resample(250., npad='auto')
+    raw.resample(250., method='polyphase')
+    assert_equal(raw.info['sfreq'], 250.)
+    assert_equal(len(raw), 1250)
+    assert_allclose(raw._data[0, 50:-50], raw_fft._data[0, 50:-50],
+                    atol=1e-3)
+    assert_array_equal(raw._data[1], raw_fft._data[1])
+    assert_raises(ValueError, raw.copy().resample, 600.614990234375,
+                  method='polyphase')
+
+
+def test_resample_to_file():
+    """Test resampling non-preloaded data block by block into a file."""
+    tempdir = _TempDir()
+    rng = np.random.RandomState(0)
+    data = rng.randn(3, 12345) * 1e-6
+    data[2] = 0.
+    data[2, rng.randint(0, 12345, 30)] = rng.randint(1, 5, 30)
+    info = create_info(['a', 'b', 'STI'], 1000., ['eeg', 'eeg', 'stim'])
+    fname = op.join(tempdir, 'test_raw.fif')
+    RawArray(data, info, first_samp=37).save(fname, fmt='double')
+    raw = concatenate_raws([read_raw_fif(fname), read_raw_fif(fname)])
+    fname_res = op.join(tempdir, 'test_res_raw.fif')
+    for sfreq, pad in ((250., 'reflect_limited'), (300., 'edge'),
+                       (2000., 'constant')):
+        raw_res = raw.resample(sfreq, method='polyphase', pad=pad,
+                               fname=fname_res, overwrite=True)
+        assert_true(not raw_res.preload)
+        assert_equal(len(raw), 24690)  # unchanged
+        raw_mem = raw.copy().load_data().resample(sfreq, method='polyphase',
+                                                  pad=pad)
+        assert_equal(raw_res.info['sfreq'], sfreq)
+        assert_equal(raw_res.first_samp, raw_mem.first_samp)
+        assert_equal(len(raw_res), len(raw_mem))
+        assert_allclose(raw_res[:2][0], raw_mem[:2][0], rtol=1e-6,
+                        atol=1e-12)
+        assert_array_equal(raw_res[2][0], raw_mem[2][0])
+    assert_raises(ValueError, raw.resample, 250., fname=fname_res,
+                  overwrite=True)  # FFT
+    assert_raises(ValueError, raw.resample, 250., method='polyphase',
+                  pad='wrap', fname=fname_res, overwrite=True)
+    assert_raises(IOError, raw.resample, 250., method='polyphase',
+                  fname=fname_res)
+
 
 @testing.requires_testing_data
 def test_hilbert():
@@ -4,17 +4,21 @@
 #
 # License: BSD (3-clause)
 
+import hashlib
+import os
 import os.path as op
 from io import BytesIO
 from gzip import GzipFile
+import tempfile
 
 import numpy as np
 
 from .tag import read_tag_info, read_tag, read_big, Tag, _call_dict_names
 from .tree import make_dir_tree, dir_tree_find
 from .constants import FIFF
-from ..utils import logger, verbose
+from ..utils import logger, verbose, get_config, _get_cache_size
 from ..externals.six import string_types, iteritems, text_type
+from ..externals.six.moves import cPickle as pickle
 
 
 def _fiff_get_fid(fname):
@@ -98,6 +102,17 @@ def fiff_open(fname, preload=False, verbose=None):
         lists and tags.
     directory : list
         A list of tags.
+
+    Notes
+    -----
+    Building the tag directory and tree requires reading many tags (and
+    scanning the whole file when it has no directory). If the configuration
+    value ``MNE_FIFF_INDEX_CACHE_DIR`` is set to an existing directory, the
+    parsed directory and tree are stored there, keyed by the file path, size,
+    modification time and file ID, and reused by subsequent calls. The total
+    size of the cache is limited by ``MNE_FIFF_INDEX_CACHE_SIZE`` (default
+    ``'100M'``), evicting the least recently used entries first. Only use a
+    directory that is not writable by other users, since entries are pickled.
     """
     fid = _fiff_get_fid(fname)
     # do preloading of entire file
@@ -125,28 +140,34 @@ def fiff_open(fname, preload=False, verbose=None):
     if tag.kind != FIFF.FIFF_DIR_POINTER:
         raise ValueError('file does not have a directory pointer')
 
-    #   Read or create the directory tree
-    logger.debug('    Creating tag directory for %s...' % fname)
-
     dirpos = int(tag.data)
-    if dirpos > 0:
-        tag = read_tag(fid, dirpos)
-        directory = tag.data
+    cache_fname = _get_index_cache_fname(fname, fid)
+    cached = _read_index_cache(cache_fname)
+    if cached is not None:
+        logger.debug('    Using cached tag directory for %s' % fname)
+        directory, tree = cached
     else:
-        fid.seek(0, 0)
-        directory = list()
-        while tag.next >= 0:
-            pos = fid.tell()
-            tag = read_tag_info(fid)
-            if tag is None:
-                break  # HACK : to fix file ending with empty tag...
-            else:
-                tag.pos = pos
-                directory.append(tag)
-
-    tree, _ = make_dir_tree(fid, directory)
-
-    logger.debug('[done]')
+        #   Read or create the directory tree
+        logger.debug('    Creating tag directory for %s...' % fname)
+        if dirpos > 0:
+            tag = read_tag(fid, dirpos)
+            directory = tag.data
+        else:
+            fid.seek(0, 0)
+            directory = list()
+            while tag.next >= 0:
+                pos = fid.tell()
+                tag = read_tag_info(fid)
+                if tag is None:
+                    break  # HACK : to fix file ending with empty tag...
+                else:
+                    tag.pos = pos
+                    directory.append(tag)
+
+        tree, _ = make_dir_tree(fid, directory)
+        _write_index_cache(cache_fname, directory, tree)
+
+        logger.debug('[done]')
 
     #   Back to the beginning
     fid.seek(0)
@@ -154,6 +175,113 @@ def fiff_open(fname, preload=False, verbose=None):
     return fid, tree, directory
 
 
+###############################################################################
+# Directory / tree index cache
+
+def _get_index_cache_fname(fname, fid):
+    """Get the index cache file for a FIF file (None if not cached)."""
+    cache_dir = get_config('MNE_FIFF_INDEX_CACHE_DIR', None)
+    if cache_dir is None or not isinstance(fname, string_types):
+        return None
+    if not op.isdir(cache_dir):
+        logger.debug('    MNE_FIFF_INDEX_CACHE_DIR %s does not exist, not '
+                     'using the index cache' % cache_dir)
+        return None
+    fname = op.realpath(fname)
+    stat = os.stat(fname)
+    # the file ID tag (header and struct) identifies the measurement
+    pos = fid.tell()
+    fid.seek(0, 0)
+    file_id = fid.read(36)
+    fid.seek(pos, 0)
+    key = hashlib.sha1()
+    key.update(('%s\0%d\0%r\0' % (fname, stat.st_size, stat.st_mtime)
+                ).encode('utf-8'))
+    key.update(file_id)
+    return op.join(cache_dir, key.hexdigest() + '-fiff-index.pkl')
+
+
+def _read_index_cache(cache_fname):
+    """Read the directory and tree from an index cache file."""
+    if cache_fname is None or not op.isfile(cache_fname):
+        return None
+    try:
+        with open(cache_fname, 'rb') as fid:
+            directory, tree = pickle.load(fid)
+    except Exception as exp:  # corrupt or incompatible, rebuild it
+        logger.debug('    Could not read index cache %s (%s)'
+                     % (cache_fname, exp))
+        return None
+    # mark as recently used
+    try:
+        os.utime(cache_fname, None)
+    except OSError:
+        pass
+    return directory, tree
+
+
+def _write_index_cache(cache_fname, directory, tree):
+    """Write the directory and tree to an index cache file."""
+    if cache_fname is None:
+        return
+    cache_dir = op.dirname(cache_fname)
+    try:
+        fd, tmp_fname = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fid:
+            pickle.dump((directory, tree), fid, pickle.HIGHEST_PROTOCOL)
+        if op.isfile(cache_fname):  # another process wrote it meanwhile
+            os.remove(tmp_fname)
+        else:
+            os.rename(tmp_fname, cache_fname)
+    except (IOError, OSError) as exp:
+        logger.debug('    Could not write index cache %s (%s)'
+                     % (cache_fname, exp))
+        return
+    _prune_index_cache(cache_dir, _get_index_cache_size())
+
+
+def _get_index_cache_size():
+    """Get the maximum size of the index cache in bytes."""
+    return _get_cache_size('MNE_FIFF_INDEX_CACHE_SIZE', '100M', _size_to_bytes)
+
+
+def _prune_index_cache(cache_dir, max_size):
+    """Remove least recently used index cache files beyond a total size."""
+    entries = list()
+    for fname in os.listdir(cache_dir):
+        if fname.endswith('-fiff-index.pkl'):
+            fname = op.join(cache_dir, fname)
+            try:
+                stat = os.stat(fname)
+            except OSError:  # removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, fname))
+    total = sum(entry[1] for entry in entries)
+    for _, size, fname in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(fname)
+        except OSError:
+            pass
+        total -= size
+
+
+def _size_to_bytes(size):
+    """Convert a size like '100M' to a number of bytes."""
+    orig_size = size
+    size = str(size).strip()
+    mult = dict(K=1024, M=1024 ** 2, G=1024 ** 3).get(size[-1:].upper(), 1)
+    if mult != 1:
+        size = size[:-1]
+    try:
+        return int(float(size) * mult)
+    except ValueError:
+        raise ValueError('MNE_FIFF_INDEX_CACHE_SIZE must be a size in bytes '
+                         'or kilo-, mega-, or gigabytes, e.g., 100K, 500M, '
+                         '1G, got %r' % (orig_size,))
+
+
 def show_fiff(fname, indent='    ', read_limit=np.inf, max_str=30,
               output=str, tag=None, verbose=None):
     """Show FIFF information.
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 import warnings
+import os
 import os.path as op
 
+import pytest
 from nose.tools import assert_false, assert_equal, assert_raises, assert_true
 import numpy as np
 from numpy.testing import assert_array_equal, assert_allclose
@@ -12,6 +14,7 @@ from mne.datasets import testing
 from mne.io import (read_fiducials, write_fiducials, _coil_trans_to_loc,
                     _loc_to_coil_trans, read_raw_fif, read_info, write_info,
                     anonymize_info)
+from mne.io.open import fiff_open
 from mne.io.constants import FIFF
 from mne.io.meas_info import (Info, create_info, _write_dig_points,
                               _read_dig_points, _make_dig_points, _merge_info,
@@ -438,4 +441,48 @@ def test_csr_csc():
     assert_array_equal(ct_read.toarray(), ct.toarray())
 
 
+def test_fiff_index_cache():
+    """Test caching of the FIF tag directory and tree."""
+    tempdir = _TempDir()
+    cache_dir = op.join(tempdir, 'cache')
+    os.mkdir(cache_dir)
+    info = create_info(['a', 'b', 'c'], 1000., 'eeg')
+    fnames = [op.join(tempdir, 'test%d-info.fif' % ii) for ii in range(3)]
+    for fname in fnames:
+        write_info(fname, info)
+    fid, tree, directory = fiff_open(fnames[0])
+    fid.close()
+    os.environ['MNE_FIFF_INDEX_CACHE_DIR'] = cache_dir
+    try:
+        for ii in range(2):  # create then use the cache
+            fid, tree_c, directory_c = fiff_open(fnames[0])
+            fid.close()
+            assert len(os.listdir(cache_dir)) == 1
+            assert_equal([(t.kind, t.pos) for t in directory_c],
+                         [(t.kind, t.pos) for t in directory])
+            assert_equal(repr(tree_c), repr(tree))
+        assert_equal(read_info(fnames[1])['ch_names'], info['ch_names'])
+        assert len(os.listdir(cache_dir)) == 2
+        # modifying the file invalidates the entry
+        write_info(fnames[0], pick_info(info, [0, 1]))
+        os.utime(fnames[0], (0, 0))
+        assert_equal(read_info(fnames[0])['nchan'], 2)
+        assert len(os.listdir(cache_dir)) == 3
+        # least recently used entries are evicted
+        size = max(op.getsize(op.join(cache_dir, fname))
+                   for fname in os.listdir(cache_dir))
+        os.environ['MNE_FIFF_INDEX_CACHE_SIZE'] = str(2 * size)
+        read_info(fnames[2])
+        assert len(os.listdir(cache_dir)) == 2
+        os.environ['MNE_FIFF_INDEX_CACHE_SIZE'] = 'foo'
+        fname = op.join(tempdir, 'test3-info.fif')
+        write_info(fname, info)
+        with pytest.warns(RuntimeWarning, match='CACHE_SIZE'):
+            assert_equal(read_info(fname)['ch_names'], info['ch_names'])
+        assert len(os.listdir(cache_dir)) == 3
+    finally:
+        del os.environ['MNE_FIFF_INDEX_CACHE_DIR']
+        os.environ.pop('MNE_FIFF_INDEX_CACHE_SIZE', None)
+
+
 run_tests_if_main()
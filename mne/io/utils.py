@@ -27,12 +27,13 @@ def _find_channels(ch_names, ch_type='EOG'):
 
 def _mult_cal_one(data_view, one, idx, cals, mult):
     """Take a chunk of raw data, multiply by mult or cals, and store."""
-    one = np.asarray(one, dtype=data_view.dtype)
+    one = np.asarray(one)
     assert data_view.shape[1] == one.shape[1]
     if mult is not None:
-        data_view[:] = np.dot(mult, one)
+        data_view[:] = np.dot(mult, one.astype(data_view.dtype, copy=False))
     else:
-        if isinstance(idx, slice):
+        if isinstance(idx, slice) or one.dtype != data_view.dtype:
+            # only the picked rows get cast (e.g., from memory-mapped data)
             data_view[:] = one[idx]
         else:
             # faster than doing one = one[idx]
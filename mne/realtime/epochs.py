@@ -14,6 +14,8 @@ from .. import pick_channels
 from ..utils import logger, verbose
 from ..epochs import BaseEpochs
 from ..event import _find_events
+from ..filter import _CausalIIRFilter
+from ..io.pick import _pick_data_or_ica
 
 
 class RtEpochs(BaseEpochs):
@@ -108,6 +110,15 @@ class RtEpochs(BaseEpochs):
                                min_duration=0, mask=0, mask_type='not_and')
 
         See :func:`mne.find_events` for detailed explanation of these options.
+    iir_params : dict | None
+        If not None, an IIR filter (with "sos" or "b" and "a" entries, e.g.
+        as returned by :func:`mne.filter.construct_iir_filter`) that is
+        applied causally to the data channels as the buffers are received.
+        The filter state is carried from one buffer to the next, so the
+        result is the same as filtering the whole recording with
+        ``method='iir'`` and ``phase='forward'``.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more). Defaults to
@@ -132,7 +143,8 @@ class RtEpochs(BaseEpochs):
                  sleep_time=0.1, baseline=(None, 0), picks=None,
                  reject=None, flat=None, proj=True,
                  decim=1, reject_tmin=None, reject_tmax=None, detrend=None,
-                 isi_max=2., find_events=None, verbose=None):  # noqa: D102
+                 isi_max=2., find_events=None, iir_params=None,
+                 verbose=None):  # noqa: D102
         info = client.get_measurement_info()
 
         # the measurement info of the data as we receive it
@@ -161,6 +173,12 @@ class RtEpochs(BaseEpochs):
 
         self._stim_picks = stim_picks
 
+        # causal filtering of the data channels
+        self._iir_filter = None
+        if iir_params is not None:
+            self._iir_filter = _CausalIIRFilter(iir_params)
+            self._filter_picks = _pick_data_or_ica(self._client_info)
+
         # find_events default options
         self._find_events_kwargs = dict(output='onset',
                                         consecutive='increasing',
@@ -311,6 +329,9 @@ class RtEpochs(BaseEpochs):
 
         # apply calibration without inplace modification
         raw_buffer = self._cals * raw_buffer
+        if self._iir_filter is not None:
+            raw_buffer[self._filter_picks] = \
+                self._iir_filter(raw_buffer[self._filter_picks])
 
         # detect events
         data = np.abs(raw_buffer[self._stim_picks]).astype(np.int)
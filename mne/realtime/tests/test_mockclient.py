@@ -1,10 +1,11 @@
 import os.path as op
 
 from nose.tools import assert_true
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_allclose
 
 import mne
 from mne import Epochs, read_events, pick_channels
+from mne.filter import construct_iir_filter
 from mne.utils import run_tests_if_main
 from mne.realtime import MockRtClient, RtEpochs
 
@@ -41,6 +42,35 @@ def test_mockclient():
     assert_array_equal(rt_data, data)
 
 
+def test_mockclient_iir():
+    """Test causal IIR filtering of the buffers in RtEpochs."""
+    raw = mne.io.read_raw_fif(raw_fname, preload=True, verbose=False)
+    picks = mne.pick_types(raw.info, meg='grad', eeg=False, eog=True,
+                           stim=True, exclude=raw.info['bads'])
+    iir_params = construct_iir_filter(
+        dict(order=4, ftype='butter', output='sos'), 40., None,
+        raw.info['sfreq'], 'low')
+
+    event_id, tmin, tmax = 1, -0.2, 0.5
+    raw_filt = raw.copy().filter(None, 40., method='iir',
+                                 iir_params=iir_params, phase='forward')
+    epochs = Epochs(raw_filt, events[:7], event_id=event_id, tmin=tmin,
+                    tmax=tmax, picks=picks, baseline=(None, 0), preload=True)
+    data = epochs.get_data()
+
+    rt_client = MockRtClient(raw)
+    rt_epochs = RtEpochs(rt_client, event_id, tmin, tmax, picks=picks,
+                         isi_max=0.5, iir_params=iir_params)
+
+    rt_epochs.start()
+    rt_client.send_data(rt_epochs, picks, tmin=0, tmax=10, buffer_size=1000)
+
+    rt_data = rt_epochs.get_data()
+
+    assert_true(rt_data.shape == data.shape)
+    assert_allclose(rt_data, data, rtol=1e-6, atol=1e-20)
+
+
 def test_get_event_data():
     """Test emulation of realtime data stream."""
 
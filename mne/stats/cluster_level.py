@@ -11,6 +11,9 @@
 # License: Simplified BSD
 
 import logging
+import os
+import os.path as op
+from zipfile import BadZipfile
 
 import numpy as np
 from scipy import sparse
@@ -22,189 +25,70 @@ from ..utils import (split_list, logger, verbose, ProgressBar, warn, _pl,
 from ..source_estimate import SourceEstimate
 from ..externals.six import string_types
 
+# Number of statistic values (n_permutations * n_tests) computed at once with
+# the default statistics
+_PERM_WORKSPACE_SIZE = 2 ** 20
 
-def _get_clusters_spatial(s, neighbors):
-    """Form spatial clusters using neighbor lists.
+# Number of permutations run by each job between two checkpoints
+_CHECKPOINT_SIZE = 256
 
-    This is equivalent to _get_components with n_times = 1, with a properly
-    reconfigured connectivity matrix (formed as "neighbors" list)
-    """
-    # s is a vector of spatial indices that are significant, like:
-    #     s = np.where(x_in)[0]
-    # for x_in representing a single time-instant
-    r = np.ones(s.shape, dtype=bool)
-    clusters = list()
-    next_ind = 0 if s.size > 0 else None
-    while next_ind is not None:
-        # put first point in a cluster, adjust remaining
-        t_inds = [next_ind]
-        r[next_ind] = False
-        icount = 1  # count of nodes in the current cluster
-        while icount <= len(t_inds):
-            ind = t_inds[icount - 1]
-            # look across other vertices
-            buddies = np.where(r)[0]
-            buddies = buddies[np.in1d(s[buddies], neighbors[s[ind]],
-                                      assume_unique=True)]
-            t_inds += buddies.tolist()
-            r[buddies] = False
-            icount += 1
-        # this is equivalent to np.where(r)[0] for these purposes, but it's
-        # a little bit faster. Unfortunately there's no way to tell numpy
-        # just to find the first instance (to save checking every one):
-        next_ind = np.argmax(r)
-        if next_ind == 0:
-            next_ind = None
-        clusters.append(s[t_inds])
-    return clusters
-
-
-def _reassign(check, clusters, base, num):
-    """Reassign cluster numbers."""
-    # reconfigure check matrix
-    check[check == num] = base
-    # concatenate new values into clusters array
-    clusters[base - 1] = np.concatenate((clusters[base - 1],
-                                         clusters[num - 1]))
-    clusters[num - 1] = np.array([], dtype=int)
-
-
-def _get_clusters_st_1step(keepers, neighbors):
-    """Directly calculate connectivity.
-
-    This uses knowledge that time points are
-    only connected to adjacent neighbors for data organized as time x space.
-
-    This algorithm time increases linearly with the number of time points,
-    compared to with the square for the standard (graph) algorithm.
-
-    This algorithm creates clusters for each time point using a method more
-    efficient than the standard graph method (but otherwise equivalent), then
-    combines these clusters across time points in a reasonable way.
-    """
-    n_src = len(neighbors)
-    n_times = len(keepers)
-    # start cluster numbering at 1 for diffing convenience
-    enum_offset = 1
-    check = np.zeros((n_times, n_src), dtype=int)
-    clusters = list()
-    for ii, k in enumerate(keepers):
-        c = _get_clusters_spatial(k, neighbors)
-        for ci, cl in enumerate(c):
-            check[ii, cl] = ci + enum_offset
-        enum_offset += len(c)
-        # give them the correct offsets
-        c = [cl + ii * n_src for cl in c]
-        clusters += c
-
-    # now that each cluster has been assigned a unique number, combine them
-    # by going through each time point
-    for check1, check2, k in zip(check[:-1], check[1:], keepers[:-1]):
-        # go through each one that needs reassignment
-        inds = k[check2[k] - check1[k] > 0]
-        check1_d = check1[inds]
-        n = check2[inds]
-        nexts = np.unique(n)
-        for num in nexts:
-            prevs = check1_d[n == num]
-            base = np.min(prevs)
-            for pr in np.unique(prevs[prevs != base]):
-                _reassign(check1, clusters, base, pr)
-            # reassign values
-            _reassign(check2, clusters, base, num)
-    # clean up clusters
-    clusters = [cl for cl in clusters if len(cl) > 0]
-    return clusters
 
+def _get_st_edges(neighbors):
+    """Get the (undirected) edges of the spatial graph from neighbor lists."""
+    n_neighbors = np.array([len(n) for n in neighbors], int)
+    row = np.repeat(np.arange(len(neighbors)), n_neighbors)
+    col = np.concatenate(neighbors).astype(int) if len(row) else row
+    keep = row < col
+    return row[keep], col[keep]
 
-def _get_clusters_st_multistep(keepers, neighbors, max_step=1):
-    """Directly calculate connectivity.
 
-    This uses knowledge that time points are
-    only connected to adjacent neighbors for data organized as time x space.
+def _get_clusters_st(x_in, neighbors, max_step=1, edges=None):
+    """Get the clusters of spatio-temporal data.
 
-    This algorithm time increases linearly with the number of time points,
-    compared to with the square for the standard (graph) algorithm.
+    Spatial neighbors at the same time point, and the same spatial point at
+    time points at most max_step apart are connected. The clusters are the
+    connected components of the graph of the points of the (n_times * n_src)
+    mask ``x_in``, whose edges are found for all time points at once.
+    ``edges`` are the spatial edges from ``_get_st_edges(neighbors)``.
     """
-    n_src = len(neighbors)
-    n_times = len(keepers)
-    t_border = list()
-    t_border.append(0)
-    for ki, k in enumerate(keepers):
-        keepers[ki] = k + ki * n_src
-        t_border.append(t_border[ki] + len(k))
-    t_border = np.array(t_border)
-    keepers = np.concatenate(keepers)
-    v = keepers
-    t, s = divmod(v, n_src)
-
-    r = np.ones(t.shape, dtype=bool)
-    clusters = list()
-    next_ind = 0
-    inds = np.arange(t_border[0], t_border[n_times])
-    if s.size > 0:
-        while next_ind is not None:
-            # put first point in a cluster, adjust remaining
-            t_inds = [next_ind]
-            r[next_ind] = False
-            icount = 1  # count of nodes in the current cluster
-            # look for significant values at the next time point,
-            # same sensor, not placed yet, and add those
-            while icount <= len(t_inds):
-                ind = t_inds[icount - 1]
-                selves = inds[t_border[max(t[ind] - max_step, 0)]:
-                              t_border[min(t[ind] + max_step + 1, n_times)]]
-                selves = selves[r[selves]]
-                selves = selves[s[ind] == s[selves]]
-
-                # look at current time point across other vertices
-                buddies = inds[t_border[t[ind]]:t_border[t[ind] + 1]]
-                buddies = buddies[r[buddies]]
-                buddies = buddies[np.in1d(s[buddies], neighbors[s[ind]],
-                                          assume_unique=True)]
-                buddies = np.concatenate((selves, buddies))
-                t_inds += buddies.tolist()
-                r[buddies] = False
-                icount += 1
-            # this is equivalent to np.where(r)[0] for these purposes, but it's
-            # a little bit faster. Unfortunately there's no way to tell numpy
-            # just to find the first instance (to save checking every one):
-            next_ind = np.argmax(r)
-            if next_ind == 0:
-                next_ind = None
-            clusters.append(v[t_inds])
-
-    return clusters
-
-
-def _get_clusters_st(x_in, neighbors, max_step=1):
-    """Choose the most efficient version."""
+    from scipy.sparse.csgraph import connected_components
     n_src = len(neighbors)
     n_times = x_in.size // n_src
-    cl_goods = np.where(x_in)[0]
-    if len(cl_goods) > 0:
-        keepers = [np.array([], dtype=int)] * n_times
-        row, col = np.unravel_index(cl_goods, (n_times, n_src))
-        if isinstance(row, int):
-            row = [row]
-            col = [col]
-            lims = [0]
-        else:
-            order = np.argsort(row)
-            row = row[order]
-            col = col[order]
-            lims = [0] + (np.where(np.diff(row) > 0)[0] +
-                          1).tolist() + [len(row)]
-
-        for start, end in zip(lims[:-1], lims[1:]):
-            keepers[row[start]] = np.sort(col[start:end])
-        if max_step == 1:
-            return _get_clusters_st_1step(keepers, neighbors)
-        else:
-            return _get_clusters_st_multistep(keepers, neighbors,
-                                              max_step)
-    else:
+    idx = np.where(x_in)[0]
+    if len(idx) == 0:
         return []
+    if edges is None:
+        edges = _get_st_edges(neighbors)
+    row, col = edges
+    mask = x_in.reshape(n_times, n_src).astype(bool, copy=False)
+    # number the points of the mask
+    nodes = np.cumsum(x_in.ravel().astype(bool)).reshape(n_times, n_src) - 1
+    rows, cols = list(), list()
+    # spatial edges at each time point
+    t, e = np.where(mask[:, row] & mask[:, col])
+    rows.append(nodes[t, row[e]])
+    cols.append(nodes[t, col[e]])
+    # temporal edges
+    for step in range(1, min(max_step, n_times - 1) + 1):
+        t, v = np.where(mask[:-step] & mask[step:])
+        rows.append(nodes[t, v])
+        cols.append(nodes[t + step, v])
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    graph = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)),
+                              shape=(len(idx), len(idx)))
+    _, components = connected_components(graph, directed=False)
+    return _split_components(idx, components)
+
+
+def _split_components(idx, components):
+    """Split the indices into a list of arrays, one per component.
+
+    The components are ordered by their first index, and the indices in each
+    component are sorted.
+    """
+    order = np.argsort(components, kind='mergesort')
+    counts = np.bincount(components)
+    return np.split(idx[order], np.cumsum(counts)[:-1])
 
 
 def _get_components(x_in, connectivity, return_list=True):
@@ -222,15 +106,9 @@ def _get_components(x_in, connectivity, return_list=True):
     connectivity = sparse.coo_matrix((data, (row, col)), shape=shape)
     _, components = connected_components(connectivity)
     if return_list:
-        start = np.min(components)
-        stop = np.max(components)
-        comp_list = [list() for i in range(start, stop + 1, 1)]
-        mask = np.zeros(len(comp_list), dtype=bool)
-        for ii, comp in enumerate(components):
-            comp_list[comp].append(ii)
-            mask[comp] += x_in[ii]
-        clusters = [np.array(k) for k, m in zip(comp_list, mask) if m]
-        return clusters
+        # points outside of the mask are not connected to any point of it
+        components = np.unique(components[idx], return_inverse=True)[1]
+        return _split_components(idx, components)
     else:
         return components
 
@@ -252,11 +130,13 @@ def _find_clusters(x, threshold, tail=0, connectivity=None, max_step=1,
         threshold-free cluster enhancement.
     tail : -1 | 0 | 1
         Type of comparison
-    connectivity : sparse matrix in COO format, None, or list
+    connectivity : sparse matrix in COO format, None, list, or tuple
         Defines connectivity between features. The matrix is assumed to
         be symmetric and only the upper triangular half is used.
         If connectivity is a list, it is assumed that each entry stores the
         indices of the spatial neighbors in a spatio-temporal dataset x.
+        If a tuple, it contains such a list and the spatial edges obtained
+        with ``_get_st_edges``.
         Default is None, i.e, a regular lattice connectivity.
     max_step : int
         If connectivity is a list, this defines the maximal number of steps
@@ -339,6 +219,28 @@ def _find_clusters(x, threshold, tail=0, connectivity=None, max_step=1,
     if tail == -1 and not np.all(np.diff(thresholds) < 0):
         raise ValueError('Thresholds must be monotonically decreasing')
 
+    if tfce is True:
+        # sweep the thresholds once for each direction
+        edges = _get_tfce_edges(x.shape, connectivity, max_step, partitions)
+        signs = {-1: [-1], 0: [1, -1], 1: [1]}[tail]
+        for sign in signs:
+            scores += _tfce_scores(sign * x.ravel(), include.ravel(),
+                                   thresholds * (-1 if tail == -1 else 1),
+                                   edges, h_power, e_power)
+        # each point gets treated independently
+        clusters = np.arange(x.size)
+        if connectivity is None:
+            if x.ndim == 1:
+                # slices
+                clusters = [slice(c, c + 1) for c in clusters]
+            else:
+                # boolean masks (raveled)
+                clusters = [(clusters == ii).ravel()
+                            for ii in range(len(clusters))]
+        else:
+            clusters = [np.array([c]) for c in clusters]
+        return clusters, scores
+
     # set these here just in case thresholds == []
     clusters = list()
     sums = np.empty(0)
@@ -361,42 +263,134 @@ def _find_clusters(x, threshold, tail=0, connectivity=None, max_step=1,
                                                 ndimage)
                 clusters += out[0]
                 sums = np.concatenate((sums, out[1]))
-        if tfce is True:
-            # the score of each point is the sum of the h^H * e^E for each
-            # supporting section "rectangle" h x e.
-            if ti == 0:
-                h = abs(thresh)
-            else:
-                h = abs(thresh - thresholds[ti - 1])
-            h = h ** h_power
-            for c in clusters:
-                # triage based on cluster storage type
-                if isinstance(c, slice):
-                    len_c = c.stop - c.start
-                elif isinstance(c, tuple):
-                    len_c = len(c)
-                elif c.dtype == bool:
-                    len_c = np.sum(c)
-                else:
-                    len_c = len(c)
-                scores[c] += h * (len_c ** e_power)
-    if tfce is True:
-        # each point gets treated independently
-        clusters = np.arange(x.size)
-        if connectivity is None:
-            if x.ndim == 1:
-                # slices
-                clusters = [slice(c, c + 1) for c in clusters]
-            else:
-                # boolean masks (raveled)
-                clusters = [(clusters == ii).ravel()
-                            for ii in range(len(clusters))]
-        else:
-            clusters = [np.array([c]) for c in clusters]
-        sums = scores
     return clusters, sums
 
 
+def _get_tfce_edges(shape, connectivity, max_step, partitions):
+    """Get the edges (row, col) between the points of the data for TFCE.
+
+    These connect the same points as the clustering algorithms (lattice,
+    sparse matrix or spatio-temporal neighbors), within each partition.
+    """
+    if connectivity is None:
+        # neighbors along each axis, like ndimage.label
+        idx = np.arange(int(np.prod(shape))).reshape(shape)
+        rows, cols = list(), list()
+        for axis in range(len(shape)):
+            rows.append(np.take(idx, np.arange(shape[axis] - 1),
+                                axis=axis).ravel())
+            cols.append(np.take(idx, np.arange(1, shape[axis]),
+                                axis=axis).ravel())
+    elif isinstance(connectivity, sparse.spmatrix):
+        connectivity = connectivity.tocoo()
+        rows, cols = [connectivity.row], [connectivity.col]
+    else:
+        if isinstance(connectivity, list):
+            connectivity = (connectivity, _get_st_edges(connectivity))
+        n_src = len(connectivity[0])
+        n_times = int(np.prod(shape)) // n_src
+        # spatial edges at each time point, and temporal edges
+        offsets = np.arange(n_times)[:, np.newaxis] * n_src
+        rows = [(offsets + connectivity[1][0]).ravel()]
+        cols = [(offsets + connectivity[1][1]).ravel()]
+        for step in range(1, min(max_step, n_times - 1) + 1):
+            rows.append(np.arange((n_times - step) * n_src))
+            cols.append(rows[-1] + step * n_src)
+    row, col = np.concatenate(rows), np.concatenate(cols)
+    if partitions is not None:
+        partitions = partitions.ravel()
+        keep = partitions[row] == partitions[col]
+        row, col = row[keep], col[keep]
+    return row, col
+
+
+def _tfce_scores(x, include, thresholds, edges, h_power, e_power):
+    """Compute the TFCE scores of points above increasing thresholds.
+
+    At each threshold, each cluster of points above it adds
+    h ** h_power * size ** e_power to the score of its points. Instead of
+    clustering at each threshold, the points and edges are added once, from
+    the highest threshold they are above to the lowest, to a union-find
+    forest of the clusters. The scores are accumulated by cluster (relative
+    to the parent cluster) when clusters merge, so that the cost is
+    O(n log(n)) in the number of points and edges.
+    """
+    from scipy.sparse.csgraph import connected_components
+    scores = np.zeros(len(x))
+    # highest threshold that each point and edge is above (-1 for none)
+    level = np.searchsorted(thresholds, x) - 1
+    level[~include | np.isnan(x)] = -1
+    active = np.where(level >= 0)[0]
+    if len(active) == 0:
+        return scores
+    heights = np.abs(np.diff(np.concatenate([[0.], thresholds]))) ** h_power
+    cum_heights = np.concatenate([[0.], np.cumsum(heights)])
+    row, col = edges
+    edge_level = np.minimum(level[row], level[col])
+    order = np.argsort(-edge_level, kind='mergesort')
+    order = order[edge_level[order] >= 0]
+    row, col, edge_level = row[order], col[order], edge_level[order]
+    edge_levels, starts = np.unique(-edge_level, return_index=True)
+    stops = np.append(starts[1:], len(row))
+
+    # each point starts as its own cluster (root), of size 1, at its level
+    parent = np.arange(len(x))
+    acc = np.zeros(len(x))
+    size = np.ones(len(x))
+    since = level.copy()
+    for k, start, stop in zip(-edge_levels, starts, stops):
+        roots_row = _uf_find(parent, acc, row[start:stop])
+        roots_col = _uf_find(parent, acc, col[start:stop])
+        merge = roots_row != roots_col
+        if not merge.any():
+            continue
+        roots, inv = np.unique(np.concatenate([roots_row[merge],
+                                               roots_col[merge]]),
+                               return_inverse=True)
+        n_merge = merge.sum()
+        graph = sparse.coo_matrix((np.ones(n_merge),
+                                   (inv[:n_merge], inv[n_merge:])),
+                                  shape=(len(roots), len(roots)))
+        n_comp, comp = connected_components(graph, directed=False)
+        # scores of the merged clusters for the thresholds above this one
+        acc[roots] += size[roots] ** e_power * (cum_heights[since[roots] + 1] -
+                                                cum_heights[k + 1])
+        # merge into the first root of each component
+        first = np.empty(n_comp, int)
+        first[comp[::-1]] = roots[::-1]
+        new_parent = first[comp]
+        other = roots != new_parent
+        acc[roots[other]] -= acc[new_parent[other]]
+        parent[roots[other]] = new_parent[other]
+        size[first] = np.bincount(comp, weights=size[roots])
+        since[first] = k
+    roots = active[parent[active] == active]
+    acc[roots] += size[roots] ** e_power * cum_heights[since[roots] + 1]
+    active_roots = _uf_find(parent, acc, active)
+    scores[active] = acc[active]
+    scores[active] += np.where(active_roots != active, acc[active_roots], 0.)
+    return scores
+
+
+def _uf_find(parent, acc, nodes):
+    """Find the roots of nodes in a union-find forest, compressing paths.
+
+    ``acc`` holds values relative to the parent of each node. The paths are
+    compressed by pointer jumping, keeping the sums of ``acc`` from each node
+    up to (but excluding) its root.
+    """
+    nodes, inv = np.unique(nodes, return_inverse=True)
+    x = nodes
+    while len(x) > 0:
+        x_parent = parent[x]
+        x_grandparent = parent[x_parent]
+        jump = x_parent != x_grandparent
+        x = x[jump]
+        acc[x] += acc[x_parent[jump]]
+        parent[x] = x_grandparent[jump]
+    return parent[nodes][inv]
+
+
 def _find_clusters_1dir_parts(x, x_in, connectivity, max_step, partitions,
                               t_power, ndimage):
     """Deal with partitions, and pass the work to _find_clusters_1dir."""
@@ -455,6 +449,9 @@ def _find_clusters_1dir(x, x_in, connectivity, max_step, t_power, ndimage):
             clusters = _get_components(x_in, connectivity)
         elif isinstance(connectivity, list):  # use temporal adjacency
             clusters = _get_clusters_st(x_in, connectivity, max_step)
+        elif isinstance(connectivity, tuple):  # with precomputed edges
+            clusters = _get_clusters_st(x_in, connectivity[0], max_step,
+                                        connectivity[1])
         else:
             raise ValueError('Connectivity must be a sparse matrix or list')
         if t_power == 1:
@@ -517,6 +514,8 @@ def _setup_connectivity(connectivity, n_vertices, n_times):
         connectivity = [connectivity.indices[connectivity.indptr[i]:
                         connectivity.indptr[i + 1]] for i in
                         range(len(connectivity.indptr) - 1)]
+        # the spatial edges are reused for all the permutations
+        connectivity = (connectivity, _get_st_edges(connectivity))
     return connectivity
 
 
@@ -531,16 +530,46 @@ def _do_permutations(X_full, slices, threshold, tail, connectivity, stat_fun,
     # allocate space for output
     max_cluster_sums = np.empty(len(orders), dtype=np.double)
 
-    if buffer_size is not None:
-        # allocate buffer, so we don't need to allocate memory during loop
-        X_buffer = [np.empty((len(X_full[s]), buffer_size), dtype=X_full.dtype)
-                    for s in slices]
+    if stat_fun is f_oneway:
+        # compute the statistics of blocks of permutations at once
+        t_obs_surrs = _iter_f_oneway_perms(X_full, slices, orders)
+    else:
+        t_obs_surrs = _iter_perm_stats(X_full, slices, stat_fun, orders,
+                                       buffer_size)
 
-    for seed_idx, order in enumerate(orders):
+    for seed_idx, t_obs_surr in enumerate(t_obs_surrs):
         if progress_bar is not None:
             if (not (seed_idx + 1) % 32) or (seed_idx == 0):
                 progress_bar.update(seed_idx + 1)
 
+        # The stat should have the same shape as the samples for no conn.
+        if connectivity is None:
+            t_obs_surr.shape = sample_shape
+
+        # Find cluster on randomized stats
+        out = _find_clusters(t_obs_surr, threshold=threshold, tail=tail,
+                             max_step=max_step, connectivity=connectivity,
+                             partitions=partitions, include=include,
+                             t_power=t_power)
+        perm_clusters_sums = out[1]
+
+        if len(perm_clusters_sums) > 0:
+            max_cluster_sums[seed_idx] = np.max(perm_clusters_sums)
+        else:
+            max_cluster_sums[seed_idx] = 0
+
+    return max_cluster_sums
+
+
+def _iter_perm_stats(X_full, slices, stat_fun, orders, buffer_size):
+    """Generate the statistic of each permutation of the samples."""
+    n_vars = X_full.shape[1]
+    if buffer_size is not None:
+        # allocate buffer, so we don't need to allocate memory during loop
+        X_buffer = [np.empty((len(X_full[s]), buffer_size), dtype=X_full.dtype)
+                    for s in slices]
+
+    for order in orders:
         # shuffle sample indices
         assert order is not None
         idx_shuffle_list = [order[s] for s in slices]
@@ -565,6 +594,74 @@ def _do_permutations(X_full, slices, threshold, tail, connectivity, stat_fun,
                 # apply stat_fun and store result
                 tmp = stat_fun(*X_buffer)
                 t_obs_surr[pos: pos + n_var_loop] = tmp[:n_var_loop]
+        yield t_obs_surr
+
+
+def _iter_f_oneway_perms(X_full, slices, orders):
+    """Generate the F-values of permutations, computed by blocks.
+
+    The total sum and sum of squares of the samples do not depend on the
+    permutation, so only the sums of the samples assigned to each group
+    (but the last) are computed, as a matrix product of group indicators
+    with the data for a block of permutations at once.
+    """
+    n_samples, n_vars = X_full.shape
+    n_per_group = np.array([len(X_full[s]) for s in slices], float)
+    sum_all = X_full.sum(axis=0)
+    sstot = (X_full * X_full).sum(axis=0) - sum_all ** 2 / n_samples
+    dfbn = len(slices) - 1.
+    dfwn = n_samples - len(slices)
+    n_block = _get_perm_block_size(n_vars, len(orders))
+    for start in range(0, len(orders), n_block):
+        block = np.array(orders[start:start + n_block])
+        groups = np.empty(n_samples, int)
+        # group of each sample: inverse of the permutation
+        indicators = np.zeros((len(block), len(slices) - 1, n_samples),
+                              X_full.dtype)
+        for bi, order in enumerate(block):
+            for gi, s in enumerate(slices):
+                groups[order[s]] = gi
+            mask = groups < len(slices) - 1
+            indicators[bi, groups[mask], np.where(mask)[0]] = 1.
+        sums = np.dot(indicators.reshape(-1, n_samples), X_full)
+        sums.shape = (len(block), len(slices) - 1, n_vars)
+        sum_last = sum_all - sums.sum(axis=1)
+        ssbn = (sum_last ** 2) / n_per_group[-1]
+        ssbn += np.einsum('bkv,bkv,k->bv', sums, sums, 1. / n_per_group[:-1])
+        ssbn -= sum_all ** 2 / n_samples
+        sswn = sstot - ssbn
+        f = (ssbn / dfbn) / (sswn / dfwn)
+        for t_obs_surr in f:
+            yield t_obs_surr
+
+
+def _get_perm_block_size(n_vars, n_perms):
+    """Get the number of permutations to compute the statistics of at once."""
+    return max(min(_PERM_WORKSPACE_SIZE // n_vars, n_perms), 1)
+
+
+def _do_1samp_permutations(X, slices, threshold, tail, connectivity, stat_fun,
+                           max_step, include, partitions, t_power, orders,
+                           sample_shape, buffer_size, progress_bar):
+    n_samp, n_vars = X.shape
+    assert slices is None  # should be None for the 1 sample case
+
+    if buffer_size is not None and n_vars <= buffer_size:
+        buffer_size = None  # don't use buffer for few variables
+
+    # allocate space for output
+    max_cluster_sums = np.empty(len(orders), dtype=np.double)
+
+    if stat_fun is ttest_1samp_no_p:
+        # compute the statistics of blocks of sign flips at once
+        t_obs_surrs = _iter_ttest_1samp_flips(X, orders)
+    else:
+        t_obs_surrs = _iter_1samp_stats(X, stat_fun, orders, buffer_size)
+
+    for seed_idx, t_obs_surr in enumerate(t_obs_surrs):
+        if progress_bar is not None:
+            if not (seed_idx + 1) % 32 or seed_idx == 0:
+                progress_bar.update(seed_idx + 1)
 
         # The stat should have the same shape as the samples for no conn.
         if connectivity is None:
@@ -576,42 +673,36 @@ def _do_permutations(X_full, slices, threshold, tail, connectivity, stat_fun,
                              partitions=partitions, include=include,
                              t_power=t_power)
         perm_clusters_sums = out[1]
-
         if len(perm_clusters_sums) > 0:
-            max_cluster_sums[seed_idx] = np.max(perm_clusters_sums)
+            # get max with sign info
+            idx_max = np.argmax(np.abs(perm_clusters_sums))
+            max_cluster_sums[seed_idx] = perm_clusters_sums[idx_max]
         else:
             max_cluster_sums[seed_idx] = 0
 
     return max_cluster_sums
 
 
-def _do_1samp_permutations(X, slices, threshold, tail, connectivity, stat_fun,
-                           max_step, include, partitions, t_power, orders,
-                           sample_shape, buffer_size, progress_bar):
-    n_samp, n_vars = X.shape
-    assert slices is None  # should be None for the 1 sample case
-
-    if buffer_size is not None and n_vars <= buffer_size:
-        buffer_size = None  # don't use buffer for few variables
+def _get_1samp_signs(order, n_samp):
+    """Get the signs (+/- 1) of a sign flip."""
+    assert isinstance(order, np.ndarray)
+    # new surrogate data with specified sign flip
+    assert order.shape[-1] == n_samp  # should be guaranteed by parent
+    signs = 2 * order.astype(int) - 1
+    if not np.all(np.equal(np.abs(signs), 1)):
+        raise ValueError('signs from rng must be +/- 1')
+    return signs
 
-    # allocate space for output
-    max_cluster_sums = np.empty(len(orders), dtype=np.double)
 
+def _iter_1samp_stats(X, stat_fun, orders, buffer_size):
+    """Generate the statistic of each sign flip of the samples."""
+    n_samp, n_vars = X.shape
     if buffer_size is not None:
         # allocate a buffer so we don't need to allocate memory in loop
         X_flip_buffer = np.empty((n_samp, buffer_size), dtype=X.dtype)
 
-    for seed_idx, order in enumerate(orders):
-        if progress_bar is not None:
-            if not (seed_idx + 1) % 32 or seed_idx == 0:
-                progress_bar.update(seed_idx + 1)
-
-        assert isinstance(order, np.ndarray)
-        # new surrogate data with specified sign flip
-        assert order.size == n_samp  # should be guaranteed by parent
-        signs = 2 * order[:, None].astype(int) - 1
-        if not np.all(np.equal(np.abs(signs), 1)):
-            raise ValueError('signs from rng must be +/- 1')
+    for order in orders:
+        signs = _get_1samp_signs(order, n_samp)[:, None]
 
         if buffer_size is None:
             # be careful about non-writable memmap (GH#1507)
@@ -637,25 +728,37 @@ def _do_1samp_permutations(X, slices, threshold, tail, connectivity, stat_fun,
                 # apply stat_fun and store result
                 tmp = stat_fun(X_flip_buffer)
                 t_obs_surr[pos: pos + n_var_loop] = tmp[:n_var_loop]
+        yield t_obs_surr
 
-        # The stat should have the same shape as the samples for no conn.
-        if connectivity is None:
-            t_obs_surr.shape = sample_shape
 
-        # Find cluster on randomized stats
-        out = _find_clusters(t_obs_surr, threshold=threshold, tail=tail,
-                             max_step=max_step, connectivity=connectivity,
-                             partitions=partitions, include=include,
-                             t_power=t_power)
-        perm_clusters_sums = out[1]
-        if len(perm_clusters_sums) > 0:
-            # get max with sign info
-            idx_max = np.argmax(np.abs(perm_clusters_sums))
-            max_cluster_sums[seed_idx] = perm_clusters_sums[idx_max]
-        else:
-            max_cluster_sums[seed_idx] = 0
+def _iter_ttest_1samp_flips(X, orders):
+    """Generate the t-values of sign flips, computed by blocks.
 
-    return max_cluster_sums
+    The sum of squares of the samples does not depend on the signs, so only
+    the means are computed, as a matrix product of the signs of a block of
+    sign flips with the data.
+
+    The variances are computed in one pass from the sum of squares and the
+    means, in double precision. Its rounding error relative to the variance
+    is about ``eps * (1 + t ** 2 / (n_samp - 1))``, which is negligible
+    except for t-values far beyond any cluster-forming threshold, even for
+    single precision data or data with a large offset.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n_samp, n_vars = X.shape
+    sum_sq = (X * X).sum(axis=0)
+    n_block = _get_perm_block_size(n_vars, len(orders))
+    for start in range(0, len(orders), n_block):
+        signs = _get_1samp_signs(np.array(orders[start:start + n_block]),
+                                 n_samp)
+        mean = np.dot(signs.astype(np.float64), X)
+        mean /= n_samp
+        # var(X, ddof=1) / n_samp
+        var = sum_sq - n_samp * mean ** 2
+        var /= (n_samp - 1.) * n_samp
+        mean /= np.sqrt(var)
+        for t_obs_surr in mean:
+            yield t_obs_surr
 
 
 def bin_perm_rep(ndim, a=0, b=1):
@@ -694,8 +797,23 @@ def bin_perm_rep(ndim, a=0, b=1):
     return perms
 
 
-def _get_1samp_orders(n_samples, n_permutations, tail, rng):
-    """Get the 1samp orders."""
+def _pack_1samp_codes(codes, n_samples):
+    """Pack the binary representations of sign flip codes into bytes.
+
+    The bits are in the order of ``np.binary_repr(code, n_samples)``, as
+    ``np.packbits`` would pack the corresponding orders.
+    """
+    codes = np.asarray(codes, np.uint64) << np.uint64(64 - n_samples)
+    codes = codes.astype('>u8').view(np.uint8).reshape(len(codes), 8)
+    return np.ascontiguousarray(codes[:, :(n_samples + 7) // 8])
+
+
+def _get_1samp_orders(n_samples, n_permutations, tail, rng, packed=False):
+    """Get the 1samp orders.
+
+    If packed is True, the orders are returned as an array of bytes, one row
+    of bits per order (see ``np.packbits``).
+    """
     max_perms = 2 ** (n_samples - (tail == 0)) - 1
     extra = ''
     if isinstance(n_permutations, string_types):
@@ -707,11 +825,24 @@ def _get_1samp_orders(n_samples, n_permutations, tail, rng):
         # omit first perm b/c accounted for in H0.append() later;
         # convert to binary array representation
         extra = ' (exact test)'
-        orders = bin_perm_rep(n_samples)[1:max_perms + 1]
+        if packed:
+            # avoid the (2 ** n_samples, n_samples) array of bin_perm_rep
+            block_size = 2 ** 20
+            orders = np.concatenate(
+                [np.empty((0, (n_samples + 7) // 8), np.uint8)] +
+                [_pack_1samp_codes(np.arange(
+                    start, min(start + block_size, max_perms + 1)),
+                    n_samples)
+                 for start in range(1, max_perms + 1, block_size)])
+        else:
+            orders = bin_perm_rep(n_samples)[1:max_perms + 1]
     elif n_samples <= 20:  # fast way to do it for small(ish) n_samples
         orders = rng.choice(max_perms, n_permutations - 1, replace=False)
-        orders = [np.fromiter(np.binary_repr(s + 1, n_samples), dtype=int)
-                  for s in orders]
+        if packed:
+            orders = _pack_1samp_codes(orders + 1, n_samples)
+        else:
+            orders = [np.fromiter(np.binary_repr(s + 1, n_samples),
+                                  dtype=int) for s in orders]
     else:  # n_samples >= 64
         # Here we can just use the hash-table (w/collision detection)
         # functionality of a dict to ensure uniqueness
@@ -732,13 +863,211 @@ def _get_1samp_orders(n_samples, n_permutations, tail, rng):
                     orders[ii] = 1 - orders[ii]
                 hashes[signs] = None
                 ii += 1
+        if packed:
+            orders = np.packbits(orders.astype(np.uint8), axis=1)
     return orders, n_permutations, extra
 
 
+def _check_split(split, checkpoint, step_down_p=0):
+    """Check the split of the permutations between independent runs."""
+    if split is None:
+        return
+    if checkpoint is None:
+        raise ValueError('checkpoint must be given to merge the results of '
+                         'split permutations')
+    if step_down_p > 0:
+        raise ValueError('split cannot be used with step_down_p > 0')
+    if len(split) != 2 or not 0 <= split[0] < split[1]:
+        raise ValueError('split must be a tuple (index, n_splits) with '
+                         '0 <= index < n_splits, got %s' % (split,))
+
+
+def _split_orders(orders, split):
+    """Get the orders of one split of the permutations."""
+    if split is None:
+        return orders
+    sizes = [len(idx) for idx in np.array_split(np.arange(len(orders)),
+                                                split[1])]
+    bounds = np.cumsum([0] + sizes)
+    return orders[bounds[split[0]]:bounds[split[0] + 1]]
+
+
+def _read_checkpoint(checkpoint):
+    """Read a checkpoint, or the temporary file a killed job left instead.
+
+    A complete temporary file is more recent than the checkpoint (the job
+    was killed before renaming it), an incomplete one is ignored. None is
+    returned if there is neither.
+    """
+    for fname in (checkpoint + '.tmp', checkpoint):
+        if not op.isfile(fname):
+            continue
+        try:
+            with np.load(fname) as fid:
+                data = dict((key, fid[key]) for key in fid.files)
+        except (IOError, OSError, ValueError, EOFError, BadZipfile):
+            if fname == checkpoint:
+                raise
+            continue  # killed while writing the temporary file
+        if fname != checkpoint:
+            logger.info('Using the temporary checkpoint file %s' % fname)
+        return data
+    return None
+
+
+def _get_checkpoint_rng(checkpoint, rng, kind, stats, tail, split):
+    """Get the RNG and the permutations completed in a checkpoint."""
+    data = None if checkpoint is None else _read_checkpoint(checkpoint)
+    if data is None:
+        return rng, list()
+    if (str(data['kind']) != kind or int(data['tail']) != tail or
+            data['stats'].shape != stats.shape or
+            not np.allclose(data['stats'], stats) or
+            not np.array_equal(data['split'], [-1, -1] if split is None
+                               else split)):
+        raise ValueError('Checkpoint %s does not match the data and '
+                         'parameters of this test' % checkpoint)
+    rng = np.random.RandomState()
+    rng.set_state((str(data['rng_name']), data['rng_keys'],
+                   int(data['rng_pos']), int(data['rng_has_gauss']),
+                   float(data['rng_cached_gaussian'])))
+    H0s = [data['H0_%d' % ii] for ii in range(int(data['n_iter']))]
+    logger.info('Resuming from %s with %d completed permutations'
+                % (checkpoint, len(H0s[-1]) if len(H0s) else 0))
+    return rng, H0s
+
+
+def _write_checkpoint(checkpoint, kind, stats, tail, split, rng_state,
+                      n_orders, H0s):
+    """Write the RNG state and the completed permutations to a file."""
+    data = dict(kind=kind, stats=stats, tail=tail, n_orders=n_orders,
+                split=[-1, -1] if split is None else split,
+                rng_name=rng_state[0], rng_keys=rng_state[1],
+                rng_pos=rng_state[2], rng_has_gauss=rng_state[3],
+                rng_cached_gaussian=rng_state[4], n_iter=len(H0s))
+    for ii, H0 in enumerate(H0s):
+        data['H0_%d' % ii] = H0
+    # write to a temporary file first so that a killed job cannot leave a
+    # corrupted checkpoint
+    tmp_fname = checkpoint + '.tmp'
+    with open(tmp_fname, 'wb') as fid:
+        np.savez(fid, **data)
+    if hasattr(os, 'replace'):  # atomic, even if checkpoint exists
+        os.replace(tmp_fname, checkpoint)
+    else:  # Python 2, the temporary file is read if killed in between
+        if op.isfile(checkpoint):
+            os.remove(checkpoint)
+        os.rename(tmp_fname, checkpoint)
+
+
+def _run_permutations(run, orders, block_size, H0, save, stop=None,
+                      grow=False):
+    """Run the remaining permutations by blocks, saving H0 after each.
+
+    If stop is not None, it is called with H0 after each block, and the
+    permutations stop once it returns True. If grow is True, the size of the
+    blocks doubles after each one, which bounds the number of checkpoints
+    and checks for permutations that are cheap to compute.
+    """
+    if save is None and stop is None:
+        return np.concatenate(run(orders))
+    start = len(H0)
+    if stop is not None and start > 0 and stop(H0):
+        return H0
+    while start < len(orders):
+        H0 = np.concatenate([H0] + run(orders[start:start + block_size]))
+        start += block_size
+        if grow:
+            block_size *= 2
+        if save is not None:
+            save(H0)
+        if stop is not None and stop(H0):
+            break
+    return H0
+
+
+@verbose
+def merge_permutation_checkpoints(fnames, verbose=None):
+    """Merge the null distributions of split permutation tests.
+
+    Parameters
+    ----------
+    fnames : list of str
+        The checkpoint files of all the splits of a permutation test run
+        with the ``checkpoint`` and ``split`` parameters (e.g., in
+        :func:`mne.stats.permutation_cluster_test` or
+        :func:`mne.stats.permutation_t_test`).
+    verbose : bool, str, int, or None
+        If not None, override default verbose level (see :func:`mne.verbose`
+        and :ref:`Logging documentation <tut_logging>` for more).
+
+    Returns
+    -------
+    p_values : array
+        P-value for each cluster (cluster-level tests) or for each variable
+        (:func:`mne.stats.permutation_t_test`).
+    H0 : array, shape (n_permutations,)
+        The null distribution, as returned by the test run without split.
+
+    Notes
+    -----
+    .. versionadded:: 0.16
+    """
+    if len(fnames) == 0:
+        raise ValueError('At least one checkpoint must be given')
+    parts = dict()
+    for fname in fnames:
+        data = _read_checkpoint(fname)
+        if data is None:
+            raise IOError('Checkpoint %s does not exist' % fname)
+        index, n_splits = data['split']
+        if n_splits < 1:
+            raise ValueError('Checkpoint %s is not from a split permutation '
+                             'test' % fname)
+        if index in parts:
+            raise ValueError('Split %d is given more than once' % index)
+        if len(parts) > 0:
+            first = parts[min(parts)]
+            for key in ('kind', 'tail', 'n_orders', 'rng_keys', 'stats'):
+                if not np.array_equal(data[key], first[key]):
+                    raise ValueError('Checkpoint %s does not come from the '
+                                     'same test as the others' % fname)
+            if n_splits != first['split'][1]:
+                raise ValueError('Checkpoint %s does not come from the same '
+                                 'test as the others' % fname)
+        n_orders = len(_split_orders(np.arange(data['n_orders']),
+                                     (index, n_splits)))
+        if len(data['H0_0']) != n_orders:
+            raise ValueError('Checkpoint %s is incomplete (%d of %d '
+                             'permutations)' % (fname, len(data['H0_0']),
+                                                n_orders))
+        parts[index] = data
+    if len(parts) == 0 or sorted(parts) != list(range(n_splits)):
+        raise ValueError('Checkpoints of all the %d splits must be given, '
+                         'got splits %s' % (n_splits, sorted(parts)))
+    data = parts[0]
+    stats, tail = data['stats'], int(data['tail'])
+    H0 = np.concatenate([parts[index]['H0_0'] for index in sorted(parts)])
+    logger.info('Merging %d permutations from %d splits'
+                % (len(H0), n_splits))
+    if str(data['kind']) == 't_test':
+        from .permutations import _max_stat_p_values
+        return _max_stat_p_values(stats, H0, tail)
+    if tail == -1:  # up tail
+        orig = stats.min()
+    elif tail == 1:
+        orig = stats.max()
+    else:
+        orig = abs(stats).max()
+    H0 = np.concatenate([[orig], H0])
+    return _pval_from_histogram(stats, H0, tail), H0
+
+
 def _permutation_cluster_test(X, threshold, n_permutations, tail, stat_fun,
                               connectivity, n_jobs, seed, max_step,
                               exclude, step_down_p, t_power, out_type,
-                              check_disjoint, buffer_size):
+                              check_disjoint, buffer_size, checkpoint=None,
+                              split=None):
     n_jobs = check_n_jobs(n_jobs)
     """Aux Function.
 
@@ -753,6 +1082,7 @@ def _permutation_cluster_test(X, threshold, n_permutations, tail, stat_fun,
                                             tail == 0 and threshold < 0):
         raise ValueError('incompatible tail and threshold signs, got %s and %s'
                          % (tail, threshold))
+    _check_split(split, checkpoint, step_down_p)
 
     # check dimensions for each group in X (a list at this stage).
     X = [x[:, np.newaxis] if x.ndim == 1 else x for x in X]
@@ -834,7 +1164,9 @@ def _permutation_cluster_test(X, threshold, n_permutations, tail, stat_fun,
     # check to see if we can do an exact test
     # (for a two-tailed test, we can exploit symmetry to just do half)
     extra = ''
-    rng = check_random_state(seed)
+    rng, H0s = _get_checkpoint_rng(checkpoint, check_random_state(seed),
+                                   'cluster', cluster_stats, tail, split)
+    rng_state = rng.get_state()
     del seed
     if len(X) == 1:  # 1-sample test
         do_perm_func = _do_1samp_permutations
@@ -853,6 +1185,8 @@ def _permutation_cluster_test(X, threshold, n_permutations, tail, stat_fun,
         orders = [rng.permutation(len(X_full))
                   for _ in range(n_permutations - 1)]
     del rng
+    n_orders = len(orders)
+    orders = _split_orders(orders, split)
     parallel, my_do_perm_func, _ = parallel_func(do_perm_func, n_jobs)
 
     if len(clusters) == 0:
@@ -883,11 +1217,22 @@ def _permutation_cluster_test(X, threshold, n_permutations, tail, stat_fun,
         else:
             this_include = step_down_include
         logger.info('Permuting %d times%s...' % (len(orders), extra))
-        H0 = parallel(my_do_perm_func(X_full, slices, threshold, tail,
-                      connectivity, stat_fun, max_step, this_include,
-                      partitions, t_power, order, sample_shape, buffer_size,
-                      get_progress_bar(order))
-                      for order in split_list(orders, n_jobs))
+
+        def run(orders):
+            return parallel(my_do_perm_func(
+                X_full, slices, threshold, tail, connectivity, stat_fun,
+                max_step, this_include, partitions, t_power, order,
+                sample_shape, buffer_size, get_progress_bar(order))
+                for order in split_list(orders, n_jobs))
+
+        def save(H0):
+            _write_checkpoint(checkpoint, 'cluster', cluster_stats, tail,
+                              split, rng_state, n_orders,
+                              H0s[:n_step_downs] + [H0])
+
+        H0 = H0s[n_step_downs] if n_step_downs < len(H0s) else np.empty(0)
+        H0 = _run_permutations(run, orders, _CHECKPOINT_SIZE * n_jobs, H0,
+                               None if checkpoint is None else save)
         # include original (true) ordering
         if tail == -1:  # up tail
             orig = cluster_stats.min()
@@ -895,8 +1240,7 @@ def _permutation_cluster_test(X, threshold, n_permutations, tail, stat_fun,
             orig = cluster_stats.max()
         else:
             orig = abs(cluster_stats).max()
-        H0.insert(0, [orig])
-        H0 = np.concatenate(H0)
+        H0 = np.concatenate([[orig], H0])
         logger.info('Computing cluster p-values')
         cluster_pv = _pval_from_histogram(cluster_stats, H0, tail)
 
@@ -909,6 +1253,7 @@ def _permutation_cluster_test(X, threshold, n_permutations, tail, stat_fun,
             step_down_include[clusters[ti]] = False
         if connectivity is None:
             step_down_include.shape = sample_shape
+        H0s[n_step_downs:] = [H0[1:]]
         n_step_downs += 1
         if step_down_p > 0:
             a_text = 'additional ' if n_step_downs > 1 else ''
@@ -959,7 +1304,7 @@ def permutation_cluster_test(
         X, threshold=None, n_permutations=1024, tail=0, stat_fun=None,
         connectivity=None, n_jobs=1, seed=None, max_step=1, exclude=None,
         step_down_p=0, t_power=1, out_type='mask', check_disjoint=False,
-        buffer_size=1000, verbose=None):
+        buffer_size=1000, checkpoint=None, split=None, verbose=None):
     """Cluster-level statistical permutation test.
 
     For a list of nd-arrays of data, e.g. 2d for time series or 3d for
@@ -1043,6 +1388,23 @@ def permutation_cluster_test(
         processes is enabled (see set_cache_dir()), as X will be shared
         between processes and each process only needs to allocate space
         for a small block of variables.
+    checkpoint : str | None
+        If not None, the name of a file where the state of the random number
+        generator and the completed permutations are saved regularly. If the
+        file exists, the test resumes from it (e.g., after the job was
+        killed), which requires the same data and parameters.
+
+        .. versionadded:: 0.16
+    split : tuple of int | None
+        If a tuple ``(index, n_splits)``, only the permutations of the part
+        ``index`` out of ``n_splits`` are run, e.g. in independent processes
+        or on different machines using the same ``seed``. The ``checkpoint``
+        files of all the parts can then be merged with
+        :func:`mne.stats.merge_permutation_checkpoints`. Until then, the
+        returned ``cluster_pv`` and ``H0`` only use the permutations of this
+        part. Cannot be used with ``step_down_p > 0``.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -1070,7 +1432,7 @@ def permutation_cluster_test(
         stat_fun=stat_fun, connectivity=connectivity, n_jobs=n_jobs, seed=seed,
         max_step=max_step, exclude=exclude, step_down_p=step_down_p,
         t_power=t_power, out_type=out_type, check_disjoint=check_disjoint,
-        buffer_size=buffer_size)
+        buffer_size=buffer_size, checkpoint=checkpoint, split=split)
 
 
 @verbose
@@ -1078,7 +1440,7 @@ def permutation_cluster_1samp_test(
         X, threshold=None, n_permutations=1024, tail=0, stat_fun=None,
         connectivity=None, verbose=None, n_jobs=1, seed=None, max_step=1,
         exclude=None, step_down_p=0, t_power=1, out_type='mask',
-        check_disjoint=False, buffer_size=1000):
+        check_disjoint=False, buffer_size=1000, checkpoint=None, split=None):
     """Non-parametric cluster-level 1 sample t-test.
 
     From a array of observations, e.g. signal amplitudes or power spectrum
@@ -1163,6 +1525,23 @@ def permutation_cluster_1samp_test(
         processes is enabled (see set_cache_dir()), as X will be shared
         between processes and each process only needs to allocate space
         for a small block of variables.
+    checkpoint : str | None
+        If not None, the name of a file where the state of the random number
+        generator and the completed permutations are saved regularly. If the
+        file exists, the test resumes from it (e.g., after the job was
+        killed), which requires the same data and parameters.
+
+        .. versionadded:: 0.16
+    split : tuple of int | None
+        If a tuple ``(index, n_splits)``, only the permutations of the part
+        ``index`` out of ``n_splits`` are run, e.g. in independent processes
+        or on different machines using the same ``seed``. The ``checkpoint``
+        files of all the parts can then be merged with
+        :func:`mne.stats.merge_permutation_checkpoints`. Until then, the
+        returned ``cluster_pv`` and ``H0`` only use the permutations of this
+        part. Cannot be used with ``step_down_p > 0``.
+
+        .. versionadded:: 0.16
 
     Returns
     -------
@@ -1197,7 +1576,7 @@ def permutation_cluster_1samp_test(
         stat_fun=stat_fun, connectivity=connectivity, n_jobs=n_jobs, seed=seed,
         max_step=max_step, exclude=exclude, step_down_p=step_down_p,
         t_power=t_power, out_type=out_type, check_disjoint=check_disjoint,
-        buffer_size=buffer_size)
+        buffer_size=buffer_size, checkpoint=checkpoint, split=split)
 
 
 @verbose
@@ -1206,7 +1585,7 @@ def spatio_temporal_cluster_1samp_test(
         stat_fun=None, connectivity=None, n_jobs=1, seed=None,
         max_step=1, spatial_exclude=None, step_down_p=0, t_power=1,
         out_type='indices', check_disjoint=False, buffer_size=1000,
-        verbose=None):
+        checkpoint=None, split=None, verbose=None):
     """Non-parametric cluster-level 1 sample t-test for spatio-temporal data.
 
     This function provides a convenient wrapper for data organized in the form
@@ -1283,6 +1662,23 @@ def spatio_temporal_cluster_1samp_test(
         processes is enabled (see set_cache_dir()), as X will be shared
         between processes and each process only needs to allocate space
         for a small block of variables.
+    checkpoint : str | None
+        If not None, the name of a file where the state of the random number
+        generator and the completed permutations are saved regularly. If the
+        file exists, the test resumes from it (e.g., after the job was
+        killed), which requires the same data and parameters.
+
+        .. versionadded:: 0.16
+    split : tuple of int | None
+        If a tuple ``(index, n_splits)``, only the permutations of the part
+        ``index`` out of ``n_splits`` are run, e.g. in independent processes
+        or on different machines using the same ``seed``. The ``checkpoint``
+        files of all the parts can then be merged with
+        :func:`mne.stats.merge_permutation_checkpoints`. Until then, the
+        returned ``cluster_pv`` and ``H0`` only use the permutations of this
+        part. Cannot be used with ``step_down_p > 0``.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -1329,7 +1725,8 @@ def spatio_temporal_cluster_1samp_test(
         n_permutations=n_permutations, connectivity=connectivity,
         n_jobs=n_jobs, seed=seed, max_step=max_step, exclude=exclude,
         step_down_p=step_down_p, t_power=t_power, out_type=out_type,
-        check_disjoint=check_disjoint, buffer_size=buffer_size)
+        check_disjoint=check_disjoint, buffer_size=buffer_size,
+        checkpoint=checkpoint, split=split)
 
 
 @verbose
@@ -1337,7 +1734,7 @@ def spatio_temporal_cluster_test(
         X, threshold=None, n_permutations=1024, tail=0, stat_fun=None,
         connectivity=None, verbose=None, n_jobs=1, seed=None, max_step=1,
         spatial_exclude=None, step_down_p=0, t_power=1, out_type='indices',
-        check_disjoint=False, buffer_size=1000):
+        check_disjoint=False, buffer_size=1000, checkpoint=None, split=None):
     """Non-parametric cluster-level test for spatio-temporal data.
 
     This function provides a convenient wrapper for data organized in the form
@@ -1410,6 +1807,23 @@ def spatio_temporal_cluster_test(
         processes is enabled (see set_cache_dir()), as X will be shared
         between processes and each process only needs to allocate space
         for a small block of variables.
+    checkpoint : str | None
+        If not None, the name of a file where the state of the random number
+        generator and the completed permutations are saved regularly. If the
+        file exists, the test resumes from it (e.g., after the job was
+        killed), which requires the same data and parameters.
+
+        .. versionadded:: 0.16
+    split : tuple of int | None
+        If a tuple ``(index, n_splits)``, only the permutations of the part
+        ``index`` out of ``n_splits`` are run, e.g. in independent processes
+        or on different machines using the same ``seed``. The ``checkpoint``
+        files of all the parts can then be merged with
+        :func:`mne.stats.merge_permutation_checkpoints`. Until then, the
+        returned ``cluster_pv`` and ``H0`` only use the permutations of this
+        part. Cannot be used with ``step_down_p > 0``.
+
+        .. versionadded:: 0.16
 
     Returns
     -------
@@ -1440,7 +1854,8 @@ def spatio_temporal_cluster_test(
         n_permutations=n_permutations, connectivity=connectivity,
         n_jobs=n_jobs, seed=seed, max_step=max_step, exclude=exclude,
         step_down_p=step_down_p, t_power=t_power, out_type=out_type,
-        check_disjoint=check_disjoint, buffer_size=buffer_size)
+        check_disjoint=check_disjoint, buffer_size=buffer_size,
+        checkpoint=checkpoint, split=split)
 
 
 def _st_mask_from_s_inds(n_times, n_vertices, vertices, set_as=True):
@@ -1478,13 +1893,14 @@ def _st_mask_from_s_inds(n_times, n_vertices, vertices, set_as=True):
 @verbose
 def _get_partitions_from_connectivity(connectivity, n_times, verbose=None):
     """Specify disjoint subsets (e.g., hemispheres) based on connectivity."""
-    if isinstance(connectivity, list):
-        test = np.ones(len(connectivity))
-        test_conn = np.zeros((len(connectivity), len(connectivity)),
-                             dtype='bool')
-        for vi in range(len(connectivity)):
-            test_conn[connectivity[vi], vi] = True
-        test_conn = sparse.coo_matrix(test_conn, dtype='float')
+    if isinstance(connectivity, (list, tuple)):
+        if isinstance(connectivity, list):
+            connectivity = (connectivity, _get_st_edges(connectivity))
+        n_src = len(connectivity[0])
+        row, col = connectivity[1]
+        test = np.ones(n_src)
+        test_conn = sparse.coo_matrix((np.ones(len(row)), (row, col)),
+                                      shape=(n_src, n_src))
     else:
         test = np.ones(connectivity.shape[0])
         test_conn = connectivity
@@ -1496,7 +1912,7 @@ def _get_partitions_from_connectivity(connectivity, n_times, verbose=None):
         partitions = np.zeros(len(test), dtype='int')
         for ii, pc in enumerate(part_clusts):
             partitions[pc] = ii
-        if isinstance(connectivity, list):
+        if isinstance(connectivity, tuple):
             partitions = np.tile(partitions, n_times)
     else:
         logger.info('No disjoint connectivity sets found')
@@ -11,18 +11,83 @@ from ..utils import check_random_state, verbose, logger
 from ..parallel import parallel_func
 
 
+# Number of statistic values (n_permutations * n_tests) computed at once
+_T_TEST_WORKSPACE_SIZE = 2 ** 18
+
+# Confidence level of the p-value intervals used to stop permuting early
+_EARLY_STOP_CONFIDENCE = 0.99
+
+
 def _max_stat(X, X2, perms, dof_scaling):
-    """Aux function for permutation_t_test (for parallel comp)."""
-    n_samples = len(X)
-    mus = np.dot(perms, X) / float(n_samples)
-    stds = np.sqrt(X2[None, :] - mus * mus) * dof_scaling  # std with splitting
-    max_abs = np.max(np.abs(mus) / (stds / sqrt(n_samples)), axis=1)  # t-max
-    return max_abs
+    """Aux function for permutation_t_test (for parallel comp).
+
+    The sign flips are given as rows of packed bits (see ``np.packbits``),
+    and are expanded and multiplied with X by blocks. The products are
+    accumulated in double precision, so that the results do not depend on
+    the blocks (e.g., when resuming from a checkpoint or splitting the
+    permutations).
+    """
+    n_samples, n_tests = X.shape
+    max_abs = np.empty(len(perms))
+    block_size = max(_T_TEST_WORKSPACE_SIZE // n_tests, 1)
+    for start in range(0, len(perms), block_size):
+        signs = np.unpackbits(perms[start:start + block_size], axis=1)
+        signs = signs[:, :n_samples].astype(np.float64)
+        signs *= 2
+        signs -= 1  # from 0, 1 -> -1, 1
+        mus = np.dot(signs, X)
+        mus /= n_samples
+        # t ** 2 = mu ** 2 / (X2 - mu ** 2) * n_samples / dof_scaling ** 2
+        mus *= mus
+        mus /= X2 - mus
+        max_abs[start:start + len(mus)] = mus.max(axis=1)
+    return np.sqrt(max_abs * n_samples) / dof_scaling  # t-max
+
+
+def _get_early_stop(T_obs, tail, alpha):
+    """Get a function telling if the p-values are resolved around alpha.
+
+    The p-value of each variable is resolved when its Clopper-Pearson
+    confidence interval is entirely below or above alpha.
+    """
+    from scipy.stats import beta
+    if tail == 0:
+        T_obs = np.abs(T_obs)
+    elif tail == -1:
+        T_obs = -T_obs
+    counts = np.zeros(len(T_obs))
+    n_done = [0]
+    tol = (1 - _EARLY_STOP_CONFIDENCE) / 2.
+
+    def stop(max_abs):
+        counts[:] += (max_abs[n_done[0]:, np.newaxis] >= T_obs).sum(0)
+        n_done[0] = len(max_abs)
+        # the original data counts as one permutation
+        k, n = counts + 1, n_done[0] + 1
+        lower = beta.ppf(tol, k, n - k + 1)
+        upper = beta.ppf(1 - tol, k + 1, n - k)
+        upper[k == n] = 1.
+        return np.all((upper < alpha) | (lower > alpha))
+    return stop
+
+
+def _max_stat_p_values(T_obs, max_abs, tail):
+    """Get the p-values from the t-max of the permutations."""
+    max_abs = np.concatenate((max_abs, [np.abs(T_obs).max()]))
+    H0 = np.sort(max_abs)
+    if tail == 0:
+        p_values = (H0 >= np.abs(T_obs[:, np.newaxis])).mean(-1)
+    elif tail == 1:
+        p_values = (H0 >= T_obs[:, np.newaxis]).mean(-1)
+    elif tail == -1:
+        p_values = (-H0 <= T_obs[:, np.newaxis]).mean(-1)
+    return p_values, H0
 
 
 @verbose
 def permutation_t_test(X, n_permutations=10000, tail=0, n_jobs=1,
-                       seed=None, verbose=None):
+                       seed=None, checkpoint=None, split=None,
+                       early_stop=None, verbose=None):
     """One sample/paired sample permutation test based on a t-statistic.
 
     This function can perform the test on one variable or
@@ -53,6 +118,31 @@ def permutation_t_test(X, n_permutations=10000, tail=0, n_jobs=1,
         Number of CPUs to use for computation.
     seed : int | instance of RandomState | None
         Seed the random number generator for results reproducibility.
+    checkpoint : str | None
+        If not None, the name of a file where the state of the random number
+        generator and the completed permutations are saved regularly. If the
+        file exists, the test resumes from it (e.g., after the job was
+        killed), which requires the same data and parameters.
+
+        .. versionadded:: 0.16
+    split : tuple of int | None
+        If a tuple ``(index, n_splits)``, only the permutations of the part
+        ``index`` out of ``n_splits`` are run, e.g. in independent processes
+        or on different machines using the same ``seed``. The ``checkpoint``
+        files of all the parts can then be merged with
+        :func:`mne.stats.merge_permutation_checkpoints`. Until then, the
+        returned ``p_values`` and ``H0`` only use the permutations of this
+        part. Cannot be used with ``early_stop``.
+
+        .. versionadded:: 0.16
+    early_stop : float | None
+        If not None, a significance level (e.g., 0.05). The permutations are
+        run by blocks (in random order for an exact test), and stop once the
+        99% confidence interval of the p-value of each variable is entirely
+        below or above this level. ``H0`` then only contains the permutations
+        that were run.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -81,28 +171,50 @@ def permutation_t_test(X, n_permutations=10000, tail=0, n_jobs=1,
        tests for functional neuroimaging: a primer with examples.
        Human Brain Mapping, 15, 1-25.
     """
-    from .cluster_level import _get_1samp_orders
+    from .cluster_level import (_get_1samp_orders, _check_split,
+                                _split_orders, _get_checkpoint_rng,
+                                _write_checkpoint, _run_permutations,
+                                _CHECKPOINT_SIZE)
+    _check_split(split, checkpoint)
+    if early_stop is not None and split is not None:
+        raise ValueError('early_stop cannot be used with split')
     n_samples, n_tests = X.shape
     X2 = np.mean(X ** 2, axis=0)  # precompute moments
     mu0 = np.mean(X, axis=0)
     dof_scaling = sqrt(n_samples / (n_samples - 1.0))
     std0 = np.sqrt(X2 - mu0 ** 2) * dof_scaling  # get std with var splitting
     T_obs = np.mean(X, axis=0) / (std0 / sqrt(n_samples))
-    rng = check_random_state(seed)
-    orders, _, extra = _get_1samp_orders(n_samples, n_permutations, tail, rng)
-    perms = 2 * np.array(orders) - 1  # from 0, 1 -> 1, -1
-    logger.info('Permuting %d times%s...' % (len(orders), extra))
+    rng, H0s = _get_checkpoint_rng(checkpoint, check_random_state(seed),
+                                   't_test', T_obs, tail, split)
+    rng_state = rng.get_state()
+    # bit-packed sign flips: n_samples / 8 bytes per permutation
+    perms, _, extra = _get_1samp_orders(n_samples, n_permutations, tail, rng,
+                                        packed=True)
+    if early_stop is not None and extra:
+        # stopping early must use a random subset of the permutations
+        perms = perms[rng.permutation(len(perms))]
+    n_orders = len(perms)
+    perms = _split_orders(perms, split)
+    logger.info('Permuting %d times%s...' % (len(perms), extra))
     parallel, my_max_stat, n_jobs = parallel_func(_max_stat, n_jobs)
-    max_abs = np.concatenate(parallel(my_max_stat(X, X2, p, dof_scaling)
-                                      for p in np.array_split(perms, n_jobs)))
-    max_abs = np.concatenate((max_abs, [np.abs(T_obs).max()]))
-    H0 = np.sort(max_abs)
-    if tail == 0:
-        p_values = (H0 >= np.abs(T_obs[:, np.newaxis])).mean(-1)
-    elif tail == 1:
-        p_values = (H0 >= T_obs[:, np.newaxis]).mean(-1)
-    elif tail == -1:
-        p_values = (-H0 <= T_obs[:, np.newaxis]).mean(-1)
+
+    def run(perms):
+        return parallel(my_max_stat(X, X2, p, dof_scaling)
+                        for p in np.array_split(perms, n_jobs))
+
+    def save(max_abs):
+        _write_checkpoint(checkpoint, 't_test', T_obs, tail, split,
+                          rng_state, n_orders, [max_abs])
+
+    stop = None if early_stop is None else _get_early_stop(T_obs, tail,
+                                                           early_stop)
+    max_abs = _run_permutations(run, perms, _CHECKPOINT_SIZE * n_jobs,
+                                H0s[0] if len(H0s) else np.empty(0),
+                                None if checkpoint is None else save, stop,
+                                grow=True)
+    if stop is not None and len(max_abs) < len(perms):
+        logger.info('Stopped after %d permutations' % len(max_abs))
+    p_values, H0 = _max_stat_p_values(T_obs, max_abs, tail)
     return T_obs, p_values, H0
 
 
@@ -5,6 +5,7 @@
 
 from functools import partial
 import os
+import os.path as op
 import warnings
 
 import numpy as np
@@ -14,11 +15,13 @@ from numpy.testing import (assert_equal, assert_array_equal,
 from nose.tools import assert_true, assert_raises
 
 from mne.parallel import _force_serial
+from mne.stats import cluster_level
 from mne.stats.cluster_level import (permutation_cluster_test,
                                      permutation_cluster_1samp_test,
                                      spatio_temporal_cluster_test,
                                      spatio_temporal_cluster_1samp_test,
-                                     ttest_1samp_no_p, summarize_clusters_stc)
+                                     ttest_1samp_no_p, summarize_clusters_stc,
+                                     f_oneway, merge_permutation_checkpoints)
 from mne.utils import run_tests_if_main, _TempDir, catch_logging
 
 warnings.simplefilter('always')  # enable b/c these tests throw warnings
@@ -525,6 +528,191 @@ def test_permutation_test_H0():
         assert_equal(len(h0), 2 ** (7 - (tail == 0)))  # exact test
 
 
+def test_get_clusters_st():
+    """Test spatio-temporal clustering against the global algorithm."""
+    rng = np.random.RandomState(0)
+    n_src, n_times = 30, 6
+    row = rng.randint(0, n_src, 40)
+    col = (row + rng.randint(1, 5, 40)) % n_src
+    conn = sparse.coo_matrix((np.ones(40), (row, col)), (n_src, n_src))
+    neighbors, edges = cluster_level._setup_connectivity(
+        conn, n_src * n_times, n_times)
+    conn = (conn + conn.T).tocsr()
+    for max_step in (1, 2):
+        # the same graph with all time points
+        time_conn = sparse.diags([np.ones(n_times - step)
+                                  for step in range(1, max_step + 1)],
+                                 list(range(1, max_step + 1)))
+        full_conn = (sparse.kron(sparse.eye(n_times), conn) +
+                     sparse.kron(time_conn, sparse.eye(n_src))).tocoo()
+        for _ in range(10):
+            x_in = rng.rand(n_src * n_times) < 0.4
+            clusters = cluster_level._get_clusters_st(x_in, neighbors,
+                                                      max_step, edges)
+            want = cluster_level._get_components(x_in, full_conn)
+            assert_equal(len(clusters), len(want))
+            for c, w in zip(clusters, want):
+                assert_array_equal(c, w)
+            # neighbor lists only
+            for c, w in zip(cluster_level._get_clusters_st(
+                    x_in, neighbors, max_step), want):
+                assert_array_equal(c, w)
+    assert_equal(cluster_level._get_clusters_st(np.zeros(n_src * n_times,
+                                                         bool),
+                                                neighbors, 1, edges), [])
+
+
+def test_permutation_batched_stats():
+    """Test computing the default statistics by blocks of permutations."""
+    rng = np.random.RandomState(0)
+    X = rng.randn(12, 15, 4)
+    X[:, 5:10] += 1.
+    groups = [X[:6], X[6:] - 0.5, rng.randn(9, 15, 4)]
+    # custom functions are applied to one permutation at a time
+    orig_size = cluster_level._PERM_WORKSPACE_SIZE
+    try:
+        for workspace_size in (orig_size, 100):  # 1 block of 99, 99 of 1
+            cluster_level._PERM_WORKSPACE_SIZE = workspace_size
+            for tail, threshold in ((0, 2.), (1, 2.), (-1, -2.)):
+                for stat_fun in (ttest_1samp_no_p, ttest_1samp):
+                    out = permutation_cluster_1samp_test(
+                        X, threshold=threshold, tail=tail, seed=0,
+                        n_permutations=100, stat_fun=stat_fun)
+                    if stat_fun is ttest_1samp_no_p:
+                        want = out
+                for o, w in zip(out[2:], want[2:]):
+                    assert_array_almost_equal(o, w, 10)
+            # integer data
+            X_int = (X * 10).astype(int)
+            for stat_fun in (ttest_1samp_no_p, lambda x: ttest_1samp_no_p(x)):
+                out = permutation_cluster_1samp_test(
+                    X_int, threshold=2., seed=0, n_permutations=100,
+                    stat_fun=stat_fun)
+                if stat_fun is ttest_1samp_no_p:
+                    want = out
+            for o, w in zip(out[2:], want[2:]):
+                assert_array_almost_equal(o, w, 10)
+            for stat_fun in (f_oneway, lambda *args: f_oneway(*args)):
+                out = permutation_cluster_test(
+                    groups, threshold=3., seed=0, n_permutations=100,
+                    stat_fun=stat_fun)
+                if stat_fun is f_oneway:
+                    want = out
+            for o, w in zip(out[2:], want[2:]):
+                assert_array_almost_equal(o, w, 10)
+    finally:
+        cluster_level._PERM_WORKSPACE_SIZE = orig_size
+
+
+def test_permutation_checkpoint():
+    """Test checkpointing, resuming and splitting permutations."""
+    tempdir = _TempDir()
+    rng = np.random.RandomState(0)
+    X = rng.randn(12, 15, 4)
+    X[:, 5:10] += 1.
+    kwargs = dict(threshold=2., n_permutations=100)
+    want = permutation_cluster_1samp_test(X, seed=0, **kwargs)
+    n_calls = [0]
+
+    def stat_fun(x):
+        n_calls[0] += 1
+        if n_calls[0] > 50:
+            raise RuntimeError('killed')
+        return ttest_1samp_no_p(x)
+
+    orig_size = cluster_level._CHECKPOINT_SIZE
+    cluster_level._CHECKPOINT_SIZE = 20
+    try:
+        # kill the job after a few checkpoints
+        fname = op.join(tempdir, 'perm.npz')
+        assert_raises(RuntimeError, permutation_cluster_1samp_test, X.copy(),
+                      seed=np.random.RandomState(0), stat_fun=stat_fun,
+                      checkpoint=fname, **kwargs)
+        with np.load(fname) as fid:
+            assert_equal(len(fid['H0_0']), 40)
+        # the complete temporary file of a job killed before renaming it is
+        # used, and resuming does not depend on the seed
+        os.rename(fname, fname + '.tmp')
+        out = permutation_cluster_1samp_test(X, seed=None, checkpoint=fname,
+                                             **kwargs)
+        assert_true(not op.isfile(fname + '.tmp'))
+        for o, w in zip(out[2:], want[2:]):
+            assert_array_almost_equal(o, w, 10)
+        # an incomplete temporary file is ignored
+        with open(fname + '.tmp', 'wb') as fid:
+            fid.write(b'PK\x03\x04')
+        out = permutation_cluster_1samp_test(X, seed=None, checkpoint=fname,
+                                             **kwargs)
+        assert_array_almost_equal(out[3], want[3], 10)
+        assert_raises(ValueError, permutation_cluster_1samp_test, X + 1.,
+                      checkpoint=fname, **kwargs)
+        assert_raises(ValueError, permutation_cluster_1samp_test, X,
+                      tail=1, checkpoint=fname, **kwargs)
+
+        # merge the permutations split between independent runs
+        groups = [X[:6], X[6:] - 0.5]
+        kwargs['threshold'] = 3.
+        for func, data in ((permutation_cluster_test, groups),
+                           (permutation_cluster_1samp_test, X)):
+            want = func(data, seed=0, **kwargs)
+            fnames = [op.join(tempdir, '%s_%d.npz' % (func.__name__, ii))
+                      for ii in range(3)]
+            for ii, fname in enumerate(fnames):
+                out = func(data, seed=0, checkpoint=fname, split=(ii, 3),
+                           **kwargs)
+                assert_equal(len(out[3]), len(want[3]) // 3 + 1)
+                assert_raises(ValueError, merge_permutation_checkpoints,
+                              fnames[:ii + 1] if ii < 2 else fnames[:1] * 2)
+            cluster_pv, H0 = merge_permutation_checkpoints(fnames[::-1])
+            assert_array_almost_equal(cluster_pv, want[2], 10)
+            assert_array_almost_equal(H0, want[3], 10)
+    finally:
+        cluster_level._CHECKPOINT_SIZE = orig_size
+    assert_raises(ValueError, permutation_cluster_1samp_test, X,
+                  split=(0, 2), **kwargs)
+    assert_raises(ValueError, permutation_cluster_1samp_test, X,
+                  split=(2, 2), checkpoint=fnames[0], **kwargs)
+    assert_raises(ValueError, permutation_cluster_1samp_test, X,
+                  split=(0, 2), step_down_p=0.05, checkpoint=fnames[0],
+                  **kwargs)
+
+
+def test_tfce_scores():
+    """Test TFCE scores against clustering at each threshold."""
+    rng = np.random.RandomState(0)
+    n_src, n_times = 20, 5
+    row = rng.randint(0, n_src, 30)
+    col = (row + rng.randint(1, 5, 30)) % n_src
+    conn = sparse.coo_matrix((np.ones(30), (row, col)), (n_src, n_src))
+    conn = sparse.coo_matrix(conn + conn.T)
+    st_conn = cluster_level._setup_connectivity(conn, n_src * n_times,
+                                                n_times)
+    for connectivity, shape in ((None, (30,)), (None, (6, 7)),
+                                (conn, (n_src,)),
+                                (st_conn, (n_src * n_times,))):
+        for max_step in (1, 2):
+            x = rng.randn(*shape) * 2
+            include = rng.rand(*shape) > 0.2
+            for tail, step in ((0, 0.3), (1, 0.3), (-1, -0.3)):
+                threshold = dict(start=step, step=step, h_power=1.5,
+                                 e_power=0.7)
+                scores = cluster_level._find_clusters(
+                    x, threshold, tail, connectivity, max_step, include)[1]
+                want = np.zeros(x.size)
+                stop = np.sign(step) * np.abs(x).max()
+                for thresh in np.arange(step, stop, step):
+                    for c in cluster_level._find_clusters(
+                            x, thresh, tail, connectivity, max_step,
+                            include)[0]:
+                        mask = np.zeros(x.size, bool)
+                        if isinstance(c, tuple):  # slices
+                            mask.reshape(x.shape)[c] = True
+                        else:
+                            mask[c] = True
+                        want[mask] += abs(step) ** 1.5 * mask.sum() ** 0.7
+                assert_array_almost_equal(scores, want, 10)
+
+
 def test_tfce_thresholds():
     rng = np.random.RandomState(0)
     data = rng.randn(7, 10, 1) - 0.5
@@ -2,12 +2,16 @@
 #
 # License: BSD (3-clause)
 
+import os.path as op
+
+from nose.tools import assert_raises
 from numpy.testing import assert_array_equal, assert_allclose
 import numpy as np
 from scipy import stats
 
+from mne.stats import cluster_level, merge_permutation_checkpoints
 from mne.stats.permutations import permutation_t_test, _ci, _bootstrap_ci
-from mne.utils import run_tests_if_main
+from mne.utils import run_tests_if_main, _TempDir
 
 
 def test_permutation_t_test():
@@ -50,6 +54,73 @@ def test_permutation_t_test():
     assert_allclose(t_obs[0], t_obs_scipy, 8)
     assert_allclose(p_values[0], p_values_scipy, rtol=1e-2)
 
+    # the packed sign flips match the unpacked orders
+    for n_samples, tail in ((5, 0), (13, 1), (30, 0)):
+        orders = cluster_level._get_1samp_orders(
+            n_samples, 100, tail, np.random.RandomState(0))[0]
+        packed = cluster_level._get_1samp_orders(
+            n_samples, 100, tail, np.random.RandomState(0), packed=True)[0]
+        assert packed.dtype == np.uint8
+        assert_array_equal(np.unpackbits(packed, axis=1)[:, :n_samples],
+                           orders)
+
+    # the blocked kernel matches the direct computation of the t-max
+    X = np.random.randn(10, 3)
+    t_obs, p_values, H0 = permutation_t_test(X, n_permutations=1000)
+    perms = 2 * cluster_level.bin_perm_rep(10)[1:2 ** 9] - 1
+    t_perms = np.array([stats.ttest_1samp(X * p[:, np.newaxis], 0)[0]
+                        for p in perms])
+    want = np.sort(np.concatenate((np.abs(t_perms).max(axis=1),
+                                   [np.abs(t_obs).max()])))
+    assert_allclose(H0, want, rtol=1e-10)
+
+
+def test_permutation_t_test_early_stop():
+    """Test T-test based on permutations stopping early."""
+    rng = np.random.RandomState(0)
+    X = rng.randn(16, 5)
+    X[:, :2] += 2
+    want = permutation_t_test(X, n_permutations=2 ** 16, seed=0)
+    assert len(want[2]) == 2 ** 15  # exact test
+    t_obs, p_values, H0 = permutation_t_test(X, n_permutations=2 ** 16,
+                                             seed=0, early_stop=0.05)
+    assert_allclose(t_obs, want[0])
+    assert len(H0) < len(want[2])
+    assert_array_equal(p_values < 0.05, want[1] < 0.05)
+    assert_array_equal(p_values < 0.05, [True, True, False, False, False])
+    assert_raises(ValueError, permutation_t_test, X, early_stop=0.05,
+                  checkpoint='perm.npz', split=(0, 2))
+
+
+def test_permutation_t_test_checkpoint():
+    """Test checkpointed and split T-tests based on permutations."""
+    tempdir = _TempDir()
+    rng = np.random.RandomState(0)
+    X = rng.randn(30, 5)
+    X[:, :2] += 1
+    want = permutation_t_test(X, n_permutations=999, seed=0)
+    orig_size = cluster_level._CHECKPOINT_SIZE
+    cluster_level._CHECKPOINT_SIZE = 100
+    try:
+        fname = op.join(tempdir, 'perm.npz')
+        out = permutation_t_test(X, n_permutations=999, seed=0,
+                                 checkpoint=fname)
+        for o, w in zip(out, want):
+            assert_allclose(o, w)
+        # resuming a complete test does not permute again
+        out = permutation_t_test(X, n_permutations=999, checkpoint=fname)
+        assert_allclose(out[2], want[2])
+        fnames = [op.join(tempdir, 'split_%d.npz' % ii) for ii in range(2)]
+        for ii, fname in enumerate(fnames):
+            out = permutation_t_test(X, n_permutations=999, seed=0,
+                                     checkpoint=fname, split=(ii, 2))
+            assert len(out[2]) == 500
+        p_values, H0 = merge_permutation_checkpoints(fnames)
+        assert_allclose(p_values, want[1])
+        assert_allclose(H0, want[2])
+    finally:
+        cluster_level._CHECKPOINT_SIZE = orig_size
+
 
 def test_ci():
     # isolated test of CI functions
@@ -1078,6 +1078,76 @@ def test_preload_epochs():
                               epochs.average().data, 18)
 
 
+@pytest.mark.parametrize('preload_raw', (True, False))
+def test_batched_epochs_reading(preload_raw):
+    """Test reading batches of epochs from raw data."""
+    tempdir = _TempDir()
+    info = create_info(['a', 'b', 'c', 'stim'], 1000., ['eeg'] * 3 + ['stim'])
+    raw = RawArray(rng.randn(4, 20000) * 1e-5, info)
+    raw.set_eeg_reference(projection=True)
+    raw.annotations = Annotations([5., 10.], [1., 1.], ['bad', 'good'])
+    fname = op.join(tempdir, 'test_raw.fif')
+    raw.save(fname)
+    raw = read_raw_fif(fname, preload=preload_raw)
+    # unsorted, overlapping, far apart, out of range and annotated events
+    events = np.array([[s, 0, 1] for s in (50, 500, 700, 701, 5000, 10500,
+                                           19900, 15000, 3000, 5500)])
+    kwargs = [dict(), dict(detrend=1, decim=3), dict(reject=dict(eeg=6e-5)),
+              dict(proj='delayed', reject=dict(eeg=6e-5), flat=dict(eeg=0.),
+                   baseline=None, reject_by_annotation=False)]
+    for kwarg in kwargs:
+        with warnings.catch_warnings(record=True):  # unsorted events, decim
+            epochs = Epochs(raw, events, tmin=-0.2, tmax=0.5, **kwarg)
+            epochs_preload = Epochs(raw, events, tmin=-0.2, tmax=0.5,
+                                    preload=True, **kwarg)
+        # iteration reads one epoch at a time
+        data_iter = np.array([epoch for epoch in epochs])
+        data = epochs.get_data()
+        assert_allclose(data, epochs_preload.get_data(), rtol=1e-12,
+                        atol=1e-25)
+        assert_allclose(data, data_iter, rtol=1e-12, atol=1e-25)
+        assert_equal(epochs.drop_log, epochs_preload.drop_log)
+        assert_equal(epochs.drop_log[0], ['NO_DATA'])
+        assert_equal(epochs.drop_log[6], ['TOO_SHORT'])
+        assert_equal(epochs.drop_log[4] == ['bad'],
+                     kwarg.get('reject_by_annotation', True))
+        # already dropped epochs are read again in batches
+        assert_allclose(epochs.get_data(), data, rtol=1e-12, atol=1e-25)
+
+
+def test_drop_bad_chunks():
+    """Test rejection of epochs in chunks and in parallel."""
+    info = create_info(['a', 'b', 'c', 'd'], 1000., ['eeg'] * 2 + ['mag'] * 2)
+    data = rng.randn(4, 20000) * 1e-5
+    data[2:] *= 1e-7
+    data[1, 5000:6000] = 0.  # flat
+    data[3, 12000] = 1e-10  # spike
+    info['bads'] = ['a']
+    raw = RawArray(data, info)
+    events = make_fixed_length_events(raw, 1, duration=0.2)
+    reject, flat = dict(eeg=9e-5, mag=9e-12), dict(eeg=1e-7)
+    epochs = Epochs(raw, events, tmin=-0.2, tmax=0.5, reject=reject,
+                    flat=flat, preload=True)
+    drop_log = [[ch for ch in log if ch != 'a'] for log in epochs.drop_log]
+    assert_equal(epochs.drop_log, drop_log)
+    assert_true(any(log == ['b'] for log in drop_log))  # flat
+    assert_true(any(log == ['d'] for log in drop_log))
+    for kwargs in (dict(chunk_size=7), dict(chunk_size=30, n_jobs=2)):
+        epochs_2 = Epochs(raw, events, tmin=-0.2, tmax=0.5, reject=reject,
+                          flat=flat, preload=True, **kwargs)
+        assert_equal(epochs_2.drop_log, drop_log)
+        assert_array_equal(epochs_2.get_data(), epochs.get_data())
+        for preload in (True, False):
+            epochs_2 = Epochs(raw, events, tmin=-0.2, tmax=0.5,
+                              preload=preload)
+            epochs_2.drop_bad(reject=reject, flat=flat, **kwargs)
+            assert_equal(epochs_2.drop_log, drop_log)
+            assert_allclose(epochs_2.get_data(), epochs.get_data(),
+                            rtol=1e-12, atol=1e-25)
+    assert_raises(ValueError, epochs.copy().drop_bad, reject, chunk_size=0)
+    assert_raises(TypeError, epochs.copy().drop_bad, reject, chunk_size=1.)
+
+
 def test_indexing_slicing():
     """Test of indexing and slicing operations."""
     raw, events, picks = _get_data()
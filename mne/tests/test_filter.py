@@ -1,3 +1,4 @@
+import os
 import os.path as op
 import warnings
 
@@ -14,7 +15,9 @@ from mne.io import RawArray, read_raw_fif
 from mne.filter import (filter_data, resample, _resample_stim_channels,
                         construct_iir_filter, notch_filter, detrend,
                         _overlap_add_filter, _smart_pad, design_mne_c_filter,
-                        estimate_ringing_samples, create_filter, _Interp2)
+                        estimate_ringing_samples, create_filter, _Interp2,
+                        get_filter_cache_info, clear_filter_cache,
+                        _IIRStream)
 
 from mne.utils import (sum_squared, run_tests_if_main,
                        catch_logging, requires_version, _TempDir,
@@ -139,6 +142,29 @@ def test_1d_filter():
                             assert_allclose(x_filtered, x_expected, atol=1e-13)
 
 
+def test_2d_filter():
+    """Test overlap-add filtering of many channels at once."""
+    rng = np.random.RandomState(0)
+    x = rng.randn(300, 3001)
+    x_pad = _smart_pad(x, (10, 20))
+    assert_equal(x_pad.shape, (300, 3031))
+    assert_array_equal(x_pad[7], _smart_pad(x[7], (10, 20)))
+    for n_filter in (11, 101):
+        h = rng.randn(n_filter)
+        for phase in ('zero', 'linear'):
+            for n_fft in (None, 1024, 1025):
+                picks = np.setdiff1d(np.arange(len(x)), [1, 150])
+                x_filtered = _overlap_add_filter(x.copy(), h, n_fft,
+                                                 phase=phase, picks=picks)
+                # unpicked channels are left alone
+                assert_array_equal(x_filtered[[1, 150]], x[[1, 150]])
+                # every channel matches filtering it on its own
+                for p in (0, 2, 149, 151, 299):
+                    x_expected = _overlap_add_filter(
+                        x[p:p + 1].copy(), h, n_fft, phase=phase)[0]
+                    assert_allclose(x_filtered[p], x_expected, atol=1e-12)
+
+
 @requires_version('scipy', '0.16')
 def test_iir_stability():
     """Test IIR filter stability check."""
@@ -196,6 +222,57 @@ def test_iir_stability():
     assert_allclose(x_sos[100:-100], x_ba[100:-100])
 
 
+@requires_version('scipy', '0.16')
+def test_iir_forward():
+    """Test causal IIR filtering of many channels and in chunks."""
+    from scipy.signal import sosfilt, sosfiltfilt, lfilter, filtfilt
+    rng = np.random.RandomState(0)
+    sfreq = 1000.
+    x = rng.randn(3, 20, 2000)
+    picks = np.arange(1, 20)
+    for output in ('sos', 'ba'):
+        iir_params = dict(ftype='butter', order=4, output=output)
+        iir_params = construct_iir_filter(iir_params, [1., 40.], None, sfreq,
+                                          'bandpass')
+        if output == 'sos':
+            x_expected = sosfilt(iir_params['sos'], x)
+        else:
+            x_expected = lfilter(iir_params['b'], iir_params['a'], x)
+        x_expected[:, 0] = x[:, 0]
+        x_filt = filter_data(x, sfreq, 1., 40., picks, method='iir',
+                             iir_params=iir_params, phase='forward')
+        assert_allclose(x_filt, x_expected, atol=1e-12)
+        # zero-phase filtering of all rows at once
+        x_filt = filter_data(x, sfreq, 1., 40., picks, method='iir',
+                             iir_params=iir_params)
+        padlen = min(iir_params['padlen'], len(x))
+        if output == 'sos':
+            x_expected_zero = sosfiltfilt(iir_params['sos'], x, padlen=padlen)
+        else:
+            x_expected_zero = filtfilt(iir_params['b'], iir_params['a'], x,
+                                       padlen=padlen)
+        x_expected_zero[:, 0] = x[:, 0]
+        assert_allclose(x_filt, x_expected_zero, atol=1e-12)
+        # chunks give the same result as the whole signal
+        data = x[0]
+        for segments in (None, [(0, 700), (700, 1500)]):
+            stream = _IIRStream(lambda start, stop: data[:, start:stop].copy(),
+                                data.shape[1], iir_params, picks, segments)
+            x_filt = np.concatenate([stream(start, start + 300)
+                                     for start in range(0, 2000, 300)],
+                                    axis=1)
+            if segments is None:
+                assert_allclose(x_filt, x_expected[0], atol=1e-12)
+            else:
+                assert_allclose(x_filt[:, :700], x_expected[0, :, :700],
+                                atol=1e-12)
+                assert_array_equal(x_filt[:, 1500:], data[:, 1500:])
+            # requesting earlier data filters again from the start
+            assert_allclose(stream(600, 900), x_filt[:, 600:900], atol=1e-12)
+    assert_raises(ValueError, filter_data, x, sfreq, 1., 40.,
+                  phase='forward')
+
+
 def test_notch_filters():
     """Test notch filters."""
     # let's use an ugly, prime sfreq for fun
@@ -251,6 +328,33 @@ def test_resample():
     assert_array_equal(resample([0, 0], 2, 1), [0., 0., 0., 0.])
 
 
+@requires_version('scipy', '0.18')
+def test_resample_polyphase():
+    """Test polyphase resampling."""
+    from scipy.signal import resample_poly
+    rng = np.random.RandomState(0)
+    for up, down, n_times in ((3, 7, 1000), (1, 20, 5000), (5, 3, 999)):
+        x = rng.randn(2, 3, n_times)
+        x_rs = resample(x, up, down, pad='constant', method='polyphase')
+        # same filter and zero padding as scipy
+        assert_allclose(x_rs, resample_poly(x, up, down, axis=-1),
+                        atol=1e-12)
+        x_rs_2 = resample(x.swapaxes(1, 2), float(up), float(down), axis=1,
+                          pad='constant', method='polyphase', n_jobs=2)
+        assert_allclose(x_rs_2.swapaxes(1, 2), x_rs, atol=1e-12)
+    # similar to FFT resampling away from the edges
+    t = np.arange(20000) / 5000.
+    x = np.sin(2 * np.pi * 7 * t)
+    x_rs = resample(x, 250., 5000., method='polyphase')
+    assert_equal(x_rs.shape, (1000,))
+    assert_allclose(x_rs[50:-50], resample(x, 250., 5000.)[50:-50],
+                    atol=1e-2)
+    assert_allclose(resample(x, 1., 1., method='polyphase'), x)
+    assert_raises(ValueError, resample, x, 1000., 600.615,
+                  method='polyphase')
+    assert_raises(ValueError, resample, x, 1., 2., method='foo')
+
+
 def test_resample_stim_channel():
     """Test resampling of stim channels."""
 
@@ -453,6 +557,58 @@ def test_filter_auto():
                   10, filter_length='auto', h_trans_bandwidth='auto', **kwargs)
 
 
+def test_filter_cache():
+    """Test caching of filter designs."""
+    rng = np.random.RandomState(0)
+    sfreq = 1000.
+    x = rng.randn(3, 5000)
+    clear_filter_cache()
+    x_filt = filter_data(x, sfreq, 1., 40.)
+    info = get_filter_cache_info()
+    assert_equal(info['design'], dict(hits=0, misses=1, size=1))
+    assert_equal(info['fft'], dict(hits=0, misses=1, size=1))
+    # the same design is used by create_filter and notch_filter
+    h = create_filter(x, sfreq, 1., 40.)
+    h[:] = 0.  # must not modify the cached filter
+    assert_array_equal(x_filt, filter_data(x, sfreq, 1., 40.))
+    filter_data(x[:, :2000], sfreq, 1., 40.)
+    info = get_filter_cache_info()
+    assert_equal(info['design'], dict(hits=3, misses=1, size=1))
+    assert_equal(info['fft']['hits'], 1)
+    notch_filter(x, sfreq, 50.)
+    notch_filter(x, sfreq, 50.)
+    info = get_filter_cache_info()
+    assert_equal(info['design'], dict(hits=4, misses=2, size=2))
+    # the number of entries is bounded
+    old_size = os.environ.get('MNE_FILTER_CACHE_SIZE')
+    try:
+        os.environ['MNE_FILTER_CACHE_SIZE'] = '2'
+        filter_data(x, sfreq, None, 40.)
+        info = get_filter_cache_info()['design']
+        assert_equal(info, dict(hits=4, misses=3, size=2))
+        filter_data(x, sfreq, 1., 40.)  # evicted least recently used
+        assert_equal(get_filter_cache_info()['design']['misses'], 4)
+        os.environ['MNE_FILTER_CACHE_SIZE'] = '0'
+        clear_filter_cache()
+        filter_data(x, sfreq, 1., 40.)
+        filter_data(x, sfreq, 1., 40.)
+        info = get_filter_cache_info()['design']
+        assert_equal(info, dict(hits=0, misses=2, size=0))
+        # an invalid size gives the default
+        os.environ['MNE_FILTER_CACHE_SIZE'] = 'foo'
+        with pytest.warns(RuntimeWarning, match='MNE_FILTER_CACHE_SIZE'):
+            filter_data(x, sfreq, 1., 40.)
+        assert_equal(get_filter_cache_info()['design']['size'], 1)
+    finally:
+        if old_size is None:
+            del os.environ['MNE_FILTER_CACHE_SIZE']
+        else:
+            os.environ['MNE_FILTER_CACHE_SIZE'] = old_size
+    clear_filter_cache()
+    assert_equal(get_filter_cache_info()['fft'], dict(hits=0, misses=0,
+                                                      size=0))
+
+
 def test_cuda():
     """Test CUDA-based filtering"""
     # NOTE: don't make test_cuda() the last test, or pycuda might spew
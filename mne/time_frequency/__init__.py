@@ -6,6 +6,7 @@ from .psd import psd_welch, psd_multitaper, psd_array_welch
 from .csd import CrossSpectralDensity, csd_epochs, csd_array
 from .ar import fit_iir_model_raw
 from .multitaper import (dpss_windows, psd_array_multitaper,
-                         tfr_array_multitaper)
+                         tfr_array_multitaper, get_dpss_cache_info,
+                         clear_dpss_cache)
 from .stft import stft, istft, stftfreq
 from ._stockwell import tfr_stockwell, tfr_array_stockwell
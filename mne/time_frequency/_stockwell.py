@@ -6,20 +6,28 @@
 from copy import deepcopy
 import math
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 from scipy import fftpack
 # XXX explore cuda optimazation at some point.
 
 from ..io.pick import pick_types, pick_info
 from ..utils import verbose, warn
 from ..parallel import parallel_func, check_n_jobs
-from .tfr import AverageTFR, _get_data
+from .tfr import AverageTFR, _get_data, _TFRSums, _tfr_stream
+
+# Number of samples of shifted spectra (n_signals * n_freqs * n_fft)
+# transformed at once
+_ST_WORKSPACE_SIZE = 2 ** 17
 
 
 def _check_input_st(x_in, n_fft):
     """Aux function."""
-    # flatten to 2 D and memorize original shape
-    n_times = x_in.shape[-1]
+    n_fft, zero_pad = _check_n_fft_st(x_in.shape[-1], n_fft)
+    return _pad_st(x_in, zero_pad), n_fft, zero_pad
+
 
+def _check_n_fft_st(n_times, n_fft):
+    """Get the FFT length and zero padding for signals of n_times."""
     def _is_power_of_two(n):
         return not (n > 0 and ((n & (n - 1))))
 
@@ -31,13 +39,33 @@ def _check_input_st(x_in, n_fft):
                          "Got %s < %s." % (n_fft, n_times))
     if n_times < n_fft:
         warn('The input signal is shorter ({0}) than "n_fft" ({1}). '
-             'Applying zero padding.'.format(x_in.shape[-1], n_fft))
-        zero_pad = n_fft - n_times
+             'Applying zero padding.'.format(n_times, n_fft))
+    return n_fft, n_fft - n_times
+
+
+def _pad_st(x_in, zero_pad):
+    """Zero-pad the signals at the end."""
+    if zero_pad > 0:
         pad_array = np.zeros(x_in.shape[:-1] + (zero_pad,), x_in.dtype)
         x_in = np.concatenate((x_in, pad_array), axis=-1)
-    else:
-        zero_pad = 0
-    return x_in, n_fft, zero_pad
+    return x_in
+
+
+def _setup_st(n_times, sfreq, fmin, fmax, n_fft, width):
+    """Set up the Stockwell transform of signals of n_times samples."""
+    n_fft, zero_pad = _check_n_fft_st(n_times, n_fft)
+    freqs = fftpack.fftfreq(n_fft, 1. / sfreq)
+    if fmin is None:
+        fmin = freqs[freqs > 0][0]
+    if fmax is None:
+        fmax = freqs.max()
+
+    start_f = np.abs(freqs - fmin).argmin()
+    stop_f = np.abs(freqs - fmax).argmin()
+    freqs = freqs[start_f:stop_f]
+
+    W = _precompute_st_windows(n_fft, start_f, stop_f, sfreq, width)
+    return freqs, start_f, zero_pad, W
 
 
 def _precompute_st_windows(n_samp, start_f, stop_f, sfreq, width):
@@ -63,41 +91,107 @@ def _st(x, start_f, windows):
     """Compute ST based on Ali Moukadem MATLAB code (used in tests)."""
     n_samp = x.shape[-1]
     ST = np.empty(x.shape[:-1] + (len(windows), n_samp), dtype=np.complex)
-    # do the work
-    Fx = fftpack.fft(x)
-    XF = np.concatenate([Fx, Fx], axis=-1)
-    for i_f, window in enumerate(windows):
-        f = start_f + i_f
-        ST[..., i_f, :] = fftpack.ifft(XF[..., f:f + n_samp] * window)
+    ST_flat = ST.reshape(-1, len(windows), n_samp)
+    for freq_sl, this_ST in _st_chunks(x.reshape(-1, n_samp), start_f,
+                                       windows, 1, n_samp):
+        ST_flat[:, freq_sl] = this_ST
     return ST
 
 
+def _st_chunks(x, start_f, W, decim, n_out):
+    """Generate the Stockwell transform of signals by chunks of frequencies.
+
+    Parameters
+    ----------
+    x : array, shape (n_signals, n_samp)
+        The (zero-padded) signals.
+    start_f : int
+        The index of the first frequency.
+    W : array, shape (n_freqs, n_samp)
+        The windows in the frequency domain.
+    decim : int
+        The decimation factor on the time axis.
+    n_out : int
+        The number of decimated time points to keep.
+
+    Yields
+    ------
+    freq_sl : slice
+        The frequencies of the chunk.
+    ST : array, shape (n_signals, n_freqs_chunk, n_out)
+        The Stockwell transform at these frequencies.
+    """
+    n_signals, n_samp = x.shape
+    X = fftpack.fft(x)
+    XX = np.concatenate([X, X], axis=-1)
+    n_chunk = max(_ST_WORKSPACE_SIZE // (n_signals * n_samp), 1)
+    # decimating in time aliases the spectrum: the decimated inverse FFT is
+    # the inverse FFT of the spectrum folded decim times, which is shorter
+    fold = decim > 1 and n_samp % decim == 0
+    for start in range(0, len(W), n_chunk):
+        this_W = W[start:start + n_chunk]
+        # the spectra shifted to each frequency, as a view of XX
+        XX_f = as_strided(XX[:, start_f + start:],
+                          (n_signals, len(this_W), n_samp),
+                          (XX.strides[0], XX.strides[1], XX.strides[1]),
+                          writeable=False)
+        ST = XX_f * this_W
+        if fold:
+            ST = ST.reshape(n_signals, len(this_W), decim, -1).sum(axis=2)
+            ST = fftpack.ifft(ST, overwrite_x=True)
+            ST /= decim
+        else:
+            ST = fftpack.ifft(ST, overwrite_x=True)[..., ::decim]
+        yield slice(start, start + len(this_W)), ST[..., :n_out]
+
+
 def _st_power_itc(x, start_f, compute_itc, zero_pad, decim, W):
     """Aux function."""
-    n_samp = x.shape[-1]
+    psd, itc = _st_power_itc_sums(x, start_f, compute_itc, zero_pad, decim,
+                                  W)
+    psd /= len(x)
+    if compute_itc:
+        itc = np.abs(itc) / len(x)
+    return psd, itc
+
+
+def _st_power_itc_sums(x, start_f, compute_itc, zero_pad, decim, W):
+    """Sum the power and the unit phase vectors of the signals.
+
+    The signals ``x`` have shape (n_epochs, ..., n_samp), and the sums over
+    epochs have shape (..., n_freqs, n_out).
+    """
+    n_epochs, n_samp = x.shape[0], x.shape[-1]
     n_out = (n_samp - zero_pad)
     n_out = n_out // decim + bool(n_out % decim)
-    psd = np.empty((len(W), n_out))
-    itc = np.empty_like(psd) if compute_itc else None
-    X = fftpack.fft(x)
-    XX = np.concatenate([X, X], axis=-1)
-    for i_f, window in enumerate(W):
-        f = start_f + i_f
-        ST = fftpack.ifft(XX[:, f:f + n_samp] * window)
-        if zero_pad > 0:
-            TFR = ST[:, :-zero_pad:decim]
-        else:
-            TFR = ST[:, ::decim]
+    shape = x.shape[1:-1] + (len(W), n_out)
+    psd = np.empty(shape)
+    itc = np.empty(shape, np.complex) if compute_itc else None
+    psd_flat = psd.reshape(-1, len(W), n_out)
+    itc_flat = itc.reshape(-1, len(W), n_out) if compute_itc else None
+    for freq_sl, TFR in _st_chunks(x.reshape(-1, n_samp), start_f, W, decim,
+                                   n_out):
+        TFR = TFR.reshape((n_epochs, -1) + TFR.shape[1:])
         TFR_abs = np.abs(TFR)
         TFR_abs[TFR_abs == 0] = 1.
         if compute_itc:
             TFR /= TFR_abs
-            itc[i_f] = np.abs(np.mean(TFR, axis=0))
+            itc_flat[:, freq_sl] = np.sum(TFR, axis=0)
         TFR_abs *= TFR_abs
-        psd[i_f] = np.mean(TFR_abs, axis=0)
+        psd_flat[:, freq_sl] = np.sum(TFR_abs, axis=0)
     return psd, itc
 
 
+def _st_sums(data, start_f, compute_itc, zero_pad, decim, W):
+    """Compute the _TFRSums of a chunk of epochs."""
+    data = _pad_st(data, zero_pad)
+    psd, itc = _st_power_itc_sums(data, start_f, compute_itc, zero_pad,
+                                  decim, W)
+    if compute_itc:
+        itc = itc[:, np.newaxis]
+    return _TFRSums(psd, itc, len(data), 1)
+
+
 def tfr_array_stockwell(data, sfreq, fmin=None, fmax=None, n_fft=None,
                         width=1.0, decim=1, return_itc=False, n_jobs=1):
     """Compute power and intertrial coherence using Stockwell (S) transform.
@@ -170,31 +264,26 @@ def tfr_array_stockwell(data, sfreq, fmin=None, fmax=None, n_fft=None,
     """
     n_epochs, n_channels = data.shape[:2]
     n_out = data.shape[2] // decim + bool(data.shape[2] % decim)
-    data, n_fft_, zero_pad = _check_input_st(data, n_fft)
-
-    freqs = fftpack.fftfreq(n_fft_, 1. / sfreq)
-    if fmin is None:
-        fmin = freqs[freqs > 0][0]
-    if fmax is None:
-        fmax = freqs.max()
-
-    start_f = np.abs(freqs - fmin).argmin()
-    stop_f = np.abs(freqs - fmax).argmin()
-    freqs = freqs[start_f:stop_f]
-
-    W = _precompute_st_windows(data.shape[-1], start_f, stop_f, sfreq, width)
-    n_freq = stop_f - start_f
+    freqs, start_f, zero_pad, W = _setup_st(data.shape[2], sfreq, fmin, fmax,
+                                            n_fft, width)
+    data = _pad_st(data, zero_pad)
+    n_freq = len(W)
     psd = np.empty((n_channels, n_freq, n_out))
     itc = np.empty((n_channels, n_freq, n_out)) if return_itc else None
 
-    parallel, my_st, _ = parallel_func(_st_power_itc, n_jobs)
-    tfrs = parallel(my_st(data[:, c, :], start_f, return_itc, zero_pad,
+    # Transform the epochs of batches of channels at once, with batches
+    # small enough to keep all the jobs busy
+    parallel, my_st, n_jobs = parallel_func(_st_power_itc, n_jobs)
+    n_batch = max(_ST_WORKSPACE_SIZE // (n_epochs * data.shape[2]), 1)
+    n_batch = min(n_batch, -(-n_channels // n_jobs))
+    batches = [slice(c, c + n_batch) for c in range(0, n_channels, n_batch)]
+    tfrs = parallel(my_st(data[:, batch, :], start_f, return_itc, zero_pad,
                           decim, W)
-                    for c in range(n_channels))
-    for c, (this_psd, this_itc) in enumerate(iter(tfrs)):
-        psd[c] = this_psd
+                    for batch in batches)
+    for batch, (this_psd, this_itc) in zip(batches, tfrs):
+        psd[batch] = this_psd
         if this_itc is not None:
-            itc[c] = this_itc
+            itc[batch] = this_itc
 
     return psd, itc, freqs
 
@@ -208,7 +297,9 @@ def tfr_stockwell(inst, fmin=None, fmax=None, n_fft=None,
     Parameters
     ----------
     inst : Epochs | Evoked
-        The epochs or evoked object.
+        The epochs or evoked object. Epochs that are not preloaded are read
+        and transformed a few at a time, without loading all of them in
+        memory.
     fmin : None, float
         The minimum frequency to include. If None defaults to the minimum fft
         frequency greater than zero.
@@ -226,7 +317,8 @@ def tfr_stockwell(inst, fmin=None, fmax=None, n_fft=None,
     return_itc : bool
         Return intertrial coherence (ITC) as well as averaged power.
     n_jobs : int
-        The number of jobs to run in parallel (over channels).
+        The number of jobs to run in parallel (over channels, or over chunks
+        of epochs if they are not preloaded).
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -251,18 +343,26 @@ def tfr_stockwell(inst, fmin=None, fmax=None, n_fft=None,
     .. versionadded:: 0.9.0
     """
     # verbose dec is used b/c subfunctions are verbose
-    data = _get_data(inst, return_itc)
+    from ..epochs import BaseEpochs
     picks = pick_types(inst.info, meg=True, eeg=True)
     info = pick_info(inst.info, picks)
-    data = data[:, picks, :]
     n_jobs = check_n_jobs(n_jobs)
-    power, itc, freqs = tfr_array_stockwell(data, sfreq=info['sfreq'],
-                                            fmin=fmin, fmax=fmax, n_fft=n_fft,
-                                            width=width, decim=decim,
-                                            return_itc=return_itc,
-                                            n_jobs=n_jobs)
+    if isinstance(inst, BaseEpochs) and not inst.preload:
+        # average the epochs without loading all of them
+        freqs, start_f, zero_pad, W = _setup_st(
+            len(inst.times), info['sfreq'], fmin, fmax, n_fft, width)
+        sums = _tfr_stream(inst, picks, _st_sums, n_jobs, start_f,
+                           return_itc, zero_pad, decim, W)
+        power, itc = sums.average()
+        nave = sums.n_epochs
+    else:
+        data = _get_data(inst, return_itc)
+        data = data[:, picks, :]
+        power, itc, freqs = tfr_array_stockwell(
+            data, sfreq=info['sfreq'], fmin=fmin, fmax=fmax, n_fft=n_fft,
+            width=width, decim=decim, return_itc=return_itc, n_jobs=n_jobs)
+        nave = len(data)
     times = inst.times[::decim].copy()
-    nave = len(data)
     out = AverageTFR(info, power, times, freqs, nave, method='stockwell-power')
     if return_itc:
         out = (out, AverageTFR(deepcopy(info), itc, times.copy(),
@@ -7,12 +7,17 @@ import copy as cp
 import numpy as np
 
 from ..io.pick import pick_types
+from ..parallel import parallel_func
 from ..utils import logger, verbose, warn
 from ..time_frequency.multitaper import (dpss_windows, _mt_spectra,
-                                         _csd_from_mt, _psd_from_mt_adaptive)
+                                         _psd_from_mt_adaptive)
 
 from ..externals.six.moves import xrange as range
 
+# Maximum number of samples of tapered signals (n_epochs * n_channels *
+# n_tapers * n_fft) transformed at once by each job when computing the CSD
+_CSD_WORKSPACE_SIZE = 2 ** 22
+
 
 class CrossSpectralDensity(object):
     """Cross-spectral density.
@@ -55,7 +60,7 @@ class CrossSpectralDensity(object):
 def csd_epochs(epochs, mode='multitaper', fmin=0, fmax=np.inf,
                fsum=True, tmin=None, tmax=None, n_fft=None,
                mt_bandwidth=None, mt_adaptive=False, mt_low_bias=True,
-               projs=None, verbose=None):
+               projs=None, fmt='double', n_jobs=1, verbose=None):
     """Estimate cross-spectral density from epochs.
 
     Note: Baseline correction should be used when creating the Epochs.
@@ -70,15 +75,19 @@ def csd_epochs(epochs, mode='multitaper', fmin=0, fmax=np.inf,
         The epochs.
     mode : str
         Spectrum estimation mode can be either: 'multitaper' or 'fourier'.
-    fmin : float
-        Minimum frequency of interest.
-    fmax : float | np.inf
-        Maximum frequency of interest.
+    fmin : float | array of float
+        Minimum frequency of interest. If an array, the lower edges of
+        frequency bands (see ``fmax``).
+    fmax : float | np.inf | array of float
+        Maximum frequency of interest. If an array, the upper edges of
+        frequency bands, and one CSD matrix is computed per band if ``fsum``
+        is True.
     fsum : bool
         Sum CSD values for the frequencies of interest. Summing is performed
         instead of averaging so that accumulated power is comparable to power
-        in the time domain. If True, a single CSD matrix will be returned. If
-        False, the output will be a list of CSD matrices.
+        in the time domain. If True, a single CSD matrix will be returned
+        (or one per frequency band). If False, the output will be a list of
+        CSD matrices.
     tmin : float | None
         Minimum time instant to consider. If None start at first sample.
     tmax : float | None
@@ -98,20 +107,30 @@ def csd_epochs(epochs, mode='multitaper', fmin=0, fmax=np.inf,
     projs : list of Projection | None
         List of projectors to use in CSD calculation, or None to indicate that
         the projectors from the epochs should be inherited.
+    fmt : 'double' | 'single'
+        The precision in which the CSD matrices are accumulated and returned.
+        'single' halves the memory and the time spent in the matrix products.
+
+        .. versionadded:: 0.16
+    n_jobs : int
+        Number of jobs to run in parallel, each one processing chunks of
+        epochs.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
 
     Returns
     -------
-    csd : instance of CrossSpectralDensity
-        The computed cross-spectral density.
+    csd : instance of CrossSpectralDensity | list of CrossSpectralDensity
+        The computed cross-spectral density. A list with one instance per
+        frequency if ``fsum`` is False, or per frequency band if ``fmin``
+        and ``fmax`` are arrays.
     """
     # Portions of this code adapted from mne/connectivity/spectral.py
 
     # Check correctness of input data and parameters
-    if fmax < fmin:
-        raise ValueError('fmax must be larger than fmin')
     tstep = epochs.times[1] - epochs.times[0]
     if tmin is not None and tmin < epochs.times[0] - tstep:
         raise ValueError('tmin should be larger than the smallest data time '
@@ -145,75 +164,32 @@ def csd_epochs(epochs, mode='multitaper', fmin=0, fmax=np.inf,
     n_times = len(epochs.times[tslice])
     n_fft = n_times if n_fft is None else n_fft
 
-    # Preparing frequencies of interest
-    sfreq = epochs.info['sfreq']
-    orig_freqs = np.fft.rfftfreq(n_fft, 1. / sfreq)
-    freq_mask = (orig_freqs > fmin) & (orig_freqs < fmax)
-    freqs = orig_freqs[freq_mask]
-    n_freqs = len(freqs)
-
-    if n_freqs == 0:
-        raise ValueError('No discrete fourier transform results within '
-                         'the given frequency window. Please widen either '
-                         'the frequency window or the time window')
-
-    # Preparing for computing CSD
+    # Compute CSD, streaming the epochs in chunks
     logger.info('Computing cross-spectral density from epochs...')
-    window_fun, eigvals, n_tapers, mt_adaptive = _compute_csd_params(
-        n_times, sfreq, mode, mt_bandwidth, mt_low_bias, mt_adaptive)
-
-    csds_mean = np.zeros((len(ch_names), len(ch_names), n_freqs),
-                         dtype=complex)
-
-    # Picking frequencies of interest
-    freq_mask_mt = freq_mask[orig_freqs >= 0]
-
-    # Compute CSD for each epoch
-    n_epochs = 0
-    for epoch in epochs:
-        epoch = epoch[picks_meeg][:, tslice]
-
-        # Calculating Fourier transform using multitaper module
-        csds_epoch = _csd_array(epoch, sfreq, window_fun, eigvals, freq_mask,
-                                freq_mask_mt, n_fft, mode, mt_adaptive)
-
-        # Scaling by number of samples and compensating for loss of power due
-        # to windowing (see section 11.5.2 in Bendat & Piersol).
-        if mode == 'fourier':
-            csds_epoch /= n_times
-            csds_epoch *= 8 / 3.
-
-        # Scaling by sampling frequency for compatibility with Matlab
-        csds_epoch /= sfreq
-
-        csds_mean += csds_epoch
-        n_epochs += 1
-
-    csds_mean /= n_epochs
-
+    sfreq = epochs.info['sfreq']
+    data = (epoch[picks_meeg][:, tslice] for epoch in epochs)
+    csds, freqs, bands = _csd_epochs_stream(
+        data, len(ch_names), n_times, sfreq, mode, fmin, fmax, fsum, n_fft,
+        mt_bandwidth, mt_adaptive, mt_low_bias, fmt, n_jobs)
     logger.info('[done]')
 
-    # Summing over frequencies of interest or returning a list of separate CSD
-    # matrices for each frequency
-    if fsum is True:
-        csd_mean_fsum = np.sum(csds_mean, 2)
-        csd = CrossSpectralDensity(csd_mean_fsum, ch_names, projs,
-                                   epochs.info['bads'],
-                                   freqs=freqs, n_fft=n_fft)
-        return csd
-    else:
-        csds = []
-        for i in range(n_freqs):
-            csds.append(CrossSpectralDensity(csds_mean[:, :, i], ch_names,
-                                             projs, epochs.info['bads'],
-                                             freqs=freqs[i], n_fft=n_fft))
-        return csds
+    # Returning a CSD matrix per frequency band or per frequency
+    if bands is None:
+        return [CrossSpectralDensity(csd, ch_names, projs,
+                                     epochs.info['bads'], freqs=freq,
+                                     n_fft=n_fft)
+                for csd, freq in zip(csds, freqs)]
+    csds = [CrossSpectralDensity(csd, ch_names, projs, epochs.info['bads'],
+                                 freqs=freqs[band], n_fft=n_fft)
+            for csd, band in zip(csds, bands)]
+    return csds if np.ndim(fmin) > 0 else csds[0]
 
 
 @verbose
 def csd_array(X, sfreq, mode='multitaper', fmin=0, fmax=np.inf,
               fsum=True, n_fft=None, mt_bandwidth=None,
-              mt_adaptive=False, mt_low_bias=True, verbose=None):
+              mt_adaptive=False, mt_low_bias=True, fmt='double', n_jobs=1,
+              verbose=None):
     """Estimate cross-spectral density from an array.
 
     .. note:: Results are scaled by sampling frequency for compatibility with
@@ -230,15 +206,19 @@ def csd_array(X, sfreq, mode='multitaper', fmin=0, fmax=np.inf,
         Sampling frequency of observations.
     mode : str
         Spectrum estimation mode can be either: 'multitaper' or 'fourier'.
-    fmin : float
-        Minimum frequency of interest.
-    fmax : float
-        Maximum frequency of interest.
+    fmin : float | array of float
+        Minimum frequency of interest. If an array, the lower edges of
+        frequency bands (see ``fmax``).
+    fmax : float | array of float
+        Maximum frequency of interest. If an array, the upper edges of
+        frequency bands, and one CSD matrix is computed per band if ``fsum``
+        is True.
     fsum : bool
         Sum CSD values for the frequencies of interest. Summing is performed
         instead of averaging so that accumulated power is comparable to power
-        in the time domain. If True, a single CSD matrix will be returned. If
-        False, the output will be an array of CSD matrices.
+        in the time domain. If True, a single CSD matrix will be returned
+        (or one per frequency band). If False, the output will be an array of
+        CSD matrices.
     n_fft : int | None
         Length of the FFT. If None the exact number of samples between tmin and
         tmax will be used.
@@ -251,74 +231,155 @@ def csd_array(X, sfreq, mode='multitaper', fmin=0, fmax=np.inf,
     mt_low_bias : bool
         Only use tapers with more than 90% spectral concentration within
         bandwidth. Only used in 'multitaper' mode.
+    fmt : 'double' | 'single'
+        The precision in which the CSD matrices are accumulated and returned.
+        'single' halves the memory and the time spent in the matrix products.
+
+        .. versionadded:: 0.16
+    n_jobs : int
+        Number of jobs to run in parallel, each one processing chunks of
+        replicates.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`).
 
     Returns
     -------
-    csd : array, shape (n_freqs, n_series, n_series) if fsum is True, otherwise (n_series, n_series).
-        The computed cross spectral-density (either summed or not).
-    freqs : array
-        Frequencies the cross spectral-density is evaluated at.
+    csd : array, shape (n_series, n_series, n_freqs) if fsum is False, otherwise (n_series, n_series)
+        The computed cross spectral-density (either summed or not). If
+        ``fmin`` and ``fmax`` are arrays and fsum is True, the shape is
+        (n_series, n_series, n_bands).
+    freqs : array | list of array
+        Frequencies the cross spectral-density is evaluated at. A list with
+        the frequencies of each band if ``fmin`` and ``fmax`` are arrays and
+        fsum is True.
     """  # noqa: E501
-    # Check correctness of input data and parameters
-    if fmax < fmin:
-        raise ValueError('fmax must be larger than fmin')
-
     X = np.asarray(X, dtype=float)
     if X.ndim != 3:
         raise ValueError("X must be n_replicates x n_series x n_times.")
     n_replicates, n_series, n_times = X.shape
-
-    # Preparing frequencies of interest
     n_fft = n_times if n_fft is None else n_fft
-    orig_freqs = np.fft.rfftfreq(n_fft, 1. / sfreq)
-    freq_mask = (orig_freqs > fmin) & (orig_freqs < fmax)
-    freqs = orig_freqs[freq_mask]
-    n_freqs = len(freqs)
 
-    if n_freqs == 0:
+    # Compute CSD, passing the replicates in chunks
+    logger.info('Computing cross-spectral density from array...')
+    csds, freqs, bands = _csd_epochs_stream(
+        X, n_series, n_times, sfreq, mode, fmin, fmax, fsum, n_fft,
+        mt_bandwidth, mt_adaptive, mt_low_bias, fmt, n_jobs)
+    logger.info('[done]')
+
+    csds = csds.transpose(1, 2, 0)
+    if bands is None:
+        return csds, freqs
+    elif np.ndim(fmin) > 0:
+        return csds, [freqs[band] for band in bands]
+    return csds[:, :, 0], freqs
+
+
+def _check_csd_bands(fmin, fmax, n_fft, sfreq, fsum):
+    """Get the frequencies of interest and the frequency bands to sum."""
+    fmin, fmax = np.atleast_1d(fmin), np.atleast_1d(fmax)
+    if fmin.ndim != 1 or fmin.shape != fmax.shape:
+        raise ValueError('fmin and fmax must have the same length, got %s '
+                         'and %s' % (fmin.shape, fmax.shape))
+    if np.any(fmax < fmin):
+        raise ValueError('fmax must be larger than fmin')
+    orig_freqs = np.fft.rfftfreq(n_fft, 1. / sfreq)
+    band_masks = [(orig_freqs > f_lo) & (orig_freqs < f_hi)
+                  for f_lo, f_hi in zip(fmin, fmax)]
+    freq_mask = np.any(band_masks, axis=0)
+    if not all(mask.any() for mask in band_masks):
         raise ValueError('No discrete fourier transform results within '
                          'the given frequency window. Please widen either '
                          'the frequency window or the time window')
-
-    # Preparing for computing CSD
-    logger.info('Computing cross-spectral density from array...')
+    freqs = orig_freqs[freq_mask]
+    bands = None
+    if fsum:
+        # frequency bands as slices of the frequencies of interest
+        bands = list()
+        for mask in band_masks:
+            idx = np.where(mask[freq_mask])[0]
+            bands.append(slice(idx[0], idx[-1] + 1))
+    return freqs, freq_mask, bands
+
+
+def _csd_epochs_stream(data, n_channels, n_times, sfreq, mode, fmin, fmax,
+                       fsum, n_fft, mt_bandwidth, mt_adaptive, mt_low_bias,
+                       fmt, n_jobs):
+    """Compute the average CSD of epochs, in chunks of epochs.
+
+    ``data`` is an array or an iterable of arrays of shape
+    (n_channels, n_times). Returns the CSD matrices of shape
+    (n_freqs or n_bands, n_channels, n_channels), the frequencies of interest
+    and the frequency bands (None if the CSD is not summed over frequencies).
+    """
+    if fmt not in ('double', 'single'):
+        raise ValueError('fmt must be "double" or "single", got "%s"'
+                         % (fmt,))
+    dtype = np.complex64 if fmt == 'single' else np.complex128
+    freqs, freq_mask, bands = _check_csd_bands(fmin, fmax, n_fft, sfreq, fsum)
     window_fun, eigvals, n_tapers, mt_adaptive = _compute_csd_params(
         n_times, sfreq, mode, mt_bandwidth, mt_low_bias, mt_adaptive)
-
-    csds_mean = np.zeros((n_series, n_series, n_freqs), dtype=complex)
-
-    # Picking frequencies of interest
-    freq_mask_mt = freq_mask[orig_freqs >= 0]
-
-    # Compute CSD for each trial
-    for xi in X:
-
-        csds_trial = _csd_array(xi, sfreq, window_fun, eigvals, freq_mask,
-                                freq_mask_mt, n_fft, mode, mt_adaptive)
-
-        # Scaling by number of trials and compensating for loss of power due
-        # to windowing (see section 11.5.2 in Bendat & Piersol).
-        if mode == 'fourier':
-            csds_trial /= n_times
-            csds_trial *= 8 / 3.
-
-        # Scaling by sampling frequency for compatibility with Matlab
-        csds_trial /= sfreq
-
-        csds_mean += csds_trial
-
-    csds_mean /= n_replicates
-
-    logger.info('[done]')
-
-    # Summing over frequencies of interest or returning a list of separate CSD
-    # matrices for each frequency
-    if fsum is True:
-        csds_mean = np.sum(csds_mean, 2)
-
-    return csds_mean, freqs
+    n_tapers = 1 if n_tapers is None else n_tapers
+
+    # Epochs are transformed by chunks, whose tapered spectra take about
+    # _CSD_WORKSPACE_SIZE elements, and the CSD of each chunk is added to
+    # the CSD matrices of the frequencies (or bands) of interest in place
+    n_chunk = max(_CSD_WORKSPACE_SIZE // (n_channels * n_tapers * n_fft), 1)
+    parallel, my_csd_chunk, n_jobs = parallel_func(_csd_chunk, n_jobs)
+    n_out = len(freqs) if bands is None else len(bands)
+    csds = np.zeros((n_out, n_channels, n_channels), dtype)
+    args = (sfreq, window_fun, eigvals, freq_mask, n_fft, mode, mt_adaptive,
+            bands, dtype)
+    n_epochs = 0
+    chunks = list()
+    for chunk in _iter_epoch_chunks(data, n_chunk, n_channels, n_times):
+        n_epochs += len(chunk)
+        chunks.append(chunk)
+        if len(chunks) == n_jobs:
+            _add_csd_chunks(csds, parallel, my_csd_chunk, chunks, args)
+            chunks = list()
+    if len(chunks) > 0:
+        _add_csd_chunks(csds, parallel, my_csd_chunk, chunks, args)
+    if n_epochs == 0:
+        raise ValueError('No epochs to compute the cross-spectral density '
+                         'from')
+
+    # Make the matrices exactly Hermitian (the products do not guarantee it),
+    # scale by number of epochs and sampling frequency (for compatibility
+    # with Matlab) and in fourier mode by number of samples, compensating for
+    # loss of power due to windowing (see section 11.5.2 in Bendat & Piersol)
+    csds = csds + csds.conj().transpose(0, 2, 1)
+    scale = 1. / (n_epochs * sfreq)
+    if mode == 'fourier':
+        scale *= 8 / (3. * n_times)
+    csds *= scale
+    return csds, freqs, bands
+
+
+def _add_csd_chunks(csds, parallel, my_csd_chunk, chunks, args):
+    """Add the CSD of chunks of epochs, computed in parallel, in place."""
+    for csd in parallel(my_csd_chunk(chunk, *args) for chunk in chunks):
+        csds += csd
+
+
+def _iter_epoch_chunks(data, n_chunk, n_channels, n_times):
+    """Yield arrays of at most n_chunk epochs from an array or iterable."""
+    if isinstance(data, np.ndarray):
+        for start in range(0, len(data), n_chunk):
+            yield data[start:start + n_chunk]
+        return
+    chunk = list()
+    for epoch in data:
+        if epoch.shape != (n_channels, n_times):
+            raise ValueError('All epochs must have shape %s, got %s'
+                             % ((n_channels, n_times), epoch.shape))
+        chunk.append(epoch)
+        if len(chunk) == n_chunk:
+            yield np.array(chunk)
+            chunk = list()
+    if len(chunk) > 0:
+        yield np.array(chunk)
 
 
 def _compute_csd_params(n_times, sfreq, mode, mt_bandwidth, mt_low_bias,
@@ -390,38 +451,42 @@ def _compute_csd_params(n_times, sfreq, mode, mt_bandwidth, mt_low_bias,
     return window_fun, eigvals, n_tapers, ret_mt_adaptive
 
 
-def _csd_array(x, sfreq, window_fun, eigvals, freq_mask, freq_mask_mt, n_fft,
-               mode, mt_adaptive):
-    """Calculate Fourier transform using multitaper module.
+def _csd_chunk(X, sfreq, window_fun, eigvals, freq_mask, n_fft, mode,
+               mt_adaptive, bands, dtype):
+    """Compute the summed (half) CSD matrices of a chunk of epochs.
 
-    The arguments correspond to the values in `compute_csd_epochs` and
-    `csd_array`.
+    The arguments correspond to the values in `_csd_epochs_stream`. The
+    matrices are not scaled, and returned with shape
+    (n_freqs or n_bands, n_channels, n_channels).
     """
-    x_mt, _ = _mt_spectra(x, window_fun, sfreq, n_fft)
+    n_epochs, n_channels = X.shape[:2]
+    x_mt, _ = _mt_spectra(X.reshape(n_epochs * n_channels, -1), window_fun,
+                          sfreq, n_fft)
 
+    # Weighted spectra y normalized such that, as in _csd_from_mt(), the CSD
+    # of signals x and y is 2 * (y_x . y_y^H), summed over tapers (the factor
+    # 2 comes from making the accumulated matrices Hermitian)
     if mt_adaptive:
-        # Compute adaptive weights
         _, weights = _psd_from_mt_adaptive(x_mt, eigvals, freq_mask,
                                            return_weights=True)
-        # Tiling weights so that we can easily use _csd_from_mt()
-        weights = weights[:, np.newaxis, :, :]
-        weights = np.tile(weights, [1, x_mt.shape[0], 1, 1])
+        weights /= np.sqrt((weights * weights).sum(axis=1, keepdims=True))
+    elif mode == 'multitaper':
+        weights = np.sqrt(eigvals / np.sum(eigvals))[:, np.newaxis]
     else:
-        # Do not use adaptive weights
-        if mode == 'multitaper':
-            weights = np.sqrt(eigvals)[np.newaxis, np.newaxis, :, np.newaxis]
-        else:
-            # Hack so we can sum over axis=-2
-            weights = np.array([1.])[:, np.newaxis, np.newaxis, np.newaxis]
-
-    x_mt = x_mt[:, :, freq_mask_mt]
-
-    # Calculating CSD
-    # Tiling x_mt so that we can easily use _csd_from_mt()
-    x_mt = x_mt[:, np.newaxis, :, :]
-    x_mt = np.tile(x_mt, [1, x_mt.shape[0], 1, 1])
-    y_mt = np.transpose(x_mt, axes=[1, 0, 2, 3])
-    weights_y = np.transpose(weights, axes=[1, 0, 2, 3])
-    csds = _csd_from_mt(x_mt, y_mt, weights, weights_y)
-
-    return csds
+        weights = 1.
+    y = x_mt[:, :, freq_mask]
+    y *= weights
+    n_freqs = y.shape[-1]
+    y = y.reshape(n_epochs, n_channels, -1, n_freqs).astype(dtype, copy=False)
+    y = y.transpose(1, 0, 2, 3)  # channels, epochs, tapers, freqs
+
+    if bands is None:
+        # One batched matrix product over frequencies
+        y = y.reshape(n_channels, -1, n_freqs).transpose(2, 0, 1)
+        return np.matmul(y, y.conj().transpose(0, 2, 1))
+    # Summing over each band (and over epochs and tapers) in a single product
+    csd = np.empty((len(bands), n_channels, n_channels), dtype)
+    for csd_band, band in zip(csd, bands):
+        y_band = y[..., band].reshape(n_channels, -1)
+        np.dot(y_band, y_band.conj().T, out=csd_band)
+    return csd
@@ -3,11 +3,19 @@
 
 # Parts of this code were copied from NiTime http://nipy.sourceforge.net/nitime
 
+from hashlib import sha1
+import os
+import os.path as op
+import tempfile
+
 import numpy as np
 from scipy import linalg
 
 from ..parallel import parallel_func
-from ..utils import sum_squared, warn, verbose
+from ..utils import (sum_squared, warn, verbose, logger, get_config,
+                     _LRUCache)
+
+_dpss_cache = _LRUCache('MNE_DPSS_CACHE_SIZE', 32)
 
 
 def tridisolve(d, e, b, overwrite_b=True):
@@ -141,7 +149,111 @@ def dpss_windows(N, half_nbw, Kmax, low_bias=True, interp_from=None,
     Slepian, D. Prolate spheroidal wave functions, Fourier analysis, and
     uncertainty V: The discrete case. Bell System Technical Journal,
     Volume 57 (1978), 1371430
+
+    The windows and eigenvalues are cached in memory (keyed by ``N``,
+    ``half_nbw``, ``Kmax``, ``interp_from`` and ``interp_kind``) and reused
+    by all multitaper functions. The maximum number of cached entries can be
+    set with the ``MNE_DPSS_CACHE_SIZE`` config value (default 32, use 0 to
+    disable caching). If the ``MNE_DPSS_CACHE_DIR`` config value is set to
+    an existing directory, the windows are also stored there and reused
+    across sessions.
+    """
+    key = (int(N), float(half_nbw), int(Kmax), interp_from, interp_kind)
+    dpss, eigvals = _dpss_cache.get(key, lambda: _get_dpss(*key))
+    if low_bias:
+        idx = (eigvals > 0.9)
+        if not idx.any():
+            warn('Could not properly use low_bias, keeping lowest-bias taper')
+            idx = [np.argmax(eigvals)]
+        dpss, eigvals = dpss[idx], eigvals[idx]
+    else:
+        dpss, eigvals = dpss.copy(), eigvals.copy()
+    assert len(dpss) > 0  # should never happen
+    assert dpss.shape[1] == N  # old nitime bug
+    return dpss, eigvals
+
+
+def get_dpss_cache_info():
+    """Get statistics about the cache of DPSS windows.
+
+    See :func:`dpss_windows` for details about caching.
+
+    Returns
+    -------
+    info : dict
+        The number of cache ``'hits'``, cache ``'misses'`` and the current
+        number of entries (``'size'``).
+
+    See Also
+    --------
+    clear_dpss_cache
+
+    Notes
+    -----
+    .. versionadded:: 0.16
+    """
+    return _dpss_cache.info
+
+
+def clear_dpss_cache():
+    """Clear the in-memory cache of DPSS windows and reset its statistics.
+
+    See Also
+    --------
+    get_dpss_cache_info
+
+    Notes
+    -----
+    .. versionadded:: 0.16
     """
+    _dpss_cache.clear()
+
+
+def _get_dpss(N, half_nbw, Kmax, interp_from, interp_kind):
+    """Get DPSS windows from the disk cache or compute them."""
+    cache_fname = _get_dpss_cache_fname(N, half_nbw, Kmax, interp_from,
+                                        interp_kind)
+    if cache_fname is not None and op.isfile(cache_fname):
+        try:
+            with np.load(cache_fname) as npz:
+                return npz['dpss'], npz['eigvals']
+        except Exception as exp:  # corrupt or incompatible, recompute
+            logger.debug('    Could not read DPSS cache %s (%s)'
+                         % (cache_fname, exp))
+    dpss, eigvals = _compute_dpss(N, half_nbw, Kmax, interp_from,
+                                  interp_kind)
+    if cache_fname is not None:
+        try:
+            fd, tmp_fname = tempfile.mkstemp(dir=op.dirname(cache_fname),
+                                             suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fid:
+                np.savez(fid, dpss=dpss, eigvals=eigvals)
+            if op.isfile(cache_fname):  # another process wrote it meanwhile
+                os.remove(tmp_fname)
+            else:
+                os.rename(tmp_fname, cache_fname)
+        except (IOError, OSError) as exp:
+            logger.debug('    Could not write DPSS cache %s (%s)'
+                         % (cache_fname, exp))
+    return dpss, eigvals
+
+
+def _get_dpss_cache_fname(N, half_nbw, Kmax, interp_from, interp_kind):
+    """Get the disk cache file of DPSS windows (None if not cached)."""
+    cache_dir = get_config('MNE_DPSS_CACHE_DIR', None)
+    if cache_dir is None:
+        return None
+    if not op.isdir(cache_dir):
+        logger.debug('    MNE_DPSS_CACHE_DIR %s does not exist, not using '
+                     'the DPSS cache' % cache_dir)
+        return None
+    key = sha1(repr((N, half_nbw, Kmax, interp_from, interp_kind)
+                    ).encode('utf-8')).hexdigest()
+    return op.join(cache_dir, key + '-dpss.npz')
+
+
+def _compute_dpss(N, half_nbw, Kmax, interp_from, interp_kind):
+    """Compute DPSS windows and eigenvalues without low bias selection."""
     from scipy import interpolate
     from ..filter import next_fast_len
     Kmax = int(Kmax)
@@ -236,15 +348,6 @@ def dpss_windows(N, half_nbw, Kmax, low_bias=True, interp_from=None,
     r = 4 * W * np.sinc(2 * W * nidx)
     r[0] = 2 * W
     eigvals = np.dot(dpss_rxx, r)
-
-    if low_bias:
-        idx = (eigvals > 0.9)
-        if not idx.any():
-            warn('Could not properly use low_bias, keeping lowest-bias taper')
-            idx = [np.argmax(eigvals)]
-        dpss, eigvals = dpss[idx], eigvals[idx]
-    assert len(dpss) > 0  # should never happen
-    assert dpss.shape[1] == N  # old nitime bug
     return dpss, eigvals
 
 
@@ -289,70 +392,78 @@ def _psd_from_mt_adaptive(x_mt, eigvals, freq_mask, max_iter=150,
 
     rt_eig = np.sqrt(eigvals)
 
+    # the weights are real, so the iterations only need the power of the
+    # tapered spectra, flattened to (n_tapers, n_signals * n_freqs)
+    x_pow = x_mt.real ** 2
+    x_pow += x_mt.imag ** 2
+
     # estimate the variance from an estimate with fixed weights
-    psd_est = _psd_from_mt(x_mt, rt_eig[np.newaxis, :, np.newaxis])
+    psd_est = 2 * np.dot(eigvals, x_pow) / eigvals.sum()
     x_var = np.trapz(psd_est, dx=np.pi / n_freqs) / (2 * np.pi)
     del psd_est
 
-    # allocate space for output
-    psd = np.empty((n_signals, np.sum(freq_mask)))
-
     # only keep the frequencies of interest
-    x_mt = x_mt[:, :, freq_mask]
-
-    if return_weights:
-        weights = np.empty((n_signals, n_tapers, psd.shape[1]))
-
-    for i, (xk, var) in enumerate(zip(x_mt, x_var)):
-        # combine the SDFs in the traditional way in order to estimate
-        # the variance of the timeseries
-
-        # The process is to iteratively switch solving for the following
-        # two expressions:
-        # (1) Adaptive Multitaper SDF:
-        # S^{mt}(f) = [ sum |d_k(f)|^2 S_k(f) ]/ sum |d_k(f)|^2
-        #
-        # (2) Weights
-        # d_k(f) = [sqrt(lam_k) S^{mt}(f)] / [lam_k S^{mt}(f) + E{B_k(f)}]
-        #
-        # Where lam_k are the eigenvalues corresponding to the DPSS tapers,
-        # and the expected value of the broadband bias function
-        # E{B_k(f)} is replaced by its full-band integration
-        # (1/2pi) int_{-pi}^{pi} E{B_k(f)} = sig^2(1-lam_k)
-
-        # start with an estimate from incomplete data--the first 2 tapers
-        psd_iter = _psd_from_mt(xk[:2, :], rt_eig[:2, np.newaxis])
-
-        err = np.zeros_like(xk)
-        for n in range(max_iter):
-            d_k = (psd_iter / (eigvals[:, np.newaxis] * psd_iter +
-                   (1 - eigvals[:, np.newaxis]) * var))
-            d_k *= rt_eig[:, np.newaxis]
-            # Test for convergence -- this is overly conservative, since
-            # iteration only stops when all frequencies have converged.
-            # A better approach is to iterate separately for each freq, but
-            # that is a nonvectorized algorithm.
-            # Take the RMS difference in weights from the previous iterate
-            # across frequencies. If the maximum RMS error across freqs is
-            # less than 1e-10, then we're converged
-            err -= d_k
-            if np.max(np.mean(err ** 2, axis=0)) < 1e-10:
-                break
-
-            # update the iterative estimate with this d_k
-            psd_iter = _psd_from_mt(xk, d_k)
-            err = d_k
-
-        if n == max_iter - 1:
-            warn('Iterative multi-taper PSD computation did not converge.')
-
-        psd[i, :] = psd_iter
-
-        if return_weights:
-            weights[i, :, :] = d_k
-
+    x_pow = x_pow[:, :, freq_mask]
+    n_freqs = x_pow.shape[2]
+    x_pow = x_pow.transpose(1, 0, 2).reshape(n_tapers, -1)
+
+    # The process is to iteratively switch solving for the following
+    # two expressions:
+    # (1) Adaptive Multitaper SDF:
+    # S^{mt}(f) = [ sum |d_k(f)|^2 S_k(f) ]/ sum |d_k(f)|^2
+    #
+    # (2) Weights
+    # d_k(f) = [sqrt(lam_k) S^{mt}(f)] / [lam_k S^{mt}(f) + E{B_k(f)}]
+    #
+    # Where lam_k are the eigenvalues corresponding to the DPSS tapers,
+    # and the expected value of the broadband bias function
+    # E{B_k(f)} is replaced by its full-band integration
+    # (1/2pi) int_{-pi}^{pi} E{B_k(f)} = sig^2(1-lam_k)
+    #
+    # All signals and frequencies are iterated at once, each (signal, freq)
+    # pair being removed from the iteration once the RMS difference of its
+    # weights from the previous iterate is less than 1e-10.
+    bias = np.outer(1 - eigvals, np.repeat(x_var, n_freqs))
+    eigvals = eigvals[:, np.newaxis]
+    rt_eig = rt_eig[:, np.newaxis]
+
+    # start with an estimate from incomplete data--the first 2 tapers
+    psd = 2 * np.dot(eigvals[:2, 0], x_pow[:2]) / eigvals[:2, 0].sum()
+    weights = np.empty(x_pow.shape)
+    active = np.arange(psd.size)
+    x_active, bias_active, d_prev = x_pow, bias, 0.
+    for n in range(max_iter):
+        psd_iter = psd[active]
+        d_k = eigvals * psd_iter
+        d_k += bias_active
+        np.divide(psd_iter, d_k, out=d_k)
+        d_k *= rt_eig
+        err = d_prev - d_k
+        err *= err
+        converged = err.sum(axis=0) < 1e-10 * n_tapers
+        del err
+        weights[:, active[converged]] = d_k[:, converged]
+        if converged.all():
+            active = active[:0]
+            break
+        if converged.any():
+            keep = ~converged
+            active, d_k = active[keep], d_k[:, keep]
+            x_active, bias_active = x_active[:, keep], bias_active[:, keep]
+        # update the iterative estimate with this d_k
+        d_prev = d_k
+        d_k = d_k * d_k
+        psd_iter = np.einsum('ij,ij->j', d_k, x_active)
+        psd_iter /= d_k.sum(axis=0)
+        psd[active] = 2 * psd_iter
+    if len(active) > 0:
+        warn('Iterative multi-taper PSD computation did not converge.')
+        weights[:, active] = d_prev
+
+    psd.shape = (n_signals, n_freqs)
     if return_weights:
-        return psd, weights
+        weights = weights.reshape(n_tapers, n_signals, n_freqs)
+        return psd, weights.transpose(1, 0, 2)
     else:
         return psd
 
@@ -3,18 +3,91 @@
 # License : BSD 3-clause
 
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from scipy.signal import get_window
 
 from ..parallel import parallel_func
 from ..io.pick import _pick_data_channels
 from ..utils import logger, verbose, _time_mask
-from ..fixes import get_spectrogram
 from .multitaper import psd_array_multitaper
 
+# Number of FFT samples of the Welch segments transformed at once
+_WELCH_WORKSPACE_SIZE = 2 ** 16
+# Number of samples (times channels) of non-preloaded Raw read at once
+_WELCH_READ_SIZE = 2 ** 22
 
-def _psd_func(epoch, noverlap, n_per_seg, nfft, fs, freq_mask, func):
+
+def _welch_segments(x, n_per_seg, n_overlap):
+    """Get a strided view of the overlapping segments of each row of x."""
+    step = n_per_seg - n_overlap
+    n_segments = max((x.shape[-1] - n_overlap) // step, 0)
+    strides = x.strides[:-1] + (step * x.strides[-1], x.strides[-1])
+    return as_strided(x, x.shape[:-1] + (n_segments, n_per_seg), strides,
+                      writeable=False)
+
+
+def _welch_power(x, n_per_seg, n_overlap, n_fft, sfreq, freq_mask):
+    """Compute the periodograms of the segments of each row of x.
+
+    The segments are detrended (mean removed), windowed with a Hamming
+    window and scaled as a one-sided power spectral density, as done by
+    :func:`scipy.signal.spectrogram`. Segments containing NaN give NaN.
+    """
+    window = get_window('hamming', n_per_seg)
+    # one-sided density scaling, the DC (and Nyquist) terms are not doubled
+    scale = np.full(n_fft // 2 + 1, 2. / (sfreq * np.sum(window ** 2)))
+    scale[0] /= 2.
+    if n_fft % 2 == 0:
+        scale[-1] /= 2.
+    scale = scale[freq_mask]
+    segments = _welch_segments(x, n_per_seg, n_overlap)
+    n_rows, n_segments = segments.shape[:2]
+    power = np.empty((n_rows, n_segments, freq_mask.sum()))
+    # chunks of segments (of several rows if they have few segments)
+    n_seg_chunk = max(min(_WELCH_WORKSPACE_SIZE // n_fft, n_segments), 1)
+    n_row_chunk = max(_WELCH_WORKSPACE_SIZE // (n_seg_chunk * n_fft), 1)
+    for row in range(0, n_rows, n_row_chunk):
+        for seg in range(0, n_segments, n_seg_chunk):
+            idx = (slice(row, row + n_row_chunk),
+                   slice(seg, seg + n_seg_chunk))
+            this_x = segments[idx]
+            this_x = this_x - this_x.mean(axis=-1, keepdims=True)
+            this_x *= window
+            spectrum = np.fft.rfft(this_x, n_fft)[..., freq_mask]
+            this_power = spectrum.real ** 2
+            this_power += spectrum.imag ** 2
+            this_power *= scale
+            power[idx] = this_power
+    return power
+
+
+def _median_bias(n):
+    """Get the bias of the median of n periodograms relative to the mean."""
+    ii_2 = 2 * np.arange(1., (n - 1) // 2 + 1)
+    return 1 + np.sum(1. / (ii_2 + 1) - 1. / ii_2)
+
+
+def _average_welch(power, average):
+    """Average periodograms of shape (n_rows, n_segments, n_freqs)."""
+    if average == 'mean':
+        psds = power.mean(axis=1)
+        # only rows with invalid segments need the slower NaN-aware mean
+        bad = np.isnan(psds).any(axis=-1)
+        if bad.any():
+            psds[bad] = np.nanmean(power[bad], axis=1)
+        return psds
+    psds = np.nanmedian(power, axis=1)
+    # correct for the bias of the median, given the number of valid segments
+    n_valid = np.sum(~np.isnan(power).any(axis=-1), axis=1)
+    for n in np.unique(n_valid):
+        psds[n_valid == n] /= _median_bias(n)
+    return psds
+
+
+def _psd_func(x, n_per_seg, n_overlap, n_fft, sfreq, freq_mask, average):
     """Aux function."""
-    return func(epoch, fs=fs, nperseg=n_per_seg, noverlap=noverlap,
-                nfft=nfft, window='hamming')[2][..., freq_mask, :]
+    return _average_welch(_welch_power(x, n_per_seg, n_overlap, n_fft,
+                                       sfreq, freq_mask), average)
 
 
 def _check_nfft(n, n_fft, n_per_seg, n_overlap):
@@ -64,7 +137,7 @@ def _check_psd_data(inst, tmin, tmax, picks, proj, reject_by_annotation=False):
 
 @verbose
 def psd_array_welch(x, sfreq, fmin=0, fmax=np.inf, n_fft=256, n_overlap=0,
-                    n_per_seg=None, n_jobs=1, verbose=None):
+                    n_per_seg=None, n_jobs=1, average='mean', verbose=None):
     """Compute power spectral density (PSD) using Welch's method.
 
     Parameters
@@ -88,6 +161,12 @@ def psd_array_welch(x, sfreq, fmin=0, fmax=np.inf, n_fft=256, n_overlap=0,
         to None, which sets n_per_seg equal to n_fft.
     n_jobs : int
         Number of CPUs to use in the computation.
+    average : 'mean' | 'median'
+        How to average the periodograms of the segments. 'median' is robust
+        to transient artifacts and is corrected for its bias relative to the
+        mean. Segments containing NaN are ignored. Defaults to 'mean'.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -104,39 +183,83 @@ def psd_array_welch(x, sfreq, fmin=0, fmax=np.inf, n_fft=256, n_overlap=0,
     -----
     .. versionadded:: 0.14.0
     """
-    spectrogram = get_spectrogram()
     dshape = x.shape[:-1]
     n_times = x.shape[-1]
     x = x.reshape(-1, n_times)
 
     # Prep the PSD
+    n_fft, n_per_seg, n_overlap, freqs, freq_mask = _prep_welch(
+        n_times, sfreq, fmin, fmax, n_fft, n_overlap, n_per_seg, average)
+
+    # Parallelize across first N-1 dimensions, each job transforming all the
+    # segments of its rows at once (in chunks of bounded size)
+    parallel, my_psd_func, n_jobs = parallel_func(_psd_func, n_jobs=n_jobs)
+    x_splits = np.array_split(x, n_jobs)
+    psds = parallel(my_psd_func(d, n_per_seg, n_overlap, n_fft, sfreq,
+                                freq_mask, average) for d in x_splits)
+
+    # Combining and reshaping to original data shape
+    psds = np.concatenate(psds, axis=0)
+    psds.shape = dshape + (-1,)
+    return psds, freqs
+
+
+def _prep_welch(n_times, sfreq, fmin, fmax, n_fft, n_overlap, n_per_seg,
+                average):
+    """Check the Welch parameters and get the frequencies of interest."""
+    if average not in ('mean', 'median'):
+        raise ValueError('average must be "mean" or "median", got %s'
+                         % (average,))
     n_fft, n_per_seg, n_overlap = _check_nfft(n_times, n_fft, n_per_seg,
                                               n_overlap)
     win_size = n_fft / float(sfreq)
     logger.info("Effective window size : %0.3f (s)" % win_size)
     freqs = np.arange(n_fft // 2 + 1, dtype=float) * (sfreq / n_fft)
     freq_mask = (freqs >= fmin) & (freqs <= fmax)
-    freqs = freqs[freq_mask]
+    return n_fft, n_per_seg, n_overlap, freqs[freq_mask], freq_mask
 
-    # Parallelize across first N-1 dimensions
-    parallel, my_psd_func, n_jobs = parallel_func(_psd_func, n_jobs=n_jobs)
-    x_splits = np.array_split(x, n_jobs)
-    f_spectrogram = parallel(my_psd_func(d, noverlap=n_overlap, nfft=n_fft,
-                                         fs=sfreq, freq_mask=freq_mask,
-                                         func=spectrogram, n_per_seg=n_per_seg)
-                             for d in x_splits)
-
-    # Combining, reducing windows and reshaping to original data shape
-    psds = np.concatenate([np.nanmean(f_s, axis=-1)
-                           for f_s in f_spectrogram], axis=0)
-    psds.shape = dshape + (-1,)
-    return psds, freqs
+
+def _psd_welch_raw_stream(raw, picks, start, stop, reject_by_annotation,
+                          n_fft, n_overlap, n_per_seg, freq_mask, average,
+                          sfreq):
+    """Compute the Welch periodograms of non-preloaded Raw a block at a time.
+
+    With average='mean' the periodograms are summed as they are computed,
+    so memory does not depend on the length of the data, and the sums and
+    numbers of valid segments are returned. Otherwise the periodograms are
+    returned.
+    """
+    step = n_per_seg - n_overlap
+    n_segments = max((stop - start - n_overlap) // step, 0)
+    n_block = max(_WELCH_READ_SIZE // (len(picks) * step), 1)
+    rba = 'NaN' if reject_by_annotation else None
+    n_freqs = freq_mask.sum()
+    power_sum = np.zeros((len(picks), n_freqs))
+    n_valid = np.zeros((len(picks), 1))
+    powers = [np.empty((len(picks), 0, n_freqs))]
+    for first in range(0, n_segments, n_block):
+        this_n = min(n_block, n_segments - first)
+        this_start = start + first * step
+        data = raw.get_data(picks, this_start,
+                            this_start + this_n * step + n_overlap,
+                            reject_by_annotation=rba)
+        power = _welch_power(data, n_per_seg, n_overlap, n_fft, sfreq,
+                             freq_mask)
+        if average == 'mean':
+            valid = ~np.isnan(power).any(axis=-1)[:, :, np.newaxis]
+            power_sum += np.where(valid, power, 0.).sum(axis=1)
+            n_valid += valid.sum(axis=1)
+        else:
+            powers.append(power)
+    if average == 'mean':
+        return power_sum, n_valid
+    return np.concatenate(powers, axis=1)
 
 
 @verbose
 def psd_welch(inst, fmin=0, fmax=np.inf, tmin=None, tmax=None, n_fft=256,
               n_overlap=0, n_per_seg=None, picks=None, proj=False, n_jobs=1,
-              reject_by_annotation=True, verbose=None):
+              reject_by_annotation=True, average='mean', verbose=None):
     """Compute the power spectral density (PSD) using Welch's method.
 
     Calculates periodograms for a sliding window over the time dimension, then
@@ -179,6 +302,12 @@ def psd_welch(inst, fmin=0, fmax=np.inf, tmin=None, tmax=None, n_fft=256,
         Evoked object. Defaults to True.
 
         .. versionadded:: 0.15.0
+    average : 'mean' | 'median'
+        How to average the periodograms of the segments. 'median' is robust
+        to transient artifacts and is corrected for its bias relative to the
+        mean. Segments containing NaN are ignored. Defaults to 'mean'.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -199,14 +328,58 @@ def psd_welch(inst, fmin=0, fmax=np.inf, tmin=None, tmax=None, n_fft=256,
 
     Notes
     -----
+    Raw data that are not preloaded are read and transformed a block at a
+    time, without loading all of them in memory. With ``n_jobs > 1``, each
+    job reads and transforms its own span of time.
+
     .. versionadded:: 0.12.0
     """
+    from ..io.base import BaseRaw
+    if isinstance(inst, BaseRaw) and not inst.preload:
+        return _psd_welch_raw(inst, fmin, fmax, tmin, tmax, n_fft, n_overlap,
+                              n_per_seg, picks, proj, n_jobs,
+                              reject_by_annotation, average)
     # Prep data
     data, sfreq = _check_psd_data(inst, tmin, tmax, picks, proj,
                                   reject_by_annotation=reject_by_annotation)
     return psd_array_welch(data, sfreq, fmin=fmin, fmax=fmax, n_fft=n_fft,
                            n_overlap=n_overlap, n_per_seg=n_per_seg,
-                           n_jobs=n_jobs, verbose=verbose)
+                           n_jobs=n_jobs, average=average, verbose=verbose)
+
+
+def _psd_welch_raw(raw, fmin, fmax, tmin, tmax, n_fft, n_overlap, n_per_seg,
+                   picks, proj, n_jobs, reject_by_annotation, average):
+    """Compute the Welch PSD of non-preloaded Raw data."""
+    time_mask = _time_mask(raw.times, tmin, tmax, sfreq=raw.info['sfreq'])
+    if picks is None:
+        picks = _pick_data_channels(raw.info, with_ref_meg=False)
+    if proj:
+        # Copy first so it's not modified, projections are applied on read
+        raw = raw.copy().apply_proj()
+    sfreq = raw.info['sfreq']
+    start, stop = np.where(time_mask)[0][[0, -1]]
+    n_fft, n_per_seg, n_overlap, freqs, freq_mask = _prep_welch(
+        stop + 1 - start, sfreq, fmin, fmax, n_fft, n_overlap, n_per_seg,
+        average)
+    # Parallelize across contiguous spans of segments, each job reading and
+    # transforming its own span a block at a time
+    step = n_per_seg - n_overlap
+    n_segments = max((stop + 1 - start - n_overlap) // step, 0)
+    parallel, my_stream, n_jobs = parallel_func(_psd_welch_raw_stream,
+                                                n_jobs=n_jobs)
+    spans = [(s[0], s[-1] + 1) for s in
+             np.array_split(np.arange(n_segments), n_jobs) if len(s) > 0]
+    out = parallel(my_stream(raw, picks, start + first * step,
+                             start + last * step + n_overlap,
+                             reject_by_annotation, n_fft, n_overlap,
+                             n_per_seg, freq_mask, average, sfreq)
+                   for first, last in spans or [(0, 0)])
+    if average == 'mean':
+        with np.errstate(invalid='ignore'):
+            psds = sum(o[0] for o in out) / sum(o[1] for o in out)
+    else:
+        psds = _average_welch(np.concatenate(out, axis=1), average)
+    return psds, freqs
 
 
 @verbose
@@ -1,6 +1,6 @@
 import numpy as np
 from nose.tools import assert_raises, assert_equal, assert_true
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_allclose
 from os import path as op
 import warnings
 
@@ -9,6 +9,8 @@ import mne
 from mne.io import read_raw_fif
 from mne.utils import sum_squared, run_tests_if_main
 from mne.time_frequency import csd_epochs, csd_array, tfr_morlet
+from mne.time_frequency.multitaper import (_csd_from_mt, _mt_spectra,
+                                           dpss_windows)
 
 warnings.simplefilter('always')
 base_dir = op.join(op.dirname(__file__), '..', '..', 'io', 'tests', 'data')
@@ -257,7 +259,7 @@ def test_compute_csd():
     assert_equal(csds.shape[2], 2)
     assert_equal(len(freqs), 2)
     assert_array_equal(freqs_fsum, freqs)
-    assert_array_equal(csd_fsum, csd_sum)
+    assert_allclose(csd_fsum, csd_sum, rtol=1e-10)
 
 
 def test_csd_on_artificial_data():
@@ -315,4 +317,58 @@ def test_csd_on_artificial_data():
                 assert_true(abs(signal_power_per_sample -
                                 mt_power_per_sample) < delta)
 
+
+def test_csd_bands():
+    """Test computing CSD in frequency bands, in chunks and in parallel."""
+    rng = np.random.RandomState(0)
+    sfreq = 200.
+    X = rng.randn(20, 4, 200)
+    X[:, 1] += 0.5 * X[:, 0]
+
+    # Same CSD as computed pair by pair from the tapered spectra
+    tapers, eigvals = dpss_windows(200, 2., 4)
+    x_mt = np.array([_mt_spectra(x, tapers, sfreq)[0] for x in X])
+    freqs = np.fft.rfftfreq(200, 1. / sfreq)
+    freq_mask = (freqs > 8) & (freqs < 30)
+    x_mt = x_mt[:, :, :, freq_mask]
+    weights = np.sqrt(eigvals)[:, np.newaxis]
+    want = np.mean([[[_csd_from_mt(x[i], x[j], weights, weights)
+                      for j in range(4)] for i in range(4)] for x in x_mt],
+                   axis=0) / sfreq
+    csd, csd_freqs = csd_array(X, sfreq, fmin=8, fmax=30, fsum=False)
+    assert_allclose(csd, want, rtol=1e-10)
+    assert_array_equal(csd_freqs, freqs[freq_mask])
+
+    # One summed CSD per band
+    csd_bands, band_freqs = csd_array(X, sfreq, fmin=[8, 13], fmax=[13, 30])
+    assert_equal(csd_bands.shape, (4, 4, 2))
+    for csd_band, f_lo, f_hi, this_freqs in zip(csd_bands.T, [8, 13],
+                                                [13, 30], band_freqs):
+        mask = (csd_freqs > f_lo) & (csd_freqs < f_hi)
+        assert_array_equal(this_freqs, csd_freqs[mask])
+        assert_allclose(csd_band.T, csd[:, :, mask].sum(-1), rtol=1e-10)
+        assert_array_equal(csd_band, csd_band.T.conj())
+    assert_raises(ValueError, csd_array, X, sfreq, fmin=[8, 13], fmax=[13])
+    assert_raises(ValueError, csd_array, X, sfreq, fmin=[8, 13],
+                  fmax=[13, 13.5])
+
+    # Chunks, parallel jobs and single precision
+    csd_mt, _ = csd_array(X, sfreq, fmin=8, fmax=30, mt_adaptive=True)
+    for kwargs in (dict(n_jobs=2), dict(fmt='single')):
+        csd_other, _ = csd_array(X, sfreq, fmin=8, fmax=30, mt_adaptive=True,
+                                 **kwargs)
+        assert_allclose(csd_other, csd_mt, rtol=1e-5)
+    assert_equal(csd_other.dtype, np.complex64)
+    assert_raises(ValueError, csd_array, X, sfreq, fmt='half')
+
+    # Epochs give one CrossSpectralDensity per band
+    epochs = mne.EpochsArray(X, mne.create_info(4, sfreq, 'eeg'),
+                             baseline=(None, None))
+    csds = csd_epochs(epochs, fmin=[8, 13], fmax=[13, 30], n_jobs=2)
+    assert_equal(len(csds), 2)
+    for this_csd, csd_band, this_freqs in zip(csds, csd_bands.T, band_freqs):
+        assert_allclose(this_csd.data, csd_band.T, rtol=1e-10)
+        assert_array_equal(this_csd.freqs, this_freqs)
+
+
 run_tests_if_main()
@@ -1,13 +1,17 @@
 from distutils.version import LooseVersion
+import os
 import warnings
 
 import numpy as np
-from nose.tools import assert_raises
-from numpy.testing import assert_array_almost_equal
+from nose.tools import assert_raises, assert_equal, assert_true
+from numpy.testing import (assert_array_almost_equal, assert_array_equal,
+                           assert_allclose)
 
-from mne.time_frequency import psd_multitaper
-from mne.time_frequency.multitaper import dpss_windows
-from mne.utils import requires_nitime
+from mne.time_frequency import (psd_multitaper, get_dpss_cache_info,
+                                clear_dpss_cache)
+from mne.time_frequency.multitaper import (dpss_windows, _mt_spectra,
+                                           _psd_from_mt, _psd_from_mt_adaptive)
+from mne.utils import requires_nitime, _TempDir
 from mne.io import RawArray
 from mne import create_info
 
@@ -36,6 +40,71 @@ def test_dpss_windows():
     assert_array_almost_equal(eigs, eigs_ni)
 
 
+def test_dpss_cache():
+    """Test caching of DPSS windows."""
+    clear_dpss_cache()
+    dpss, eigvals = dpss_windows(500, 4., 7, low_bias=False)
+    dpss_lb, eigvals_lb = dpss_windows(500, 4., 7)
+    assert_equal(get_dpss_cache_info(), dict(hits=1, misses=1, size=1))
+    assert_array_equal(dpss_lb, dpss[eigvals > 0.9])
+    # returned windows can be modified without altering the cache
+    dpss *= 0.
+    assert_true(np.all(dpss_windows(500, 4., 7, low_bias=False)[0][0] != 0))
+    # the interpolated windows are based on cached shorter windows
+    dpss_windows(1000, 4., 7, interp_from=500)
+    assert_equal(get_dpss_cache_info(), dict(hits=3, misses=2, size=2))
+
+    # persistent cache
+    tempdir = _TempDir()
+    old_env = dict((key, os.environ.get(key)) for key in
+                   ('MNE_DPSS_CACHE_DIR', 'MNE_DPSS_CACHE_SIZE'))
+    try:
+        os.environ['MNE_DPSS_CACHE_DIR'] = tempdir
+        os.environ['MNE_DPSS_CACHE_SIZE'] = '0'
+        clear_dpss_cache()
+        dpss, eigvals = dpss_windows(300, 2.5, 4)
+        assert_equal(len(os.listdir(tempdir)), 1)
+        dpss_2, eigvals_2 = dpss_windows(300, 2.5, 4)
+        assert_array_equal(dpss, dpss_2)
+        assert_array_equal(eigvals, eigvals_2)
+        assert_equal(get_dpss_cache_info(), dict(hits=0, misses=2, size=0))
+    finally:
+        for key, value in old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    clear_dpss_cache()
+
+
+def test_psd_from_mt_adaptive():
+    """Test adaptive weighting of all signals and frequencies at once."""
+    rng = np.random.RandomState(0)
+    data = rng.randn(6, 400)
+    data[::2] += 10 * np.sin(np.arange(400) * 0.4)
+    dpss, eigvals = dpss_windows(400, 4., 8)
+    x_mt, freqs = _mt_spectra(data, dpss, 100.)
+    freq_mask = (freqs > 5) & (freqs < 40)
+    psd, weights = _psd_from_mt_adaptive(x_mt, eigvals, freq_mask,
+                                         return_weights=True)
+    assert_equal(psd.shape, (6, freq_mask.sum()))
+    assert_equal(weights.shape, (6, len(eigvals), freq_mask.sum()))
+    # the weights are consistent with the PSD and do not depend on the
+    # other signals
+    assert_allclose(_psd_from_mt(x_mt[:, :, freq_mask], weights), psd,
+                    rtol=1e-4)
+    for ii in range(len(data)):
+        assert_allclose(_psd_from_mt_adaptive(x_mt[ii:ii + 1], eigvals,
+                                              freq_mask), psd[ii:ii + 1])
+    # with too few iterations
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        _psd_from_mt_adaptive(x_mt, eigvals, freq_mask, max_iter=2)
+    assert_true(any('did not converge' in str(ww.message) for ww in w))
+    assert_raises(ValueError, _psd_from_mt_adaptive, x_mt, eigvals[:-1],
+                  freq_mask)
+
+
 @requires_nitime
 def test_multitaper_psd():
     """Test multi-taper PSD computation."""
@@ -5,9 +5,10 @@ from numpy.testing import (assert_array_almost_equal, assert_raises,
 from nose.tools import assert_true, assert_equal
 import pytest
 
-from mne import pick_types, Epochs, read_events
+from mne import pick_types, Epochs, read_events, create_info, Annotations
 from mne.io import RawArray, read_raw_fif
-from mne.utils import run_tests_if_main
+from mne.fixes import get_spectrogram
+from mne.utils import run_tests_if_main, _TempDir
 from mne.time_frequency import psd_welch, psd_multitaper, psd_array_welch
 
 base_dir = op.join(op.dirname(__file__), '..', '..', 'io', 'tests', 'data')
@@ -205,4 +206,74 @@ def test_compares_psd():
     assert_true(np.sum(psds_welch < 0) == 0)
     assert_true(np.sum(psds_mpl < 0) == 0)
 
+
+def test_psd_welch_engine():
+    """Test Welch PSD of all segments at once against scipy."""
+    spectrogram = get_spectrogram()
+    rng = np.random.RandomState(0)
+    x = rng.randn(2, 3, 1000)
+    for n_fft, n_per_seg, n_overlap in ((128, None, 0), (255, 200, 50),
+                                        (256, 100, 99)):
+        psds, freqs = psd_array_welch(x, 500., n_fft=n_fft,
+                                      n_per_seg=n_per_seg,
+                                      n_overlap=n_overlap, fmax=200.)
+        n_per_seg = n_fft if n_per_seg is None else n_per_seg
+        freqs_sp, _, spec = spectrogram(x, fs=500., nperseg=n_per_seg,
+                                        noverlap=n_overlap, nfft=n_fft,
+                                        window='hamming')
+        mask = freqs_sp <= 200.
+        assert_allclose(freqs, freqs_sp[mask])
+        assert_allclose(psds, spec[..., mask, :].mean(axis=-1), rtol=1e-10)
+        # the median of many periodograms of white noise is unbiased
+        psds_med, _ = psd_array_welch(x, 500., n_fft=n_fft,
+                                      n_per_seg=n_per_seg,
+                                      n_overlap=n_overlap, fmax=200.,
+                                      average='median')
+        assert_allclose(np.median(psds_med / psds), 1., atol=0.15)
+    # median is robust to a transient artifact
+    x[0, 0, 150] += 1000.
+    psds = [psd_array_welch(x, 500., n_fft=100, average=average)[0]
+            for average in ('mean', 'median')]
+    ratios = [psd[0, 0].mean() / psd[0, 1].mean() for psd in psds]
+    assert_true(ratios[0] > 10)
+    assert_true(0.7 < ratios[1] < 1.5)
+    assert_raises(ValueError, psd_array_welch, x, 500., average='mode')
+    # no frequency bin between fmin and fmax
+    for average in ('mean', 'median'):
+        psds, freqs = psd_array_welch(x, 500., fmin=10.2, fmax=10.3,
+                                      average=average)
+        assert_equal(psds.shape, (2, 3, 0))
+        assert_equal(len(freqs), 0)
+
+
+def test_psd_welch_raw_stream():
+    """Test Welch PSD of non-preloaded Raw."""
+    import mne.time_frequency.psd as psd_mod
+    tempdir = _TempDir()
+    fname = op.join(tempdir, 'test_raw.fif')
+    rng = np.random.RandomState(0)
+    info = create_info(['a', 'b', 'c'], 250., ['eeg', 'eeg', 'stim'])
+    raw = RawArray(rng.randn(3, 10000), info)
+    raw.annotations = Annotations([10.], [2.], ['bad'])
+    raw.save(fname)
+    raw = read_raw_fif(fname)
+    raw_preload = read_raw_fif(fname, preload=True)
+    old_read_size = psd_mod._WELCH_READ_SIZE
+    psd_mod._WELCH_READ_SIZE = 1000  # several blocks
+    try:
+        for kwargs in (dict(), dict(tmin=3., tmax=30., n_overlap=64),
+                       dict(n_fft=200, n_per_seg=150, average='median'),
+                       dict(reject_by_annotation=False, fmin=10., fmax=50.),
+                       dict(n_jobs=2), dict(n_jobs=3, average='median'),
+                       dict(fmin=10.1, fmax=10.2)):
+            psds, freqs = psd_welch(raw, **kwargs)
+            psds_preload, freqs_preload = psd_welch(raw_preload, **kwargs)
+            assert_true(not raw.preload)
+            assert_equal(psds.shape, (2, len(freqs)))
+            assert_allclose(freqs, freqs_preload)
+            assert_allclose(psds, psds_preload, rtol=1e-10)
+    finally:
+        psd_mod._WELCH_READ_SIZE = old_read_size
+
+
 run_tests_if_main()
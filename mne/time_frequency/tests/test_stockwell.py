@@ -12,12 +12,14 @@ from numpy.testing import assert_array_almost_equal, assert_allclose
 
 from scipy import fftpack
 
-from mne import read_events, Epochs
-from mne.io import read_raw_fif
+from mne import read_events, Epochs, create_info
+from mne.io import read_raw_fif, RawArray
+from mne.time_frequency import _stockwell
 from mne.time_frequency._stockwell import (tfr_stockwell, _st,
                                            _precompute_st_windows,
                                            _check_input_st,
-                                           _st_power_itc)
+                                           _st_power_itc,
+                                           tfr_array_stockwell)
 
 from mne.time_frequency.tfr import AverageTFR
 from mne.utils import run_tests_if_main
@@ -121,4 +123,65 @@ def test_stockwell_api():
     assert_true(np.log(power.data.max()) * 20 <= 0.0)
     assert_true(np.log(power.data.max()) * 20 <= 0.0)
 
+
+def test_stockwell_stream():
+    """Test Stockwell TFR of non-preloaded epochs."""
+    rng = np.random.RandomState(0)
+    info = create_info(['a', 'b'], 200., 'eeg')
+    raw = RawArray(rng.randn(2, 5000), info)
+    events = np.array([[ii, 0, 1] for ii in range(200, 4800, 150)])
+    epochs = Epochs(raw, events, tmin=-0.3, tmax=0.5, baseline=None)
+    epochs_preload = epochs.copy().load_data()
+    for n_jobs in (1, 2):
+        power, itc = tfr_stockwell(epochs, fmin=8., fmax=40., decim=2,
+                                   return_itc=True, n_jobs=n_jobs)
+        power_preload, itc_preload = tfr_stockwell(
+            epochs_preload, fmin=8., fmax=40., decim=2, return_itc=True,
+            n_jobs=n_jobs)
+        assert_true(not epochs.preload)
+        assert_equal(power.nave, len(epochs_preload))
+        assert_allclose(power.data, power_preload.data, rtol=1e-10)
+        assert_allclose(itc.data, itc_preload.data, rtol=1e-10)
+        assert_allclose(power.freqs, power_preload.freqs)
+
+
+def test_stockwell_batch():
+    """Test batched and decimated Stockwell transform of channels."""
+    rng = np.random.RandomState(0)
+    data = rng.randn(5, 4, 128)
+    sfreq, start_f, stop_f = 100., 3, 40
+    W = _precompute_st_windows(128, start_f, stop_f, sfreq, 1.)
+    st = _st(data, start_f, W)
+    assert_equal(st.shape, (5, 4, len(W), 128))
+    assert_allclose(st[2, 1], _st(data[2, 1], start_f, W), rtol=1e-10)
+    orig_size = _stockwell._ST_WORKSPACE_SIZE
+    try:
+        for workspace_size in (orig_size, 1000):  # with chunks of freqs
+            _stockwell._ST_WORKSPACE_SIZE = workspace_size
+            for decim in (1, 3, 4):  # decimation in the frequency domain
+                this_st = st[..., ::decim]
+                psd, itc = _st_power_itc(data, start_f, True, 0, decim, W)
+                assert_allclose(psd, np.mean(np.abs(this_st) ** 2, axis=0),
+                                rtol=1e-10)
+                this_itc = np.abs(np.mean(this_st / np.abs(this_st), axis=0))
+                assert_allclose(itc, this_itc, rtol=1e-10)
+                psd_1, itc_1 = _st_power_itc(data[:, 1], start_f, True, 0,
+                                             decim, W)
+                assert_allclose(psd_1, psd[1], rtol=1e-10)
+                assert_allclose(itc_1, itc[1], rtol=1e-10)
+            # zero-padded signals, channels processed in parallel jobs
+            with warnings.catch_warnings(record=True):  # zero padding
+                psd, itc, freqs = tfr_array_stockwell(
+                    data[..., :100], sfreq, fmin=5., fmax=40., decim=4,
+                    return_itc=True, n_jobs=2)
+                psd_1, itc_1, _ = tfr_array_stockwell(
+                    data[:, 1:2, :100], sfreq, fmin=5., fmax=40., decim=4,
+                    return_itc=True)
+            assert_equal(psd.shape, (4, len(freqs), 25))
+            assert_allclose(psd_1[0], psd[1], rtol=1e-10)
+            assert_allclose(itc_1[0], itc[1], rtol=1e-10)
+    finally:
+        _stockwell._ST_WORKSPACE_SIZE = orig_size
+
+
 run_tests_if_main()
@@ -2,7 +2,8 @@ import numpy as np
 import os.path as op
 import warnings
 
-from numpy.testing import assert_array_almost_equal, assert_array_equal
+from numpy.testing import (assert_array_almost_equal, assert_array_equal,
+                           assert_allclose)
 from nose.tools import assert_true, assert_false, assert_equal, assert_raises
 import pytest
 
@@ -13,7 +14,7 @@ from mne.utils import _TempDir, run_tests_if_main, requires_h5py, grand_average
 from mne.time_frequency.tfr import (morlet, tfr_morlet, _make_dpss,
                                     tfr_multitaper, AverageTFR, read_tfrs,
                                     write_tfrs, combine_tfr, cwt, _compute_tfr,
-                                    EpochsTFR)
+                                    EpochsTFR, _tfr_sums, _iter_epochs_chunks)
 from mne.time_frequency import tfr_array_multitaper, tfr_array_morlet
 from mne.viz.utils import _fake_click
 from itertools import product
@@ -588,4 +589,139 @@ def test_compute_tfr():
                                output='avg_power', n_cycles=2.)
             assert_array_equal(shape[1:], out.shape)
 
+
+def test_compute_tfr_fft_blocks():
+    """Test that batched FFT convolutions match time-domain ones."""
+    rng = np.random.RandomState(0)
+    data = rng.randn(5, 2, 301)
+    freqs = np.arange(8., 40., 4.)
+    for method, output, decim in product(
+            ('morlet', 'multitaper'), ('complex', 'power', 'avg_power_itc'),
+            (1, 3, 8, slice(5, 200, 4), slice(None, None, -2))):
+        kwargs = dict(sfreq=250., method=method, output=output,
+                      decim=decim, n_cycles=3.)
+        out_fft = _compute_tfr(data, freqs, use_fft=True, **kwargs)
+        out = _compute_tfr(data, freqs, use_fft=False, **kwargs)
+        assert_allclose(out_fft, out, rtol=1e-6, atol=1e-10)
+    # many epochs are processed in several blocks
+    data = rng.randn(200, 1, 301)
+    out_fft, out = [_compute_tfr(data, freqs, 250., output='avg_power_itc',
+                                 decim=3, n_cycles=3., use_fft=use_fft)
+                    for use_fft in (True, False)]
+    assert_allclose(out_fft, out, rtol=1e-6, atol=1e-10)
+
+
+def test_tfr_stream():
+    """Test averaging the TFRs of non-preloaded epochs chunk by chunk."""
+    rng = np.random.RandomState(0)
+    info = create_info(['a', 'b', 'c'], 200., ['eeg', 'eeg', 'misc'])
+    raw = mne.io.RawArray(rng.randn(3, 5000), info)
+    events = np.array([[ii, 0, 1] for ii in range(200, 4800, 150)])
+    epochs = Epochs(raw, events, tmin=-0.3, tmax=0.5, baseline=None)
+    epochs_preload = epochs.copy().load_data()
+    freqs = np.arange(8., 30., 5.)
+    for func, use_fft, n_jobs in ((tfr_morlet, False, 1),
+                                  (tfr_multitaper, True, 2)):
+        power, itc = func(epochs, freqs, n_cycles=3., use_fft=use_fft,
+                          decim=2, n_jobs=n_jobs)
+        power_preload, itc_preload = func(epochs_preload, freqs,
+                                          n_cycles=3., use_fft=use_fft,
+                                          decim=2, n_jobs=n_jobs)
+        assert_true(not epochs.preload)
+        assert_equal(power.nave, len(epochs_preload))
+        assert_equal(power.ch_names, ['a', 'b'])
+        assert_allclose(power.data, power_preload.data, rtol=1e-10)
+        assert_allclose(itc.data, itc_preload.data, rtol=1e-10)
+
+    # merging the sums of chunks
+    Ws = _make_dpss(200., freqs, n_cycles=3., zero_mean=True)
+    sums = [_tfr_sums(chunk, Ws, True, slice(None), True)
+            for chunk in _iter_epochs_chunks(epochs, [0, 1], 7)]
+    assert_equal([s.n_epochs for s in sums], [7, 7, 7, 7, 3])
+    for this_sums in sums[1:]:
+        sums[0] += this_sums
+    power, itc = sums[0].average()
+    out = _compute_tfr(epochs_preload.get_data()[:, :2], freqs, 200.,
+                       method='multitaper', n_cycles=3.,
+                       output='avg_power_itc')
+    assert_allclose(power, out.real, rtol=1e-10)
+    assert_allclose(itc, out.imag, rtol=1e-10)
+
+
+def test_epochs_tfr_memmap():
+    """Test single-trial TFRs stored in single precision on disk."""
+    tempdir = _TempDir()
+    rng = np.random.RandomState(0)
+    info = create_info(['a', 'b'], 200., 'eeg')
+    epochs = EpochsArray(rng.randn(10, 2, 161), info, tmin=-0.3)
+    freqs = np.arange(8., 30., 5.)
+    power = tfr_morlet(epochs, freqs, n_cycles=3., return_itc=False,
+                       average=False)
+    fname = op.join(tempdir, 'power.dat')
+    power_mm = tfr_morlet(epochs, freqs, n_cycles=3., return_itc=False,
+                          average=False, memmap=fname, fmt='single',
+                          n_jobs=2)
+    assert_true(isinstance(power_mm.data, np.memmap))
+    assert_equal(power_mm.data.dtype, np.float32)
+    assert_allclose(power_mm.data, power.data, rtol=1e-5)
+    assert_raises(ValueError, tfr_morlet, epochs, freqs, n_cycles=3.,
+                  return_itc=False, average=False, fmt='half')
+    cplx = tfr_multitaper(epochs, freqs, n_cycles=3., return_itc=False,
+                          average=False, fmt='single')
+    assert_equal(cplx.data.dtype, np.float32)
+
+    # averages are accumulated in double precision
+    ave = power_mm.average()
+    assert_equal(ave.data.dtype, np.float64)
+    assert_allclose(ave.data, power.average().data, rtol=1e-5)
+
+    # selections and crops of memory-mapped data are views
+    for item in (slice(2, 6), 3, -1, [1, 4], np.arange(10) > 6):
+        assert_allclose(power_mm[item].data, power.data[item].reshape(
+            (-1,) + power.data.shape[1:]), rtol=1e-5)
+    assert_true(isinstance(power_mm[2:6].data, np.memmap))
+    assert_equal(power_mm[3].data.shape, (1,) + power.data.shape[1:])
+    assert_raises(ValueError, power_mm.__getitem__, [True, False])
+    assert_raises(TypeError, power_mm.__getitem__, 'a')
+    power_copy = power_mm.copy()
+    assert_true(not isinstance(power_copy.data, np.memmap))
+    power_mm.crop(-0.1, 0.3)
+    power.crop(-0.1, 0.3)
+    assert_true(isinstance(power_mm.data, np.memmap))
+    assert_allclose(power_mm.data, power.data, rtol=1e-5)
+
+    # baseline correction in place on disk
+    power_mm.apply_baseline((None, 0), mode='logratio')
+    power.apply_baseline((None, 0), mode='logratio')
+    assert_true(isinstance(power_mm.data, np.memmap))
+    assert_allclose(power_mm.data, power.data, rtol=1e-4, atol=1e-6)
+    power_mm.data.flush()
+    on_disk = np.memmap(fname, np.float32, 'r', shape=power_copy.data.shape)
+    assert_array_equal(on_disk[..., 40:121], power_mm.data)
+
+
+@requires_h5py
+def test_read_tfrs_mmap():
+    """Test memory-mapping TFR data when reading."""
+    tempdir = _TempDir()
+    fname = op.join(tempdir, 'test-tfr.h5')
+    info = create_info(['a', 'b', 'c'], 1000., 'mag')
+    data = np.random.RandomState(0).randn(5, 3, 2, 4)
+    tfr = EpochsTFR(info, data=data, times=np.arange(4) / 1000.,
+                    freqs=np.array([10., 20.]), comment='test')
+    tfr.save(fname)
+    tfr2 = read_tfrs(fname, mmap_mode='r')[0]
+    assert_true(isinstance(tfr2.data, np.memmap))
+    assert_array_equal(tfr2.data, tfr.data)
+    assert_array_equal(tfr2.times, tfr.times)
+    assert_equal(tfr2.comment, tfr.comment)
+    assert_allclose(tfr2[1:3].average().data, tfr.data[1:3].mean(0))
+    ave = tfr.average()
+    ave.save(fname, overwrite=True)
+    ave2 = read_tfrs(fname, condition='test', mmap_mode='c')
+    assert_array_equal(ave2.data, ave.data)
+    assert_equal(ave2.nave, 5)
+    assert_raises(ValueError, read_tfrs, fname, mmap_mode='w')
+
+
 run_tests_if_main()
@@ -11,6 +11,7 @@ Morlet code inspired by Matlab code from Sheraz Khan & Brainstorm & SPM
 
 from copy import deepcopy
 from functools import partial
+from itertools import islice
 from math import sqrt
 from warnings import warn
 
@@ -31,6 +32,11 @@ from ..viz.utils import figure_nobar, plt_show, _setup_cmap
 from ..externals.h5io import write_hdf5, read_hdf5
 from ..externals.six import string_types
 
+# Number of complex values of the convolution products computed at once
+_CWT_WORKSPACE_SIZE = 2 ** 18
+# Number of data values of non-preloaded epochs read at once when averaging
+_EPOCHS_CHUNK_SIZE = 2 ** 20
+
 
 # Make wavelet
 
@@ -253,13 +259,69 @@ def _cwt(X, Ws, mode="same", decim=1, use_fft=True):
         yield tfr
 
 
+def _cwt_fft_blocks(X, Ws, decim):
+    """Compute the cwt of blocks of signals with one FFT per signal.
+
+    The FFT of each signal is multiplied by the stacked spectra of all the
+    wavelets at once. For decimation with an integer step, the spectra are
+    folded before the inverse FFT, which then only computes the kept
+    samples. This gives the same result as ``_cwt(X, Ws, 'same', decim)``.
+
+    Parameters
+    ----------
+    X : array of shape (n_signals, n_times)
+        The data.
+    Ws : list of array
+        Wavelets time series.
+    decim : slice
+        The decimation slice.
+
+    Yields
+    ------
+    sl : slice
+        The signals of the block.
+    tfr : array, shape (n_signals_block, n_freqs, n_time_decim)
+        The time-frequency transform of the signals of the block.
+    """
+    n_signals, n_times = X.shape
+    start, stop, step = decim.indices(n_times)
+    if step > 0:
+        n_out = len(range(start, stop, step))
+        post_decim = slice(None)
+    else:  # decimate the full output
+        start, step, n_out = 0, 1, n_times
+        post_decim = decim
+    if any(len(W) > n_times for W in Ws):
+        warn('At least one of the wavelets is longer than the signal. '
+             'Consider padding the signal or using shorter wavelets.')
+    # the output samples to keep are step samples apart, so the FFT length
+    # has to be a multiple of step
+    size = n_times + max(W.size for W in Ws) - 1
+    fsize = step * 2 ** int(np.ceil(np.log2(size / float(step))))
+    # Shift each wavelet to make the first output sample the first sample of
+    # the circular convolution, like _centered followed by decimation
+    fft_Ws = np.empty((len(Ws), fsize), dtype=np.complex128)
+    for ii, W in enumerate(Ws):
+        shift = (W.size - 1) // 2 + start
+        fft_Ws[ii] = fft(W, fsize) * np.exp(2j * np.pi * shift *
+                                            np.arange(fsize) / fsize)
+    n_block = max(_CWT_WORKSPACE_SIZE // (len(Ws) * fsize), 1)
+    for first in range(0, n_signals, n_block):
+        sl = slice(first, min(first + n_block, n_signals))
+        prod = fft(X[sl], fsize)[:, np.newaxis] * fft_Ws
+        if step > 1:  # fold the spectra to get every step-th sample
+            prod = prod.reshape(prod.shape[:2] + (step, -1)).sum(axis=2)
+            prod /= step
+        yield sl, ifft(prod)[..., :n_out][..., post_decim]
+
+
 # Loop of convolution: single trial
 
 
 def _compute_tfr(epoch_data, freqs, sfreq=1.0, method='morlet',
                  n_cycles=7.0, zero_mean=None, time_bandwidth=None,
                  use_fft=True, decim=1, output='complex', n_jobs=1,
-                 verbose=None):
+                 data_buffer=None, fmt='double', verbose=None):
     """Compute time-frequency transforms.
 
     Parameters
@@ -310,6 +372,11 @@ def _compute_tfr(epoch_data, freqs, sfreq=1.0, method='morlet',
     n_jobs : int, defaults to 1
         The number of epochs to process at the same time. The parallelization
         is implemented across channels.
+    data_buffer : str | None, defaults to None
+        If str, the name of a memory-mapped file used to store the single
+        trial outputs ('complex', 'power' or 'phase') instead of memory.
+    fmt : 'double' | 'single', defaults to 'double'
+        The precision of the single trial outputs.
     verbose : bool, str, int, or None, defaults to None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -323,6 +390,9 @@ def _compute_tfr(epoch_data, freqs, sfreq=1.0, method='morlet',
         'avg_power_itc', the real values code for 'avg_power' and the
         imaginary values code for the 'itc': out = avg_power + i * itc
     """
+    if fmt not in ('double', 'single'):
+        raise ValueError('fmt must be "double" or "single", got "%s"'
+                         % (fmt,))
     # Check data
     epoch_data = np.asarray(epoch_data)
     if epoch_data.ndim != 3:
@@ -335,18 +405,8 @@ def _compute_tfr(epoch_data, freqs, sfreq=1.0, method='morlet',
                          time_bandwidth, use_fft, decim, output)
 
     # Setup wavelet
-    if method == 'morlet':
-        W = morlet(sfreq, freqs, n_cycles=n_cycles, zero_mean=zero_mean)
-        Ws = [W]  # to have same dimensionality as the 'multitaper' case
-
-    elif method == 'multitaper':
-        Ws = _make_dpss(sfreq, freqs, n_cycles=n_cycles,
-                        time_bandwidth=time_bandwidth, zero_mean=zero_mean)
-
-    # Check wavelets
-    if len(Ws[0][0]) > epoch_data.shape[2]:
-        raise ValueError('At least one of the wavelets is longer than the '
-                         'signal. Use a longer signal or shorter wavelets.')
+    Ws = _make_tfr_wavelets(method, sfreq, freqs, n_cycles, zero_mean,
+                            time_bandwidth, epoch_data.shape[2])
 
     # Initialize output
     decim = _check_decim(decim)
@@ -359,27 +419,192 @@ def _compute_tfr(epoch_data, freqs, sfreq=1.0, method='morlet',
         # simple dimensionality
         dtype = np.complex
 
-    if ('avg_' in output) or ('itc' in output):
+    average = ('avg_' in output) or ('itc' in output)
+    if average:
         out = np.empty((n_chans, n_freqs, n_times), dtype)
     else:
-        out = np.empty((n_chans, n_epochs, n_freqs, n_times), dtype)
+        if fmt == 'single':
+            dtype = np.complex64 if dtype is np.complex else np.float32
+        out = _allocate_tfr_data(data_buffer,
+                                 (n_epochs, n_chans, n_freqs, n_times), dtype)
 
     # Parallel computation
-    parallel, my_cwt, _ = parallel_func(_time_frequency_loop, n_jobs)
+    parallel, my_cwt, n_jobs = parallel_func(_time_frequency_loop, n_jobs)
 
-    # Parallelization is applied across channels.
-    tfrs = parallel(
-        my_cwt(channel, Ws, output, use_fft, 'same', decim)
-        for channel in epoch_data.transpose(1, 0, 2))
+    # Parallelization is applied across channels. With a memory-mapped
+    # buffer, it is done n_jobs channels at a time so that the single trial
+    # outputs are stored as they are computed instead of held in memory
+    if average or data_buffer is None:
+        groups = [range(n_chans)]
+    else:
+        groups = [range(first, min(first + n_jobs, n_chans))
+                  for first in range(0, n_chans, n_jobs)]
+    for channel_idxs in groups:
+        tfrs = parallel(
+            my_cwt(epoch_data[:, channel_idx], Ws, output, use_fft, 'same',
+                   decim) for channel_idx in channel_idxs)
+        for channel_idx, tfr in zip(channel_idxs, tfrs):
+            if average:
+                out[channel_idx] = tfr
+            else:
+                out[:, channel_idx] = tfr
+    return out
 
-    # FIXME: to avoid overheads we should use np.array_split()
-    for channel_idx, tfr in enumerate(tfrs):
-        out[channel_idx] = tfr
 
-    if ('avg_' not in output) and ('itc' not in output):
-        # This is to enforce that the first dimension is for epochs
-        out = out.transpose(1, 0, 2, 3)
-    return out
+def _allocate_tfr_data(data_buffer, shape, dtype):
+    """Allocate TFR data in memory or in a memory-mapped file."""
+    if isinstance(data_buffer, string_types):
+        return np.memmap(data_buffer, mode='w+', dtype=dtype, shape=shape)
+    elif data_buffer is not None:
+        raise TypeError('data_buffer must be a str or None, got %s'
+                        % (type(data_buffer),))
+    return np.empty(shape, dtype)
+
+
+def _make_tfr_wavelets(method, sfreq, freqs, n_cycles, zero_mean,
+                       time_bandwidth, n_times):
+    """Make the wavelets of each taper for signals of n_times samples."""
+    if method == 'morlet':
+        W = morlet(sfreq, freqs, n_cycles=n_cycles, zero_mean=zero_mean)
+        Ws = [W]  # to have same dimensionality as the 'multitaper' case
+
+    elif method == 'multitaper':
+        Ws = _make_dpss(sfreq, freqs, n_cycles=n_cycles,
+                        time_bandwidth=time_bandwidth, zero_mean=zero_mean)
+
+    # Check wavelets
+    if len(Ws[0][0]) > n_times:
+        raise ValueError('At least one of the wavelets is longer than the '
+                         'signal. Use a longer signal or shorter wavelets.')
+    return Ws
+
+
+def _compute_tfr_stream(epochs, picks, freqs, method='morlet', n_cycles=7.0,
+                        zero_mean=None, time_bandwidth=None, use_fft=True,
+                        decim=1, output='avg_power', n_jobs=1):
+    """Compute the average power (and ITC) of non-preloaded epochs.
+
+    The epochs are read and transformed one chunk at a time, so the memory
+    used does not depend on the number of epochs. The parameters are those
+    of :func:`_compute_tfr`, with ``output`` "avg_power" or
+    "avg_power_itc".
+
+    Returns
+    -------
+    power : array, shape (n_chans, n_freqs, n_times)
+        The average power.
+    itc : array, shape (n_chans, n_freqs, n_times) | None
+        The inter-trial coherence, None if output is "avg_power".
+    nave : int
+        The number of epochs averaged.
+    """
+    freqs, sfreq, zero_mean, n_cycles, time_bandwidth, decim = \
+        _check_tfr_param(freqs, epochs.info['sfreq'], method, zero_mean,
+                         n_cycles, time_bandwidth, use_fft, decim, output)
+    Ws = _make_tfr_wavelets(method, sfreq, freqs, n_cycles, zero_mean,
+                            time_bandwidth, len(epochs.times))
+    sums = _tfr_stream(epochs, picks, _tfr_sums, n_jobs, Ws, use_fft, decim,
+                       output == 'avg_power_itc')
+    power, itc = sums.average()
+    return power, itc, sums.n_epochs
+
+
+class _TFRSums(object):
+    """Running sums of single-trial power and phase locking.
+
+    Parameters
+    ----------
+    power : array, shape (n_chans, n_freqs, n_times)
+        The sum of the power over epochs and tapers.
+    plf : array, shape (n_chans, n_tapers, n_freqs, n_times) | None
+        The sum of the unit phase vectors over epochs, for each taper.
+        None if the ITC is not computed.
+    n_epochs : int
+        The number of epochs summed.
+    n_tapers : int
+        The number of tapers summed.
+    """
+
+    def __init__(self, power, plf, n_epochs, n_tapers):  # noqa: D102
+        self.power = power
+        self.plf = plf
+        self.n_epochs = n_epochs
+        self.n_tapers = n_tapers
+
+    def __iadd__(self, other):  # noqa: D105
+        self.power += other.power
+        if self.plf is not None:
+            self.plf += other.plf
+        self.n_epochs += other.n_epochs
+        return self
+
+    def average(self):
+        """Get the average power and the ITC (None if not computed)."""
+        power = self.power / (self.n_epochs * self.n_tapers)
+        itc = None
+        if self.plf is not None:
+            # Inter-trial phase locking is computed per taper
+            itc = np.abs(self.plf).sum(axis=1)
+            itc /= self.n_epochs * self.n_tapers
+        return power, itc
+
+
+def _tfr_sums(epoch_data, Ws, use_fft, decim, compute_itc):
+    """Compute the _TFRSums of a chunk of epochs."""
+    n_epochs, n_chans, n_times = epoch_data[:, :, decim].shape
+    n_freqs = len(Ws[0])
+    power = np.zeros((n_chans, n_freqs, n_times))
+    plf = np.zeros((n_chans, len(Ws), n_freqs, n_times), dtype=np.complex) \
+        if compute_itc else None
+    for ci in range(n_chans):
+        for ti, W in enumerate(Ws):
+            for _, tfr in _cwt_blocks(epoch_data[:, ci], W, 'same', use_fft,
+                                      decim):
+                tfr_abs = np.abs(tfr)
+                if compute_itc:
+                    plf[ci, ti] += (tfr / tfr_abs).sum(axis=0)
+                power[ci] += (tfr_abs ** 2).sum(axis=0)
+    return _TFRSums(power, plf, n_epochs, len(Ws))
+
+
+def _tfr_stream(epochs, picks, fun, n_jobs, *args):
+    """Accumulate the _TFRSums of non-preloaded epochs chunk by chunk.
+
+    ``fun(epoch_data, *args)`` must return the _TFRSums of a chunk of data
+    of shape (n_epochs, n_chans, n_times). With several jobs, the chunks
+    are processed in parallel and their sums are merged.
+    """
+    n_chans = len(np.arange(len(epochs.ch_names))[picks])
+    n_chunk = max(_EPOCHS_CHUNK_SIZE // (n_chans * len(epochs.times)), 1)
+    parallel, p_fun, n_jobs = parallel_func(fun, n_jobs)
+    chunks = _iter_epochs_chunks(epochs, picks, n_chunk)
+    sums = None
+    while True:
+        # hold at most n_jobs chunks in memory
+        group = list(islice(chunks, n_jobs))
+        if len(group) == 0:
+            break
+        for this_sums in parallel(p_fun(chunk, *args) for chunk in group):
+            if sums is None:
+                sums = this_sums
+            else:
+                sums += this_sums
+    if sums is None:
+        raise RuntimeError('All epochs were dropped, cannot compute the '
+                           'average time-frequency representation')
+    return sums
+
+
+def _iter_epochs_chunks(epochs, picks, n_chunk):
+    """Generate arrays of the data of at most n_chunk epochs."""
+    chunk = list()
+    for epoch in epochs:
+        chunk.append(epoch[picks])
+        if len(chunk) >= n_chunk:
+            yield np.array(chunk)
+            chunk = list()
+    if len(chunk) > 0:
+        yield np.array(chunk)
 
 
 def _check_tfr_param(freqs, sfreq, method, zero_mean, n_cycles,
@@ -501,14 +726,14 @@ def _time_frequency_loop(X, Ws, output, use_fft, mode, decim):
 
     # Loops across tapers.
     for W in Ws:
-        coefs = _cwt(X, W, mode, decim=decim, use_fft=use_fft)
+        coefs = _cwt_blocks(X, W, mode, use_fft, decim)
 
         # Inter-trial phase locking is apparently computed per taper...
         if 'itc' in output:
             plf = np.zeros((n_freqs, n_times), dtype=np.complex)
 
-        # Loop across epochs
-        for epoch_idx, tfr in enumerate(coefs):
+        # Loop across blocks of epochs
+        for epoch_idx, tfr in coefs:
             # Transform complex values
             if output in ['power', 'avg_power']:
                 tfr = (tfr * tfr.conj()).real  # power
@@ -516,15 +741,15 @@ def _time_frequency_loop(X, Ws, output, use_fft, mode, decim):
                 tfr = np.angle(tfr)
             elif output == 'avg_power_itc':
                 tfr_abs = np.abs(tfr)
-                plf += tfr / tfr_abs  # phase
+                plf += (tfr / tfr_abs).sum(axis=0)  # phase
                 tfr = tfr_abs ** 2  # power
             elif output == 'itc':
-                plf += tfr / np.abs(tfr)  # phase
+                plf += (tfr / np.abs(tfr)).sum(axis=0)  # phase
                 continue  # not need to stack anything else than plf
 
             # Stack or add
             if ('avg_' in output) or ('itc' in output):
-                tfrs += tfr
+                tfrs += tfr.sum(axis=0)
             else:
                 tfrs[epoch_idx] += tfr
 
@@ -543,6 +768,15 @@ def _time_frequency_loop(X, Ws, output, use_fft, mode, decim):
     return tfrs
 
 
+def _cwt_blocks(X, Ws, mode, use_fft, decim):
+    """Generate the cwt of blocks of signals with their slices."""
+    if use_fft and mode == 'same':
+        return _cwt_fft_blocks(X, Ws, decim)
+    return ((slice(ii, ii + 1), tfr[np.newaxis])
+            for ii, tfr in enumerate(_cwt(X, Ws, mode, decim=decim,
+                                          use_fft=use_fft)))
+
+
 def cwt(X, Ws, use_fft=True, mode='same', decim=1):
     """Compute time freq decomposition with continuous wavelet transform.
 
@@ -590,14 +824,16 @@ def cwt(X, Ws, use_fft=True, mode='same', decim=1):
 
 
 def _tfr_aux(method, inst, freqs, decim, return_itc, picks, average,
-             output=None, **tfr_params):
+             output=None, data_buffer=None, fmt='double', **tfr_params):
     """Help reduce redundancy between tfr_morlet and tfr_multitaper."""
+    from ..epochs import BaseEpochs
     decim = _check_decim(decim)
-    data = _get_data(inst, return_itc)
-    info = inst.info
-
-    info, data, picks = _prepare_picks(info, data, picks)
-    data = data[:, picks, :]
+    # non-preloaded epochs are averaged without loading all of them
+    stream = average and isinstance(inst, BaseEpochs) and not inst.preload
+    if not stream:
+        data = _get_data(inst, return_itc)
+        info, data, picks = _prepare_picks(inst.info, data, picks)
+        data = data[:, picks, :]
 
     if average:
         if output == 'complex':
@@ -612,16 +848,26 @@ def _tfr_aux(method, inst, freqs, decim, return_itc, picks, average,
             raise ValueError('Inter-trial coherence is not supported'
                              ' with average=False')
 
-    out = _compute_tfr(data, freqs, info['sfreq'], method=method,
-                       output=output, decim=decim, **tfr_params)
+    if stream:
+        info, _, picks = _prepare_picks(inst.info, inst.ch_names, picks)
+        power, itc, nave = _compute_tfr_stream(
+            inst, picks, freqs, method=method, output=output, decim=decim,
+            **tfr_params)
+    else:
+        if average:
+            data_buffer, fmt = None, 'double'
+        out = _compute_tfr(data, freqs, info['sfreq'], method=method,
+                           output=output, decim=decim,
+                           data_buffer=data_buffer, fmt=fmt, **tfr_params)
+        if average:
+            if return_itc:
+                power, itc = out.real, out.imag
+            else:
+                power = out
+            nave = len(data)
     times = inst.times[decim].copy()
 
     if average:
-        if return_itc:
-            power, itc = out.real, out.imag
-        else:
-            power = out
-        nave = len(data)
         out = AverageTFR(info, power, times, freqs, nave,
                          method='%s-power' % method)
         if return_itc:
@@ -637,7 +883,7 @@ def _tfr_aux(method, inst, freqs, decim, return_itc, picks, average,
 @verbose
 def tfr_morlet(inst, freqs, n_cycles, use_fft=False, return_itc=True, decim=1,
                n_jobs=1, picks=None, zero_mean=True, average=True,
-               output='power', verbose=None):
+               output='power', memmap=None, fmt='double', verbose=None):
     """Compute Time-Frequency Representation (TFR) using Morlet wavelets.
 
     Parameters
@@ -671,7 +917,9 @@ def tfr_morlet(inst, freqs, n_cycles, use_fft=False, return_itc=True, decim=1,
 
         .. versionadded:: 0.13.0
     average : bool, defaults to True
-        If True average across Epochs.
+        If True average across Epochs. Epochs that are not preloaded are
+        then read and transformed a few at a time (in parallel if
+        ``n_jobs > 1``), without loading all of them in memory.
 
         .. versionadded:: 0.13.0
     output : str
@@ -679,6 +927,17 @@ def tfr_morlet(inst, freqs, n_cycles, use_fft=False, return_itc=True, decim=1,
         average must be False.
 
         .. versionadded:: 0.15.0
+    memmap : str | None, defaults to None
+        If str and ``average=False``, the name of a file in which the
+        single-trial TFR data are memory-mapped instead of being held in
+        memory.
+
+        .. versionadded:: 0.16
+    fmt : 'double' | 'single', defaults to 'double'
+        The precision of the single-trial TFR data when ``average=False``.
+        'single' halves the memory (or disk) footprint.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None, defaults to None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -700,7 +959,8 @@ def tfr_morlet(inst, freqs, n_cycles, use_fft=False, return_itc=True, decim=1,
     mne.time_frequency.tfr_array_stockwell
     """
     tfr_params = dict(n_cycles=n_cycles, n_jobs=n_jobs, use_fft=use_fft,
-                      zero_mean=zero_mean, output=output)
+                      zero_mean=zero_mean, output=output,
+                      data_buffer=memmap, fmt=fmt)
     return _tfr_aux('morlet', inst, freqs, decim, return_itc, picks,
                     average, **tfr_params)
 
@@ -786,7 +1046,8 @@ def tfr_array_morlet(epoch_data, sfreq, freqs, n_cycles=7.0,
 @verbose
 def tfr_multitaper(inst, freqs, n_cycles, time_bandwidth=4.0,
                    use_fft=True, return_itc=True, decim=1,
-                   n_jobs=1, picks=None, average=True, verbose=None):
+                   n_jobs=1, picks=None, average=True, memmap=None,
+                   fmt='double', verbose=None):
     """Compute Time-Frequency Representation (TFR) using DPSS tapers.
 
     Parameters
@@ -824,9 +1085,22 @@ def tfr_multitaper(inst, freqs, n_cycles, time_bandwidth=4.0,
         The indices of the channels to decompose. If None, all available
         channels are decomposed.
     average : bool, defaults to True
-        If True average across Epochs.
+        If True average across Epochs. Epochs that are not preloaded are
+        then read and transformed a few at a time (in parallel if
+        ``n_jobs > 1``), without loading all of them in memory.
 
         .. versionadded:: 0.13.0
+    memmap : str | None, defaults to None
+        If str and ``average=False``, the name of a file in which the
+        single-trial TFR data are memory-mapped instead of being held in
+        memory.
+
+        .. versionadded:: 0.16
+    fmt : 'double' | 'single', defaults to 'double'
+        The precision of the single-trial TFR data when ``average=False``.
+        'single' halves the memory (or disk) footprint.
+
+        .. versionadded:: 0.16
     verbose : bool, str, int, or None, defaults to None
         If not None, override default verbose level (see :func:`mne.verbose`
         and :ref:`Logging documentation <tut_logging>` for more).
@@ -852,7 +1126,8 @@ def tfr_multitaper(inst, freqs, n_cycles, time_bandwidth=4.0,
     .. versionadded:: 0.9.0
     """
     tfr_params = dict(n_cycles=n_cycles, n_jobs=n_jobs, use_fft=use_fft,
-                      zero_mean=True, time_bandwidth=time_bandwidth)
+                      zero_mean=True, time_bandwidth=time_bandwidth,
+                      data_buffer=memmap, fmt=fmt)
     return _tfr_aux('multitaper', inst, freqs, decim, return_itc, picks,
                     average, **tfr_params)
 
@@ -891,8 +1166,11 @@ class _BaseTFR(ContainsMixin, UpdateChannelsMixin, SizeMixin):
             The modified instance.
         """
         mask = _time_mask(self.times, tmin, tmax, sfreq=self.info['sfreq'])
-        self.times = self.times[mask]
-        self.data = self.data[..., mask]
+        # the mask is contiguous, slicing keeps memory-mapped data as a view
+        idx = np.where(mask)[0]
+        sl = slice(idx[0], idx[-1] + 1) if len(idx) else slice(0, 0)
+        self.times = self.times[sl]
+        self.data = self.data[..., sl]
         return self
 
     def copy(self):
@@ -937,7 +1215,12 @@ class _BaseTFR(ContainsMixin, UpdateChannelsMixin, SizeMixin):
         inst : instance of AverageTFR
             The modified instance.
         """  # noqa: E501
-        rescale(self.data, self.times, baseline, mode, copy=False)
+        # rescale the leading dimension chunk by chunk, so that single trial
+        # data (possibly memory-mapped) are modified in place without
+        # temporaries of the size of the whole data
+        for ii, sl in enumerate(_iter_tfr_chunks(self.data)):
+            rescale(self.data[sl], self.times, baseline, mode, copy=False,
+                    verbose=None if ii == 0 else False)
         return self
 
     def save(self, fname, overwrite=False):
@@ -1575,7 +1858,43 @@ class EpochsTFR(_BaseTFR):
         tfr : instance of EpochsTFR
             The copy.
         """
-        return EpochsTFR(info=self.info.copy(), data=self.data.copy(),
+        # np.array also loads memory-mapped data in memory
+        return EpochsTFR(info=self.info.copy(), data=np.array(self.data),
+                         times=self.times.copy(), freqs=self.freqs.copy(),
+                         method=self.method, comment=self.comment)
+
+    def __getitem__(self, item):
+        """Select epochs.
+
+        Parameters
+        ----------
+        item : int | slice | array-like of int | array-like of bool
+            The epochs to select. Slices return a view of the data, which
+            keeps memory-mapped data on disk.
+
+        Returns
+        -------
+        tfr : instance of EpochsTFR
+            The selected epochs.
+
+        Notes
+        -----
+        .. versionadded:: 0.16
+        """
+        if isinstance(item, (int, np.integer)):
+            item = slice(item, item + 1 if item != -1 else None)
+        elif not isinstance(item, slice):
+            item = np.asarray(item)
+            if item.dtype == np.bool_:
+                if len(item) != len(self.data):
+                    raise ValueError('Boolean selection must have length %d, '
+                                     'got %d' % (len(self.data), len(item)))
+                item = np.where(item)[0]
+            if item.ndim != 1 or not np.issubdtype(item.dtype, np.integer):
+                raise TypeError('Epochs must be selected with an int, a slice '
+                                'or a 1D array of int or bool, got %s'
+                                % (item,))
+        return EpochsTFR(info=self.info.copy(), data=self.data[item],
                          times=self.times.copy(), freqs=self.freqs.copy(),
                          method=self.method, comment=self.comment)
 
@@ -1587,13 +1906,26 @@ class EpochsTFR(_BaseTFR):
         ave : instance of AverageTFR
             The averaged data.
         """
-        data = np.mean(self.data, axis=0)
+        # accumulate chunks of epochs in double precision, so that single
+        # precision or memory-mapped data are never loaded at once
+        dtype = np.complex128 if np.iscomplexobj(self.data) else np.float64
+        data = np.zeros(self.data.shape[1:], dtype)
+        for sl in _iter_tfr_chunks(self.data):
+            data += self.data[sl].sum(axis=0, dtype=dtype)
+        data /= len(self.data)
         return AverageTFR(info=self.info.copy(), data=data,
                           times=self.times.copy(), freqs=self.freqs.copy(),
                           nave=self.data.shape[0], method=self.method,
                           comment=self.comment)
 
 
+def _iter_tfr_chunks(data, n_chunk=_EPOCHS_CHUNK_SIZE):
+    """Iterate over slices of the leading dimension of TFR data."""
+    step = max(n_chunk // max(np.prod(data.shape[1:]), 1), 1)
+    for start in range(0, max(len(data), 1), step):
+        yield slice(start, start + step)
+
+
 def combine_tfr(all_tfr, weights='nave'):
     """Merge AverageTFR data by weighted addition.
 
@@ -1788,7 +2120,7 @@ def _prepare_write_tfr(tfr, condition):
     return (condition, attributes)
 
 
-def read_tfrs(fname, condition=None):
+def read_tfrs(fname, condition=None, mmap_mode=None):
     """Read TFR datasets from hdf5 file.
 
     Parameters
@@ -1798,6 +2130,12 @@ def read_tfrs(fname, condition=None):
     condition : int or str | list of int or str | None
         The condition to load. If None, all conditions will be returned.
         Defaults to None.
+    mmap_mode : None | 'r' | 'r+' | 'c'
+        If not None, the TFR data are memory-mapped from the file with this
+        mode (see :class:`numpy.memmap`) instead of being read in memory.
+        Defaults to None.
+
+        .. versionadded:: 0.16
 
     See Also
     --------
@@ -1816,7 +2154,10 @@ def read_tfrs(fname, condition=None):
     check_fname(fname, 'tfr', ('-tfr.h5',))
 
     logger.info('Reading %s ...' % fname)
-    tfr_data = read_hdf5(fname, title='mnepython')
+    if mmap_mode is None:
+        tfr_data = read_hdf5(fname, title='mnepython')
+    else:
+        tfr_data = _read_tfrs_mmap(fname, mmap_mode)
     for k, tfr in tfr_data:
         tfr['info'] = Info(tfr['info'])
     is_average = 'nave' in tfr
@@ -1836,3 +2177,34 @@ def read_tfrs(fname, condition=None):
     else:
         out = [EpochsTFR(**d) for d in list(zip(*tfr_data))[1]]
     return out
+
+
+def _read_tfrs_mmap(fname, mmap_mode):
+    """Read TFR datasets from hdf5 file with memory-mapped data."""
+    from ..externals.h5io._h5io import _check_h5py, _triage_read
+    if mmap_mode not in ('r', 'r+', 'c'):
+        raise ValueError('mmap_mode must be None, "r", "r+" or "c", got %s'
+                         % (mmap_mode,))
+    h5py = _check_h5py()
+    tfr_data = list()
+    with h5py.File(fname, mode='r') as fid:
+        if 'mnepython' not in fid:
+            raise ValueError('no "mnepython" data found')
+        root = fid['mnepython']
+        for ii in range(len(root)):
+            node = root['idx_%d' % ii]
+            condition = _triage_read(node['idx_0'])
+            tfr = dict()
+            for key, subnode in node['idx_1'].items():
+                if key == 'key_data':
+                    # ndarrays are written uncompressed and contiguous
+                    offset = subnode.id.get_offset()
+                    if offset is None:
+                        raise ValueError('The data in %s cannot be '
+                                         'memory-mapped' % fname)
+                    tfr['data'] = np.memmap(fname, subnode.dtype, mmap_mode,
+                                            offset, subnode.shape)
+                else:
+                    tfr[key[4:]] = _triage_read(subnode)
+            tfr_data.append((condition, tfr))
+    return tfr_data
@@ -7,7 +7,7 @@ from __future__ import print_function
 # License: BSD (3-clause)
 
 import atexit
-from collections import Iterable
+from collections import Iterable, OrderedDict
 from distutils.version import LooseVersion
 from functools import wraps
 import ftplib
@@ -1482,6 +1482,11 @@ known_config_types = (
     'MNE_DATASETS_VISUAL_92_CATEGORIES_PATH',
     'MNE_DATASETS_KILOWORD_PATH',
     'MNE_DATASETS_FIELDTRIP_CMC_PATH',
+    'MNE_DPSS_CACHE_DIR',
+    'MNE_DPSS_CACHE_SIZE',
+    'MNE_FIFF_INDEX_CACHE_DIR',
+    'MNE_FIFF_INDEX_CACHE_SIZE',
+    'MNE_FILTER_CACHE_SIZE',
     'MNE_FORCE_SERIAL',
     'MNE_KIT2FIFF_STIM_CHANNELS',
     'MNE_KIT2FIFF_STIM_CHANNEL_CODING',
@@ -1999,6 +2004,66 @@ def sizeof_fmt(num):
         return '1 byte'
 
 
+def _get_cache_size(key, default, parse=int):
+    """Get the size of a cache from a config value.
+
+    An invalid value only emits a warning and gives the default size, so a
+    bad setting of a cache cannot break the code using it.
+    """
+    size = get_config(key, default)
+    try:
+        return parse(size)
+    except ValueError as exp:
+        warn('Invalid %s config value %r (%s), using the default of %s'
+             % (key, size, exp, default))
+        return parse(default)
+
+
+class _LRUCache(object):
+    """A bounded cache that evicts the least recently used entries first.
+
+    The maximum number of entries is read from the ``config_key`` config
+    value (``default_size`` if it is not set) whenever an entry is added.
+    """
+
+    def __init__(self, config_key, default_size):
+        self.config_key = config_key
+        self.default_size = default_size
+        self._entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key, compute):
+        """Get the value for key, calling compute() if it is not cached."""
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            for array in (value if isinstance(value, tuple) else (value,)):
+                if isinstance(array, np.ndarray):
+                    array.flags.writeable = False
+            max_size = _get_cache_size(self.config_key, self.default_size)
+            while len(self._entries) >= max(max_size, 0) and self._entries:
+                self._entries.popitem(last=False)
+            if max_size <= 0:
+                return value
+        else:
+            self.hits += 1
+        self._entries[key] = value
+        return value
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def info(self):
+        """The hit and miss counts and the number of entries."""
+        return dict(hits=self.hits, misses=self.misses,
+                    size=len(self._entries))
+
+
 class SizeMixin(object):
     """Estimate MNE object sizes."""
 